@@ -40,20 +40,8 @@ def get_validation_geometry():
     ]
     return config
 
-def run_simulation(model_factory, model_name, hot_in, cold_in, config):
-    print(f"--- Running {model_name} ---")
-    
-    if isinstance(model_factory, type): physics = model_factory()
-    elif callable(model_factory) and not hasattr(model_factory, 'calculate_Nu'): physics = model_factory()
-    else: physics = model_factory
-    
-    pressure_physics = GunterShawModel(use_correction=True)
-    
-    builder = HXBuilder("Validation_Run", physics, pressure_model=pressure_physics)
-    builder.add_zones_from_config(config)
-    hx = builder.build(hot_in, cold_in)
-    hx.solve()
-    
+def extract_rows(zones, hot_profile, histories, hot_in, cold_in):
+    """ Maps a marched profile + per-zone histories onto cumulative row arrays (degF / psi). """
     rows = [0]
     temps_f = [cv.convert(hot_in.T, 'K', 'degF')]
     pressures_psi = [cv.convert(hot_in.P, 'Pa', 'psi')] 
@@ -64,15 +52,15 @@ def run_simulation(model_factory, model_name, hot_in, cold_in, config):
     current_row = 0
     profile_idx = 1
     
-    for zone in hx.zones:
+    for zone, history in zip(zones, histories):
         # History
-        z_re = getattr(zone, 'history', {}).get('Re_g', [])
-        z_Tw = getattr(zone, 'history', {}).get('T_wall', [])
-        z_Tc = getattr(zone, 'history', {}).get('T_cool', [])
+        z_re = history.get('Re_g', [])
+        z_Tw = history.get('T_wall', [])
+        z_Tc = history.get('T_cool', [])
         
         for i in range(zone.n_cols):
-            if profile_idx < len(hx.hot_stream.profile):
-                state = hx.hot_stream.profile[profile_idx]
+            if profile_idx < len(hot_profile):
+                state = hot_profile[profile_idx]
                 current_row += 1
                 rows.append(current_row)
                 temps_f.append(cv.convert(state.T, 'K', 'degF'))
@@ -94,18 +82,53 @@ def run_simulation(model_factory, model_name, hot_in, cold_in, config):
                 
     return rows, temps_f, pressures_psi, reynolds, wall_temps, cool_temps
 
+def run_simulation(model_factory, model_name, hot_in, cold_in, config):
+    print(f"--- Running {model_name} ---")
+    
+    if isinstance(model_factory, type): physics = model_factory()
+    elif callable(model_factory) and not hasattr(model_factory, 'calculate_Nu'): physics = model_factory()
+    else: physics = model_factory
+    
+    pressure_physics = GunterShawModel(use_correction=True)
+    
+    builder = HXBuilder("Validation_Run", physics, pressure_model=pressure_physics)
+    builder.add_zones_from_config(config)
+    hx = builder.build(hot_in, cold_in)
+    hx.solve()
+    
+    histories = [getattr(zone, 'history', {}) for zone in hx.zones]
+    return extract_rows(hx.zones, hx.hot_stream.profile, histories, hot_in, cold_in)
+
+def run_ensemble(models, hot_in, cold_in, config):
+    """
+    Solves all models in one lockstep march (shared property evaluation per row).
+    models: {name: HeatTransferModel}. Returns {name: row arrays} like run_simulation.
+    """
+    print(f"--- Running Ensemble: {', '.join(models)} ---")
+    pressure_physics = GunterShawModel(use_correction=True)
+    
+    physics = list(models.values())
+    builder = HXBuilder("Validation_Run", physics[0], pressure_model=pressure_physics)
+    builder.add_zones_from_config(config)
+    hx = builder.build(hot_in, cold_in)
+    members = hx.solve_ensemble(physics)
+    
+    return {name: extract_rows(hx.zones, m['hot_profile'], m['zone_history'], hot_in, cold_in)
+            for name, m in zip(models, members)}
+
 def main():
     hot_in = FluidState(StreamType.GAS, T=cv.convert(5050, 'degF', 'K'), 
                         P=cv.convert(1.47, 'psi', 'Pa'), m_dot=1.288, fluid="GuptaAir")
     cold_in = FluidState(StreamType.COOLANT, T=297.2, P=613600.0, m_dot=608.0, fluid=Fluid.WATER)
 
     config = get_validation_geometry()
-    results = {}
     
-    # Run only Modified Grimison to save time/clutter if you like, but keeping all 3 is fine
-    results['Grimison'] = run_simulation(lambda: GrimisonModel(method="hammock"), "Grimison (Original)", hot_in, cold_in, config)
-    results['Modified'] = run_simulation(lambda: ModifiedGrimisonModel(method="hammock"), "Modified Grimison", hot_in, cold_in, config)
-    results['Zhukauskas'] = run_simulation(ZhukauskasModel, "Zhukauskas", hot_in, cold_in, config)
+    # All 3 models in one lockstep march (properties evaluated once per row for all)
+    results = run_ensemble({
+        'Grimison': GrimisonModel(method="hammock"),
+        'Modified': ModifiedGrimisonModel(method="hammock"),
+        'Zhukauskas': ZhukauskasModel(),
+    }, hot_in, cold_in, config)
 
     # --- PLOTTING (5 Plots) ---
     fig, axes = plt.subplots(5, 1, figsize=(10, 20), sharex=True)
@@ -3,6 +3,7 @@ import numpy as np
 from utils import convert as cv
 from src.fluids import FluidState, StreamType, Fluid
 from src.builders import HXBuilder
+from src.properties import DEFAULT_ENGINE
 from src.models import ModifiedGrimisonModel
 from src.models.pressure import GunterShawModel
 
@@ -103,6 +104,14 @@ def print_performance_report(hx):
     print(f"    > Outlet T: {cv.convert(cool_out.T, 'K', 'degC'):.1f} °C")
     print(f"    > Delta T:  {dt_cool:.1f} K")
     print(f"    > Delta P:  {cv.convert(dp_cool_total, 'Pa', 'psi'):.2f} psi (Estimated Pump Head)")
+
+    # Subcooled boiling screen (wall vs T_sat(Pc) + ONB margin, per zone)
+    for zone in hx.zones:
+        res = getattr(zone, 'results', {})
+        if 'boiling_risk' in res:
+            flag = f"AT RISK ({res['boiling_rows']} rows, first row {res['boiling_first_row']})" if res['boiling_risk'] else "OK"
+            print(f"    > Boiling ({zone.name}): {flag}, min margin {res['boiling_margin_min_K']:.1f} K"
+                  f" (T_sat {cv.convert(res['T_sat_at_min_margin'], 'K', 'degC'):.1f} °C)")
     
     print("="*50 + "\n")
 
@@ -214,7 +223,8 @@ def main():
     ax4.plot(rows, wall, color='tab:purple', linewidth=2)
     ax4.set_ylabel("Wall Temp (°C)")
     ax4.set_title("Tube Wall Temperature")
-    ax4.axhline(100, color='k', linestyle='--', alpha=0.5, label="Boiling Risk (100°C)")
+    T_sat_c = cv.convert(DEFAULT_ENGINE.saturation_temperature(cold_in.fluid_string, cold_in.P), 'K', 'degC')
+    ax4.axhline(T_sat_c, color='k', linestyle='--', alpha=0.5, label=f"Boiling Risk (T_sat = {T_sat_c:.0f}°C)")
     ax4.grid(True, alpha=0.3)
     ax4.legend()
     
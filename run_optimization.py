@@ -86,7 +86,19 @@ def run_parametric_study():
         builder = HXBuilder(f"Run_{i}", model)
         builder.add_zones_from_config(config)
         hx = builder.build(hot_in, cold_in)
-        hx.solve()
+        
+        # --- PRE-SCREEN (skip designs that cannot march) ---
+        screen = hx.prescreen()
+        if not screen.feasible:
+            results.append({
+                **params,
+                'Q_total_kW': float('nan'), 'T_out_K': float('nan'), 'T_out_C': float('nan'),
+                'dP_gas_Pa': float('nan'), 'dP_gas_Torr': float('nan'),
+                'rejected': '; '.join(issue.code for issue in screen.errors)
+            })
+            continue
+        
+        hx.solve(quiet=True)
         
         # --- CAPTURE RESULT ---
         # Calculate totals relative to inlet (Assembly Level)
@@ -99,7 +111,8 @@ def run_parametric_study():
             'T_out_K': hx.hot_out.T,
             'T_out_C': cv.convert(hx.hot_out.T, 'K', 'degC'),
             'dP_gas_Pa': dP_tot,
-            'dP_gas_Torr': cv.convert(dP_tot, 'Pa', 'Torr')
+            'dP_gas_Torr': cv.convert(dP_tot, 'Pa', 'Torr'),
+            'rejected': ''
         }
         results.append(row)
 
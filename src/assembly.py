@@ -1,4 +1,9 @@
+import time
 import CoolProp.CoolProp as cp
+from src.retention import Retention
+from src.compiled import CompiledHX
+from src.events import SolveEvents, failure_collector
+from src.profiling import SolveProfiler
 
 class HeatExchanger:
     """
@@ -101,6 +106,13 @@ class HeatExchanger:
         self.target_T_out = None
         self.Q_required = None
 
+        # Solve event listeners (src.events; console progress by default) and the
+        # failures (src.events.Failure) of the last solve
+        self.events = SolveEvents()
+        self.failures = []
+        # SolveProfiler of the last solve(profile=True), else None
+        self.profile = None
+
     def set_target_outlet_temp(self, T_target):
         """
         Sets the desired Gas Outlet Temperature [K].
@@ -135,32 +147,175 @@ class HeatExchanger:
         for zone in self.zones:
             zone.build_geometry()
 
-    def solve(self):
-        print(f"--- Solving {self.name} ---")
+    def solve(self, retention=None, quiet=False, profile=False):
+        """
+        Marches all zones in order.
+        retention: history policy for profiles / zone.history (see src.retention.Retention).
+                   'full' (default), 'summary', 'none', 'boundaries', or an int k
+                   to keep every k-th row of each zone.
+        quiet:     skip the console listener; events still reach the other
+                   listeners of self.events and failures land in self.failures.
+        profile:   instrument the solve (src.profiling.SolveProfiler): zone and row
+                   timing, property and model call counters, cache hit rates.
+                   The profiler lands in self.profile (report(), to_json(),
+                   to_speedscope()); True for per-row timing, 'zones' without it.
+        """
+        if not profile:
+            for _ in self.iter_solve(retention, quiet): pass
+            return self.hot_out, self.cold_out
+        with SolveProfiler(self, rows=profile != 'zones') as profiler:
+            for _ in self.iter_solve(retention, quiet): pass
+        self.profile = profiler
+        return self.hot_out, self.cold_out
+
+    def _emitter(self, quiet):
+        """ Resets self.failures and returns the event emitter of one solve. """
+        self.failures = []
+        return self.events.emitter(self.name, quiet, (failure_collector(self.failures),))
+
+    def iter_solve(self, retention='summary', quiet=True):
+        """
+        Streaming solve: a generator yielding one src.zones.RowRecord
+        (zone, row, x, Tg, Pg, Tc, Tw, Q) per marched row, as it is computed.
+        The consumer may stop at any row; with the default 'summary' retention no
+        profile or history is stored, so the march runs in constant memory. Quiet
+        by default (see solve).
+        Once exhausted, hot_out / cold_out, the stream profiles and the zone
+        results are set exactly as by solve(retention) (the generator also returns
+        the outlet states). Closed early, only the zones already completed hold
+        new results; outlets and profiles keep their previous values.
+        """
+        retention = Retention.coerce(retention)
+        emit = self._emitter(quiet)
+        t_solve = time.perf_counter()
+        emit('solve_start', mode='sequential', size=len(self.zones))
         
         current_hot = self.hot_stream.inlet
         current_cold = self.cold_stream.inlet
         
-        self.hot_stream.profile = [current_hot]
-        self.cold_stream.profile = [current_cold]
+        keep_rows = retention.keeps_rows
+        hot_profile = [current_hot] if keep_rows else []
+        cold_profile = [current_cold] if keep_rows else []
         
         for zone in self.zones:
-            print(f"  > Marching Zone: {zone.name}...")
+            emit('zone_start', zone.name)
+            t_zone = time.perf_counter()
             
-            h_out, c_out, h_prof, c_prof = zone.solve(current_hot, current_cold)
+            h_out, c_out, h_prof, c_prof = yield from zone.iter_solve(current_hot, current_cold, retention, emit)
+            emit('zone_end', zone.name, elapsed_s=time.perf_counter() - t_zone)
             
-            self.hot_stream.profile.extend(h_prof)
-            self.cold_stream.profile.extend(c_prof)
+            hot_profile.extend(h_prof)
+            cold_profile.extend(c_prof)
             
             current_hot = h_out
             current_cold = c_out
             
+        self.hot_stream.profile = hot_profile
+        self.cold_stream.profile = cold_profile
         self.hot_out = current_hot
         self.cold_out = current_cold
         
-        print(f"--- Complete. T_gas_out: {self.hot_out.T:.2f} K ---")
+        emit('solve_end', outlets=[(None, self.hot_out.T)], elapsed_s=time.perf_counter() - t_solve)
         return self.hot_out, self.cold_out
 
+    def compile(self):
+        """
+        Flattens the zones into one contiguous row table (see src.compiled.CompiledHX):
+        geometry is compiled once and every solve() of the returned object marches
+        all rows in a single loop, with the same results as HeatExchanger.solve.
+        """
+        return CompiledHX(self)
+
+    def solve_ensemble(self, models, retention=None, quiet=True):
+        """
+        Solves the same assembly once per heat-transfer model in a single lockstep
+        march: every row evaluates properties for all models in one batched call.
+        Every zone marches its members in lockstep (BaseZone.solve_ensemble).
+
+        Returns one dict per model (in order) with keys:
+          'model', 'hot_out', 'cold_out', 'hot_profile', 'cold_profile',
+          'zone_results', 'zone_history', 'failures'
+        Silent unless quiet=False; events go to self.events as in solve().
+        """
+        retention = Retention.coerce(retention)
+        emit = self._emitter(quiet)
+        t_solve = time.perf_counter()
+        emit('solve_start', mode='ensemble', size=len(models))
+        
+        n = len(models)
+        keep_rows = retention.keeps_rows
+        members = [{
+            'model': m,
+            'hot_out': self.hot_stream.inlet, 'cold_out': self.cold_stream.inlet,
+            'hot_profile': [self.hot_stream.inlet] if keep_rows else [],
+            'cold_profile': [self.cold_stream.inlet] if keep_rows else [],
+            'zone_results': [], 'zone_history': [],
+        } for m in models]
+        
+        for zone in self.zones:
+            emit('zone_start', zone.name)
+            t_zone = time.perf_counter()
+            hot_in = [m['hot_out'] for m in members]
+            cold_in = [m['cold_out'] for m in members]
+            
+            outs = zone.solve_ensemble(hot_in, cold_in, models, retention, emit)
+            emit('zone_end', zone.name, elapsed_s=time.perf_counter() - t_zone)
+            
+            for m, (h_out, c_out, h_prof, c_prof, res, hist) in zip(members, outs):
+                m['hot_out'], m['cold_out'] = h_out, c_out
+                m['hot_profile'].extend(h_prof)
+                m['cold_profile'].extend(c_prof)
+                m['zone_results'].append(res)
+                m['zone_history'].append(hist)
+        
+        for k, m in enumerate(members):
+            m['failures'] = [f for f in self.failures if f.member == k]
+        emit('solve_end', outlets=[(type(m['model']).__name__, m['hot_out'].T) for m in members],
+             elapsed_s=time.perf_counter() - t_solve)
+        return members
+
+    def prescreen(self):
+        """
+        Conservative feasibility check (gas pressure exhaustion, correlation
+        limits) from inlet conditions and geometry, without marching.
+        Returns a src.feasibility.FeasibilityReport.
+        """
+        from src.feasibility import prescreen
+        return prescreen(self)
+
+    def solve_operating_point(self, variable, target='T_out', value=None, **options):
+        """
+        Inverse solve: the value of one inlet variable ('coolant_flow', 'gas_flow',
+        'coolant_T', 'gas_T', 'coolant_P', 'gas_P') at which the gas outlet
+        temperature meets target_T_out (target='T_out') or the gas pressure drop
+        meets a limit (target='dP', value [Pa]). Bracketing plus Brent's method on
+        the compiled assembly; the assembly is left solved at the result, inlet
+        included. See src.inverse.solve_operating_point for the options; returns
+        a src.inverse.OperatingPointResult.
+        """
+        from src.inverse import solve_operating_point
+        return solve_operating_point(self, variable, target, value, **options)
+
+    def performance_map(self, axes, **options):
+        """
+        Off-design performance map of this exchanger: T_out, Q and gas dP on a grid
+        of inlet conditions (axes: {'gas_flow' | 'gas_T' | 'gas_P' | 'coolant_flow' |
+        'coolant_T': node values}), solved in batches, optionally in parallel.
+        See src.performance_map.build_performance_map for the options; returns a
+        src.performance_map.PerformanceMap (multilinear lookup, .npz save / load).
+        """
+        from src.performance_map import build_performance_map
+        return build_performance_map(self, axes, **options)
+
+    def solve_sensitivities(self, params=('tube_od', 'fin_pitch', 'S_T', 'S_L')):
+        """
+        Forward sensitivities of the outlet state (T, Q, dP) w.r.t. geometry
+        and inlet parameters from a single augmented march.
+        See src.sensitivity.solve_sensitivities for the parameter specs.
+        """
+        from src.sensitivity import solve_sensitivities
+        return solve_sensitivities(self, params)
+
     def summary(self):
         """
         Prints a detailed physics summary of the simulation.
@@ -251,4 +406,10 @@ class HeatExchanger:
                   f"{res['h_gas_avg']:<10.1f} | "
                   f"{res['Re_gas_avg']:<10.0f} | "
                   f"{res['dP_gas_Pa']:<12.1f}")
+        
+        evals = sum(z.results.get('coolant_evals', 0) for z in self.zones if z.results)
+        reuses = sum(z.results.get('coolant_reuses', 0) for z in self.zones if z.results)
+        if evals or reuses:
+            print("-" * 75)
+            print(f"Coolant Properties: {evals} evaluated, {reuses} reused")
         print(f"{'='*75}\n")
\ No newline at end of file
@@ -1,5 +1,5 @@
 from src.assembly import HeatExchanger
-from src.zones import PipeFlowZone, PlateFinZone, TubeBankZone
+from src.zones import AnnularFinZone, GradedTubeBankZone, PipeFlowZone, PlateFinZone, TubeBankZone
 from src.fluids import FluidStream
 from src.models.pressure import GunterShawModel
 
@@ -7,9 +7,23 @@ class HXBuilder:
     """
     Production Builder: Converts configuration dictionaries into a HeatExchanger assembly.
     """
-    def __init__(self, name, physics_model, pressure_model=None):
+    def __init__(self, name, physics_model, pressure_model=None, property_engine=None, validation=None,
+                 wall_iterations=0, radiation=None, onb_margin=0.0,
+                 condensation=None):
         self.name = name
         self.model = physics_model
+        # Correlation validation level for tube-bank zones ('strict', 'zone', 'off'; None = model's own)
+        self.validation = validation
+        # Per-row wall-temperature fixed point (max evaluations per row, 0 = off)
+        self.wall_iterations = wall_iterations
+        # Gas radiation for tube-bank zones (src.radiation.GasRadiation; None = convection only)
+        self.radiation = radiation
+        # Subcooled-boiling screen: wall superheat above T_sat(Pc) tolerated per row [K]
+        self.onb_margin = onb_margin
+        # Condensing-exhaust mode (src.condensation.Condensation; the gas inlet carries w_vap)
+        self.condensation = condensation
+        # Shared by all tube-bank zones (e.g. PropertyEngine(coolant_dT_tol=0.05) for coolant reuse)
+        self.property_engine = property_engine
         # Use provided pressure model, or default to Uncorrected Gunter-Shaw to prevent crashing
         self.pressure_model = pressure_model if pressure_model else GunterShawModel(use_correction=False)
         self.zones = []
@@ -17,7 +31,9 @@ class HXBuilder:
         self._creators = {
             'pipe':   self._add_pipe,
             'bare':   self._add_bare,
-            'finned': self._add_finned
+            'finned': self._add_finned,
+            'annular': self._add_annular,
+            'graded': self._add_graded
         }
 
     def add_zones_from_config(self, config_list):
@@ -37,7 +53,12 @@ class HXBuilder:
             name,
             length=cfg['length'],
             diameter=cfg['diameter'],
-            roughness=cfg.get('roughness', 15e-6)
+            roughness=cfg.get('roughness', 15e-6),
+            property_engine=self.property_engine,
+            compressible=cfg.get('compressible', False),
+            segments=cfg.get('segments', 10),
+            U_loss=cfg.get('U_loss', 0.0),
+            T_ambient=cfg.get('T_ambient', 300.0)
         ))
 
     def _add_bare(self, name, cfg):
@@ -50,7 +71,13 @@ class HXBuilder:
             n_cols=int(cfg['tubes_deep']),
             stagger=cfg.get('stagger', True),
             model=self.model,
-            pressure_model=self.pressure_model # <--- INJECTED HERE
+            pressure_model=self.pressure_model, # <--- INJECTED HERE
+            property_engine=self.property_engine,
+            validation=self.validation,
+            wall_iterations=self.wall_iterations,
+            radiation=self.radiation,
+            onb_margin=self.onb_margin,
+            condensation=self.condensation
         )
         if 'S_T' in cfg: zone.S_T = cfg['S_T']
         if 'S_L' in cfg: zone.S_L = cfg['S_L']
@@ -69,9 +96,76 @@ class HXBuilder:
             fin_thickness=cfg['fin_thickness'],
             stagger=cfg.get('stagger', True),
             model=self.model,
-            pressure_model=self.pressure_model # <--- INJECTED HERE
+            pressure_model=self.pressure_model, # <--- INJECTED HERE
+            property_engine=self.property_engine,
+            validation=self.validation,
+            wall_iterations=self.wall_iterations,
+            radiation=self.radiation,
+            onb_margin=self.onb_margin,
+            condensation=self.condensation
         ))
 
+    def _add_annular(self, name, cfg):
+        height = cfg.get('height', cfg['width'])
+        fin_od = cfg['fin_od'] if 'fin_od' in cfg else cfg['tube_od'] + 2.0 * cfg['fin_height']
+        zone = AnnularFinZone(
+            name=name,
+            height=height,
+            width=cfg['width'],
+            tube_dia=cfg['tube_od'],
+            R_p=cfg.get('Rp', 2.0),
+            n_cols=int(cfg['tubes_deep']),
+            fin_od=fin_od,
+            fin_pitch=cfg['fin_pitch'],
+            fin_thickness=cfg['fin_thickness'],
+            k_fin=cfg.get('k_fin'),
+            stagger=cfg.get('stagger', True),
+            model=self.model,
+            pressure_model=self.pressure_model,
+            property_engine=self.property_engine,
+            validation=self.validation,
+            wall_iterations=self.wall_iterations,
+            radiation=self.radiation,
+            onb_margin=self.onb_margin,
+            condensation=self.condensation
+        )
+        if 'S_T' in cfg: zone.S_T = cfg['S_T']
+        if 'S_L' in cfg: zone.S_L = cfg['S_L']
+        self.zones.append(zone)
+
+    def _add_graded(self, name, cfg):
+        # tube_od, S_T, S_L, fin_pitch, fin_thickness: one value per row or a scalar
+        self.zones.append(GradedTubeBankZone(
+            name=name,
+            height=cfg.get('height', cfg['width']),
+            width=cfg['width'],
+            tube_dia=cfg['tube_od'],
+            S_T=cfg['S_T'],
+            S_L=cfg['S_L'],
+            n_cols=cfg.get('tubes_deep'),
+            fin_pitch=cfg.get('fin_pitch'),
+            fin_thickness=cfg.get('fin_thickness', 0.0),
+            stagger=cfg.get('stagger', True),
+            model=self.model,
+            pressure_model=self.pressure_model,
+            property_engine=self.property_engine,
+            validation=self.validation,
+            wall_iterations=self.wall_iterations,
+            radiation=self.radiation,
+            onb_margin=self.onb_margin,
+            condensation=self.condensation
+        ))
+
+    def size(self, config, hot_in, cold_in, dP_max, T_out=None, Q=None, **options):
+        """
+        Sizes the frontal area and depth of a zone config for a thermal target
+        (T_out [K] or Q [W]) within a gas dP limit [Pa], using this builder's
+        models and options. Returns a src.sizing.SizingResult whose .config is the
+        sized config for add_zones_from_config. See src.sizing.size_exchanger.
+        """
+        from src.sizing import size_exchanger
+        return size_exchanger(self, config, hot_in, cold_in, dP_max, T_out=T_out, Q=Q, **options)
+
     def build(self, hot_in, cold_in):
         hx = HeatExchanger(self.name, FluidStream(hot_in.copy()), FluidStream(cold_in.copy()))
         for z in self.zones: hx.add_zone(z)
@@ -0,0 +1,174 @@
+import time
+import numpy as np
+from src.events import Failure
+from src.retention import Retention
+from src.zones import MarchState
+
+class CompiledHX:
+    """
+    A HeatExchanger flattened into one contiguous row table and marched by a
+    single loop over its rows (see HeatExchanger.compile).
+
+    Zone geometry is compiled once, at compile time; rows keep a reference to
+    their row-geometry dict (shared by all rows of a uniform zone), which is
+    what the zone's surface physics consumes. The numeric table mirrors it:
+
+      columns['zone']   zone index of the row
+      columns['step']   step index inside its zone
+      columns['model']  model id, index into self.models
+      columns['x']      nominal step outlet x [m] for an uninterrupted march
+      columns[key]      every scalar geometry term of the row geometries
+                        (D, S_T, A_surf_tube, A_surf_cool, R_wall, ...),
+                        NaN where a zone type has no such term
+      bounds            [(start, stop)] row slice of each zone
+
+    solve() marches the rows with the shared zone step (BaseZone._step); zone
+    prepare/finish hooks run at zone boundaries. Per-row outcomes are stored
+    flat and zone.results / zone.history / stream profiles are rebuilt by
+    slicing afterwards, identical to HeatExchanger.solve. Geometry or model
+    changes made after compile() need a fresh compile().
+    """
+    def __init__(self, hx):
+        self.hx = hx
+        self.zones = list(hx.zones)
+        self.models = []
+        self.geos = []              # per zone: compiled geometry
+        self.row_geos = []          # per row: row geometry dict
+        self.bounds = []
+        zone_id, step, model_id, x = [], [], [], []
+
+        x_in = hx.hot_stream.inlet.x
+        for z, zone in enumerate(self.zones):
+            if not zone.tube_centers: zone.build_geometry()
+            geo = zone.compile_geometry()
+            n = zone.n_steps(geo)
+            if zone.model is not None and not any(zone.model is m for m in self.models):
+                self.models.append(zone.model)
+            m_id = next((k for k, m in enumerate(self.models) if m is zone.model), -1)
+
+            inlet = _Position(x_in)
+            start = len(self.row_geos)
+            for i in range(n):
+                self.row_geos.append(zone.row_geometry(geo, i))
+                zone_id.append(z); step.append(i); model_id.append(m_id)
+                x.append(zone.step_x(geo, i, inlet))
+            self.geos.append(geo)
+            self.bounds.append((start, len(self.row_geos)))
+            if n: x_in = x[-1]
+
+        self.columns = {'zone': np.array(zone_id, dtype=int), 'step': np.array(step, dtype=int),
+                        'model': np.array(model_id, dtype=int), 'x': np.array(x, dtype=float)}
+        keys = []
+        for g in self.row_geos:
+            for k, v in g.items():
+                if k not in keys and isinstance(v, (int, float)) and not isinstance(v, bool):
+                    keys.append(k)
+        for k in keys:
+            self.columns[k] = np.array([float(g[k]) if isinstance(g.get(k), (int, float)) else np.nan
+                                        for g in self.row_geos])
+
+    @property
+    def n_rows(self):
+        return len(self.row_geos)
+
+    def solve(self, retention=None, quiet=True):
+        """
+        Marches the row table from the assembly's stream inlets. Updates the zones,
+        the stream profiles, hx.hot_out / hx.cold_out and hx.failures like
+        HeatExchanger.solve, and returns (hot_out, cold_out). Events go to
+        hx.events; silent unless quiet=False.
+        """
+        hx = self.hx
+        retention = Retention.coerce(retention)
+        emit = hx._emitter(quiet)
+        t_solve = t_zone = time.perf_counter()
+        emit('solve_start', mode='compiled', size=self.n_rows)
+        hot_in, cold_in = hx.hot_stream.inlet, hx.cold_stream.inlet
+        s = MarchState.from_states(hot_in, cold_in)
+        zone_id, step_id = self.columns['zone'], self.columns['step']
+
+        # Flat per-row outcomes: step record, state after the step, x
+        steps, states, xs = [None] * self.n_rows, [None] * self.n_rows, [None] * self.n_rows
+        marched = [0] * len(self.zones)
+        inlets, counters = [None] * len(self.zones), [None] * len(self.zones)
+        current, stopped = -1, False
+
+        for r in range(self.n_rows):
+            z = int(zone_id[r])
+            zone = self.zones[z]
+            if z != current:
+                if current >= 0: self._end_zone(emit, current, t_zone)
+                current, stopped = z, False
+                emit('zone_start', zone.name)
+                t_zone = time.perf_counter()
+                hot_z, cold_z = self._zone_inlets(z, s, xs, hot_in, cold_in)
+                inlets[z] = (hot_z, cold_z)
+                props = zone.property_engine
+                counters[z] = (props.stats['coolant_evals'], props.stats['coolant_reuses'])
+                zone.prepare(self.geos[z], zone.model, hot_z, cold_z)
+            if stopped: continue
+
+            i = int(step_id[r])
+            x_loc = zone.step_x(self.geos[z], i, inlets[z][0])
+            step = zone._step(self.row_geos[r], zone.model, i, s)
+            if isinstance(step, Failure):
+                emit('failure', zone.name, failure=step)
+                stopped = True
+                continue
+            steps[r], xs[r] = step, x_loc
+            states[r] = (s.Tg, s.Pg, s.Tc, s.Pc, s.mdot_g, s.mdot_c, s.w)
+            marched[z] += 1
+            if step.p.Ma >= 1.0:
+                emit('failure', zone.name, failure=Failure(zone.name, i, 'choked',
+                                                           f"Choked Flow at Row {i} (Ma = {step.p.Ma:.2f})"))
+                stopped = True
+        if current >= 0: self._end_zone(emit, current, t_zone)
+
+        # Rebuild zone results / history and the stream profiles by slicing
+        keep_rows = retention.keeps_rows
+        hx.hot_stream.profile = [hot_in] if keep_rows else []
+        hx.cold_stream.profile = [cold_in] if keep_rows else []
+        hot_out, cold_out = hot_in, cold_in
+        for z, zone in enumerate(self.zones):
+            start, stop = self.bounds[z]
+            if marched[z] == 0: continue
+            hot_z, cold_z = inlets[z]
+            rows = range(start, start + marched[z])
+            recorder = zone._recorder(retention, stop - start)
+            hot_profile, cold_profile = [], []
+            for r in rows:
+                zs = MarchState(*states[r])
+                keep = recorder.keep_row(int(step_id[r]))
+                if keep:
+                    hot_profile.append(zs.hot_state(hot_z, xs[r]))
+                    cold_profile.append(zs.cold_state(cold_z, xs[r]))
+                recorder.add_step(keep, int(step_id[r]), steps[r], zs.Tc, zs.w)
+            props = zone.property_engine
+            zone._store(recorder, zs, props.stats['coolant_evals'] - counters[z][0],
+                        props.stats['coolant_reuses'] - counters[z][1])
+            hot_out, cold_out = zone._outlet_states(hot_z, cold_z, zs, xs[rows[-1]], hot_profile, cold_profile)
+            hx.hot_stream.profile.extend(hot_profile)
+            hx.cold_stream.profile.extend(cold_profile)
+
+        hx.hot_out, hx.cold_out = hot_out, cold_out
+        emit('solve_end', outlets=[(None, hx.hot_out.T)], elapsed_s=time.perf_counter() - t_solve)
+        return hx.hot_out, hx.cold_out
+
+    def _end_zone(self, emit, z, t_zone):
+        zone = self.zones[z]
+        zone.finish(zone.model)
+        emit('zone_end', zone.name, elapsed_s=time.perf_counter() - t_zone)
+
+    def _zone_inlets(self, z, s, xs, hot_in, cold_in):
+        """ Inlet states of zone z: the assembly inlets, or the current state at the last marched x. """
+        x_prev = next((xs[r] for r in range(self.bounds[z][0] - 1, -1, -1) if xs[r] is not None), None)
+        if x_prev is None: return hot_in, cold_in
+        return s.hot_state(hot_in, x_prev), s.cold_state(cold_in, x_prev)
+
+
+class _Position:
+    """ Stand-in inlet state for step_x at compile time (only x is read). """
+    __slots__ = ('x',)
+
+    def __init__(self, x):
+        self.x = x
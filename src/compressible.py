@@ -0,0 +1,103 @@
+import math
+import numpy as np
+from src import dual
+from src.response import ResponseTable
+
+R_UNIVERSAL = 8.314462618   # [J/mol-K]
+
+# ==============================================================================
+# FANNO FLOW (adiabatic, constant area, friction)
+# ==============================================================================
+# F = f L* / D (Darcy f): friction length from Mach M to the sonic point.
+#   F(M)    = (1 - M^2) / (gamma M^2) + (gamma + 1) / (2 gamma) ln[(gamma + 1) M^2 / (2 + (gamma - 1) M^2)]
+#   P / P*  = (1 / M) sqrt((gamma + 1) / (2 + (gamma - 1) M^2))
+#   T / T*  = (gamma + 1) / (2 + (gamma - 1) M^2)
+# The forward relations are closed-form. The inverse M(F) on the subsonic branch
+# is tabulated once per process over (F, gamma), as 1 - M so the near-sonic end
+# stays a power law, and the lookup is polished by Newton steps on the exact F(M):
+# a marching segment changes F by a tiny fraction, and the outlet pressure needs
+# M to far better than any table tolerance.
+
+FANNO_F = (1e-8, 1e7)           # M from ~0.9999 down to ~3e-4
+FANNO_GAMMA = (1.05, 1.7)
+FANNO_TOL = 1e-4
+_FANNO_TABLE = []               # [ResponseTable or None], built on first use
+
+def fanno_fld(M, gamma):
+    """ Fanno friction length F = f L*/D at Mach M (scalars or arrays). """
+    M2 = M * M
+    return (1.0 - M2) / (gamma * M2) + (gamma + 1.0) / (2.0 * gamma) * \
+        np.log((gamma + 1.0) * M2 / (2.0 + (gamma - 1.0) * M2))
+
+def fanno_p_ratio(M, gamma):
+    """ Static pressure ratio P / P*. """
+    return np.sqrt((gamma + 1.0) / (2.0 + (gamma - 1.0) * M * M)) / M
+
+def fanno_T_ratio(M, gamma):
+    """ Static temperature ratio T / T*. """
+    return (gamma + 1.0) / (2.0 + (gamma - 1.0) * M * M)
+
+def fanno_mach_exact(F, gamma, iterations=60):
+    """ Subsonic Mach number with friction length F (bisection in ln M, arrays or scalars). """
+    F, gamma = np.broadcast_arrays(np.asarray(F, dtype=float), np.asarray(gamma, dtype=float))
+    lo, hi = np.full(F.shape, math.log(1e-9)), np.zeros(F.shape)
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        above = fanno_fld(np.exp(mid), gamma) > F      # F falls with M on the subsonic branch
+        lo, hi = np.where(above, mid, lo), np.where(above, hi, mid)
+    M = np.exp(0.5 * (lo + hi))
+    return float(M) if M.ndim == 0 else M
+
+def _fanno_table():
+    if not _FANNO_TABLE:
+        _FANNO_TABLE.append(ResponseTable.build(lambda F, g: 1.0 - fanno_mach_exact(F, g), [FANNO_F, FANNO_GAMMA],
+                                                [65, 5], tol=FANNO_TOL, max_nodes=100000))
+    return _FANNO_TABLE[0]
+
+def fanno_mach(F, gamma, newton=8):
+    """
+    Subsonic Mach number with friction length F (scalar): table start, Newton on F(M).
+    With Dual F / gamma the root is found on the values and carries the implicit
+    derivative of fanno_fld(M, gamma) = F.
+    """
+    if F <= 0: return 1.0
+    if dual.has_dual(F, gamma):
+        g = dual.value(gamma)
+        M = fanno_mach(dual.value(F), g, newton)
+        M2 = M * M
+        dF = -2.0 * (1.0 - M2) / (g * M2 * M * (1.0 + 0.5 * (g - 1.0) * M2))
+        r = fanno_fld(M, gamma) - F
+        return dual.Dual(M, [-a / dF for a in r.grad])
+    table = _fanno_table()
+    z = table(F, gamma) if table is not None else None
+    M = 1.0 - z if z is not None else fanno_mach_exact(F, gamma)
+    for _ in range(newton):
+        M2 = M * M
+        r = (1.0 - M2) / (gamma * M2) + (gamma + 1.0) / (2.0 * gamma) * \
+            math.log((gamma + 1.0) * M2 / (2.0 + (gamma - 1.0) * M2)) - F
+        dF = -2.0 * (1.0 - M2) / (gamma * M2 * M * (1.0 + 0.5 * (gamma - 1.0) * M2))
+        if dF == 0: break
+        step = r / dF
+        M_new = min(max(M - step, 0.5 * M), 0.5 * (M + 1.0))
+        if abs(M_new - M) <= 1e-14 * M: return M_new
+        M = M_new
+    return M
+
+
+# ==============================================================================
+# HEAT LOSS AT CONSTANT AREA (Rayleigh line)
+# ==============================================================================
+def rayleigh_cool(T, P, G, R, cp, T0_out, iterations=4):
+    """
+    Static (T, P) after the stagnation temperature changes to T0_out at constant
+    area and mass flux G: momentum P + G^2 R T / P and energy cp T + u^2 / 2 = cp T0_out
+    (ideal gas, subsonic root), by fixed-point iteration from (T, P).
+    """
+    K = P + G * G * R * T / P
+    for _ in range(iterations):
+        u = G * R * T / P
+        T = T0_out - 0.5 * u * u / cp
+        disc = K * K - 4.0 * G * G * R * T
+        if disc <= 0: break
+        P = 0.5 * (K + dual.sqrt(disc))
+    return T, P
@@ -0,0 +1,127 @@
+import numpy as np
+from src import dual
+
+M_H2O = 0.018015268     # Molar mass of water [kg/mol]
+
+class Condensation:
+    """
+    Condensing-exhaust mode: water vapour carried by a non-condensable gas.
+
+    The gas stream carries the vapour mass fraction w (FluidState.w_vap); the gas
+    fluid string is the dry carrier, whose properties the zones use as before.
+    Per marching step, with the wall temperature of the sensible exchange:
+
+      y_v   = (w / M_v) / (w / M_v + (1 - w) / M_gas)      vapour mole fraction
+      T_dew = T_sat(y_v * P)                               dew point
+      T_wall < T_dew -> condensation, heat/mass-transfer analogy (Chilton-Colburn):
+        g_m A  = UA_g / cp_g * Le^(-2/3)                   [kg/s]
+        m_cond = g_m A * ln(1 + B),   B = (w - w_s) / (1 - w_s)
+      w_s is the saturated vapour mass fraction at the wall, m_cond is capped at
+      mdot_g * B (the bulk cannot condense below wall saturation).
+
+    The latent load Q_lat = m_cond * h_fg(T_wall) goes to the coolant through the
+    wall and lifts it, T_wall = T_wall0 + Q_lat * R_wall; that equation is solved
+    on [T_wall0, T_dew] by Illinois regula falsi. The condensate drains at the
+    wall, so the gas loses m_cond. T_sat, p_sat and h_fg are PropertyEngine table
+    lookups, not mixture VLE flashes. Vapour below its triple-point pressure (or
+    a wall below the triple point) is outside the table and never condenses.
+    """
+    def __init__(self, lewis=0.85, fluid='Water', M_vapour=M_H2O, tol=0.01, max_iter=20):
+        if lewis <= 0:
+            raise ValueError(f"Lewis number must be positive. Received {lewis}.")
+        self.lewis = float(lewis)
+        self.fluid = fluid
+        self.M_vapour = float(M_vapour)
+        self.tol = float(tol)
+        self.max_iter = int(max_iter)
+
+    def mole_fraction(self, w, M_gas):
+        """ Vapour mole fraction from the vapour mass fraction (M_gas: carrier molar mass). """
+        n_v = w / self.M_vapour
+        return n_v / (n_v + (1.0 - w) / M_gas)
+
+    def mass_fraction(self, y, M_gas):
+        """ Vapour mass fraction from the vapour mole fraction. """
+        m_v = y * self.M_vapour
+        return m_v / (m_v + (1.0 - y) * M_gas)
+
+    def dew_point(self, engine, w, P, M_gas):
+        """ Dew point [K] of the gas (scalars or arrays); None / NaN without one. """
+        return engine.saturation_temperature(self.fluid, self.mole_fraction(w, M_gas) * P)
+
+    def step(self, engine, w, mdot_g, P, M_gas, cp_g, UA_g, T_wall, R_wall):
+        """
+        Condensation over one step (scalars or equal-length arrays).
+        Returns (m_cond [kg/s], Q_lat [W], T_wall [K]); rows above the dew point
+        return (0, 0, T_wall).
+        """
+        scalar = not np.ndim(T_wall)
+        if scalar and dual.has_dual(w, mdot_g, P, M_gas, cp_g, UA_g, T_wall, R_wall):
+            return self._step_dual(engine, w, mdot_g, P, M_gas, cp_g, UA_g, T_wall, R_wall)
+        w, mdot_g, P, M_gas, cp_g, UA_g, T0, R = np.broadcast_arrays(
+            *[np.atleast_1d(np.asarray(v, dtype=float)) for v in (w, mdot_g, P, M_gas, cp_g, UA_g, T_wall, R_wall)])
+        T_dew = np.asarray(self.dew_point(engine, w, P, M_gas), dtype=float)
+        with np.errstate(invalid='ignore'):
+            wet = (w > 0) & (UA_g > 0) & np.isfinite(T_dew) & (T0 < T_dew) \
+                & np.isfinite(engine.saturation_pressure(self.fluid, T0))
+
+        m_cond, Q_lat, T = np.zeros(T0.shape), np.zeros(T0.shape), T0.copy()
+        if wet.any():
+            w, mdot_g, P, M_gas, T0, R, T_dew = (a[wet] for a in (w, mdot_g, P, M_gas, T0, R, T_dew))
+            g_m = UA_g[wet] / cp_g[wet] * self.lewis**(-2.0 / 3.0)
+
+            def latent(T_w):
+                y_s = np.minimum(engine.saturation_pressure(self.fluid, T_w) / P, 1.0 - 1e-12)
+                w_s = self.mass_fraction(y_s, M_gas)
+                B = np.maximum((w - w_s) / (1.0 - w_s), 0.0)
+                m = np.minimum(g_m * np.log1p(B), mdot_g * B)
+                return m, m * engine.latent_heat(self.fluid, T_w)
+
+            # Illinois regula falsi on F(T) = T - T0 - R Q_lat(T): F(T0) <= 0 < F(T_dew)
+            a, b = T0, T_dew
+            fa, fb = -R * latent(T0)[1], T_dew - T0
+            side = np.zeros(T0.shape)
+            done = np.zeros(T0.shape, dtype=bool)
+            for _ in range(self.max_iter):
+                c_new = np.where(fb > fa, b - fb * (b - a) / np.where(fb > fa, fb - fa, 1.0), a)
+                m_new, Q_new = latent(c_new)
+                # Converged entries keep their result, so each one matches a scalar solve
+                if done.any():
+                    c, m, Q = np.where(done, c, c_new), np.where(done, m, m_new), np.where(done, Q, Q_new)
+                else:
+                    c, m, Q = c_new, m_new, Q_new
+                fc = c - T0 - R * Q
+                done |= (np.abs(fc) <= self.tol) | (b - a <= self.tol)
+                if done.all(): break
+                pos = fc > 0
+                fa = np.where(pos, np.where(side > 0, 0.5 * fa, fa), fc)
+                fb = np.where(pos, fc, np.where(side < 0, 0.5 * fb, fb))
+                a, b = np.where(pos, a, c), np.where(pos, c, b)
+                side = np.where(pos, 1.0, -1.0)
+            m_cond[wet], Q_lat[wet], T[wet] = m, Q, c
+
+        if scalar: return float(m_cond[0]), float(Q_lat[0]), float(T[0])
+        return m_cond, Q_lat, T
+
+    def _latent(self, engine, T_w, w, mdot_g, P, M_gas, cp_g, UA_g):
+        """ Scalar (m_cond, Q_lat) at wall temperature T_w, as step's latent(); Dual-safe. """
+        y_s = min(engine.saturation_pressure(self.fluid, T_w) / P, 1.0 - 1e-12)
+        w_s = self.mass_fraction(y_s, M_gas)
+        B = max((w - w_s) / (1.0 - w_s), 0.0)
+        m = min(UA_g / cp_g * self.lewis**(-2.0 / 3.0) * dual.log1p(B), mdot_g * B)
+        return m, m * engine.latent_heat(self.fluid, T_w)
+
+    def _step_dual(self, engine, w, mdot_g, P, M_gas, cp_g, UA_g, T_wall, R_wall):
+        """
+        Scalar step with Dual inputs: the wall root is found on the values, then
+        carries the implicit derivative of F(T) = T - T_wall - R_wall Q_lat(T) = 0.
+        """
+        params = (w, mdot_g, P, M_gas, cp_g, UA_g)
+        m0, _, T0 = self.step(engine, *(dual.value(x) for x in params + (T_wall, R_wall)))
+        if m0 <= 0: return 0.0, 0.0, T_wall
+        values = tuple(dual.value(x) for x in params)
+        dF_dT = 1.0 - dual.value(R_wall) * self._latent(engine, dual.Dual(T0, [1.0]), *values)[1].grad[0]
+        F = T0 - T_wall - R_wall * self._latent(engine, T0, *params)[1]
+        T = dual.Dual(T0, [-a / dF_dT for a in F.grad])
+        m, Q = self._latent(engine, T, *params)
+        return m, Q, T
@@ -1,10 +1,16 @@
 import math
+import numpy as np
+from src import dual
 
 def calc_Re(rho, u, L_char, mu):
     """
     General Reynolds number calculation.
     L_char: Characteristic length (Tube diameter for banks, Hydraulic diam for ducts)
+    Accepts scalars or arrays.
     """
+    if np.ndim(mu):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(mu <= 0, 0.0, rho * u * L_char / mu)
     if mu <= 0: return 0.0
     return rho * u * L_char / mu
 
@@ -19,15 +25,15 @@ def calc_Nu_Tariq(Re, Pr, eps_por, T, rho, mu, M_gas, L_char):
     m_molecule = M_gas / N_A
 
     # Knudsen number from kinetic theory
-    gas_term = math.sqrt((math.pi * m_molecule) / (2.0 * k_B * T))
+    gas_term = dual.sqrt((math.pi * m_molecule) / (2.0 * k_B * T))
     Kn = (mu / (rho * L_char)) * gas_term
 
     # Coefficients based on porosity
-    c1 = 3.12 - 0.16 * math.exp(3.0 * eps_por)
-    c2 = 3.45 - 3.0 * math.exp(-3.45 * eps_por)
+    c1 = 3.12 - 0.16 * dual.exp(3.0 * eps_por)
+    c2 = 3.45 - 3.0 * dual.exp(-3.45 * eps_por)
 
     Re_safe = max(Re, 1.01)
-    ln_Re = math.log(Re_safe)
+    ln_Re = dual.log(Re_safe)
 
     term1 = (0.48 - 0.2 * eps_por)
     term2 = eps_por / (1.0 - eps_por)
@@ -43,24 +49,35 @@ def calc_friction_SwameeJain(Re, rel_roughness):
     """
     Explicit approximation of Colebrook-White friction factor.
     rel_roughness = epsilon / Diameter
+    Accepts scalars or arrays of Re.
     """
+    if np.ndim(Re):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            term = (rel_roughness / 3.7) + (5.74 / (Re**0.9))
+            return np.where(Re < 2300, 64.0 / np.maximum(Re, 1.0), 0.25 / (np.log10(term))**2)
     if Re < 2300:
         return 64.0 / max(Re, 1.0)
     else:
         # Swamee-Jain
         term = (rel_roughness / 3.7) + (5.74 / (Re**0.9))
-        return 0.25 / (math.log10(term))**2
+        return 0.25 / (dual.log10(term))**2
 
 def calc_Nu_Gnielinski(Re, Pr, f, D, L):
     """
     Gnielinski correlation for internal pipe flow (Turbulent/Transition).
+    Accepts scalars or arrays of Re, Pr, f.
     """
+    if np.ndim(Re):
+        f_8 = f / 8.0
+        with np.errstate(invalid='ignore'):
+            Nu = (f_8 * (Re - 1000.0) * Pr) / (1.0 + 12.7 * (Pr**(2/3) - 1.0) * np.sqrt(f_8))
+        return np.where(Re < 2300, 4.36, Nu * (1.0 + (L / D)**(-0.7)))
     if Re < 2300: 
         return 4.36 # Laminar, constant heat flux assumption
     
     f_8 = f / 8.0
     numerator = f_8 * (Re - 1000.0) * Pr
-    denominator = 1.0 + 12.7 * (Pr**(2/3) - 1.0) * math.sqrt(f_8)
+    denominator = 1.0 + 12.7 * (Pr**(2/3) - 1.0) * dual.sqrt(f_8)
     
     # Entry length correction
     correction = 1.0 + (L / D)**(-0.7)
@@ -112,7 +129,12 @@ def calc_Nu_FlatPlate_Laminar(Re, Pr):
     """
     Laminar flow over a flat plate.
     Used for the developing region on the fins.
+    Accepts scalars or arrays.
     """
+    if np.ndim(Re):
+        with np.errstate(invalid='ignore'):
+            Nu = (0.6774 * (Re ** 0.5) * (Pr ** (1.0/3.0))) / ((1.0 + (0.0468 / Pr) ** (2.0/3.0)) ** 0.25)
+        return np.where(Re <= 1.0, 0.1, Nu)
     if Re <= 1.0: return 0.1 # Floor to avoid math errors
     
     term1 = 0.6774 * (Re ** 0.5) * (Pr ** (1.0/3.0))
@@ -130,7 +152,11 @@ def calc_entry_length_laminar(rho, u, mu, Pr, D_hydraulic):
     """
     Estimates the hydrodynamic + thermal entry length.
     x_fd ~ 0.05 * Re_D * D_h * Pr (approx for thermal)
+    Accepts scalars or arrays.
     """
+    if np.ndim(mu):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(mu <= 0, 0.0, 0.05 * ((rho * u * D_hydraulic) / mu) * D_hydraulic * Pr)
     if mu <= 0: return 0.0
     Re_D = (rho * u * D_hydraulic) / mu
     return 0.05 * Re_D * D_hydraulic * Pr
@@ -204,4 +230,63 @@ def calc_Nu_Zukauskas_1972(Re, Pr, Pr_wall, S_T, S_L, D, N_rows=20):
     # Pr exponent is 0.36 for gases (Pr ~ 0.7)
     Nu = C1 * C2 * (Re**m) * (Pr**0.36) * ((Pr / Pr_wall)**0.25)
     
-    return Nu
\ No newline at end of file
+    return Nu
+
+
+# ==============================================================================
+# ANNULAR FIN EFFICIENCY
+# ==============================================================================
+# Exponentially scaled modified Bessel functions, Abramowitz & Stegun 9.8.1-9.8.8
+# (|error| < 2e-7 relative): _bessel_is(n, x) = I_n(x) e^-x, _bessel_ks(n, x) = K_n(x) e^x
+
+def _bessel_is(n, x):
+    if x < 3.75:
+        t2 = (x / 3.75)**2
+        if n == 0:
+            I = 1.0 + t2*(3.5156229 + t2*(3.0899424 + t2*(1.2067492 + t2*(0.2659732 + t2*(0.0360768 + t2*0.0045813)))))
+        else:
+            I = x * (0.5 + t2*(0.87890594 + t2*(0.51498869 + t2*(0.15084934 + t2*(0.02658733 + t2*(0.00301532 + t2*0.00032411))))))
+        return I * dual.exp(-x)
+    r = 3.75 / x
+    if n == 0:
+        p = 0.39894228 + r*(0.01328592 + r*(0.00225319 + r*(-0.00157565 + r*(0.00916281 + r*(-0.02057706
+            + r*(0.02635537 + r*(-0.01647633 + r*0.00392377)))))))
+    else:
+        p = 0.39894228 + r*(-0.03988024 + r*(-0.00362018 + r*(0.00163801 + r*(-0.01031555 + r*(0.02282967
+            + r*(-0.02895312 + r*(0.01787654 + r*-0.00420059)))))))
+    return p / dual.sqrt(x)
+
+def _bessel_ks(n, x):
+    if x <= 2.0:
+        u2 = (x / 2.0)**2
+        I = _bessel_is(n, x) * dual.exp(x)
+        if n == 0:
+            K = -dual.log(x / 2.0) * I + (-0.57721566 + u2*(0.42278420 + u2*(0.23069756 + u2*(0.03488590
+                + u2*(0.00262698 + u2*(0.00010750 + u2*0.00000740))))))
+        else:
+            K = dual.log(x / 2.0) * I + (1.0 + u2*(0.15443144 + u2*(-0.67278579 + u2*(-0.18156897
+                + u2*(-0.01919402 + u2*(-0.00110404 + u2*-0.00004686)))))) / x
+        return K * dual.exp(x)
+    v = 2.0 / x
+    if n == 0:
+        p = 1.25331414 + v*(-0.07832358 + v*(0.02189568 + v*(-0.01062446 + v*(0.00587872 + v*(-0.00251540 + v*0.00053208)))))
+    else:
+        p = 1.25331414 + v*(0.23498619 + v*(-0.03655620 + v*(0.01504268 + v*(-0.00780353 + v*(0.00325614 + v*-0.00068245)))))
+    return p / dual.sqrt(x)
+
+def calc_eta_annular_fin(mL, r_ratio):
+    """
+    Efficiency of an annular fin of uniform thickness with a corrected (adiabatic) tip,
+    exact Bessel-function solution (Incropera, Table 3.5):
+      mL      = m * (r2c - r1),  m = sqrt(2h / (k_fin * t)),  r2c = r2 + t/2
+      r_ratio = r2c / r1
+    Evaluated in scaled form, so it stays finite for large m*r.
+    """
+    if mL <= 0: return 1.0
+    if r_ratio <= 1.0 + 1e-6: return dual.tanh(mL) / mL    # Straight-fin limit
+    a = mL / (r_ratio - 1.0)    # m*r1
+    b = a * r_ratio             # m*r2c
+    e = dual.exp(2.0 * (a - b))
+    num = _bessel_ks(1, a) * _bessel_is(1, b) - _bessel_is(1, a) * _bessel_ks(1, b) * e
+    den = _bessel_is(0, a) * _bessel_ks(1, b) * e + _bessel_ks(0, a) * _bessel_is(1, b)
+    return (2.0 / (a * (r_ratio**2 - 1.0))) * num / den
@@ -0,0 +1,166 @@
+import math
+
+import numpy as np
+
+# ==============================================================================
+# DUAL NUMBERS
+# ==============================================================================
+class Dual:
+    """
+    Forward-mode dual number: a value plus its gradient w.r.t. N seed parameters.
+    Arithmetic and comparisons behave like floats (comparisons use the value only),
+    so branchy physics (min(), regime switches) runs unchanged.
+
+    The scalar physics of the zones is written against the elementary functions of
+    this module (exp, log, sqrt, ...), which take floats or Duals; NumPy ufuncs on a
+    Dual dispatch to the methods of the same name. int() and math.floor() return
+    the integer part of the value (counts are piecewise constant). There is no
+    float(): a conversion that would silently drop the gradient raises instead.
+    """
+    __slots__ = ('val', 'grad')
+
+    def __init__(self, val, grad):
+        self.val = float(val)
+        self.grad = tuple(grad)
+
+    @staticmethod
+    def seed(val, index, n):
+        grad = [0.0] * n
+        grad[index] = 1.0
+        return Dual(val, grad)
+
+    def _chain(self, f, df):
+        return Dual(f, [df * a for a in self.grad])
+
+    # --- Arithmetic ---
+    def __add__(self, o):
+        if isinstance(o, Dual):
+            return Dual(self.val + o.val, [a + b for a, b in zip(self.grad, o.grad)])
+        return Dual(self.val + o, self.grad)
+    __radd__ = __add__
+
+    def __sub__(self, o):
+        if isinstance(o, Dual):
+            return Dual(self.val - o.val, [a - b for a, b in zip(self.grad, o.grad)])
+        return Dual(self.val - o, self.grad)
+
+    def __rsub__(self, o):
+        return Dual(o - self.val, [-a for a in self.grad])
+
+    def __mul__(self, o):
+        if isinstance(o, Dual):
+            return Dual(self.val * o.val, [a * o.val + self.val * b for a, b in zip(self.grad, o.grad)])
+        return Dual(self.val * o, [a * o for a in self.grad])
+    __rmul__ = __mul__
+
+    def __truediv__(self, o):
+        if isinstance(o, Dual):
+            inv = 1.0 / o.val
+            q = self.val * inv
+            return Dual(q, [(a - q * b) * inv for a, b in zip(self.grad, o.grad)])
+        return Dual(self.val / o, [a / o for a in self.grad])
+
+    def __rtruediv__(self, o):
+        q = o / self.val
+        return Dual(q, [-q * a / self.val for a in self.grad])
+
+    def __pow__(self, p):
+        if isinstance(p, Dual):
+            v = self.val ** p.val
+            dv, dp = p.val * self.val ** (p.val - 1.0), v * math.log(self.val)
+            return Dual(v, [dv * a + dp * b for a, b in zip(self.grad, p.grad)])
+        v = self.val ** p
+        dv = p * self.val ** (p - 1.0) if p != 0 else 0.0
+        return self._chain(v, dv)
+
+    def __rpow__(self, base):
+        v = base ** self.val
+        return self._chain(v, v * math.log(base))
+
+    def __neg__(self):
+        return Dual(-self.val, [-a for a in self.grad])
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.val < 0 else self
+
+    # --- Comparisons (value only) ---
+    def __lt__(self, o): return self.val < value(o)
+    def __le__(self, o): return self.val <= value(o)
+    def __gt__(self, o): return self.val > value(o)
+    def __ge__(self, o): return self.val >= value(o)
+    def __eq__(self, o): return self.val == value(o)
+    def __ne__(self, o): return self.val != value(o)
+    def __hash__(self): return hash(self.val)
+    def __bool__(self): return self.val != 0.0
+
+    # --- Integer parts (zero derivative) ---
+    def __int__(self): return int(self.val)
+    def __floor__(self): return math.floor(self.val)
+    def floor(self): return float(math.floor(self.val))
+
+    # --- Elementary functions (also the NumPy ufunc hooks) ---
+    def exp(self):
+        v = math.exp(self.val)
+        return self._chain(v, v)
+
+    def log(self):
+        return self._chain(math.log(self.val), 1.0 / self.val)
+
+    def log10(self):
+        return self._chain(math.log10(self.val), 1.0 / (self.val * math.log(10.0)))
+
+    def log1p(self):
+        return self._chain(math.log1p(self.val), 1.0 / (1.0 + self.val))
+
+    def sqrt(self):
+        v = math.sqrt(self.val)
+        return self._chain(v, 0.5 / v if v > 0 else 0.0)
+
+    def tanh(self):
+        v = math.tanh(self.val)
+        return self._chain(v, 1.0 - v * v)
+
+    def __format__(self, spec):
+        return format(self.val, spec)
+
+    def __repr__(self):
+        return f"Dual({self.val:.6g}, grad={tuple(round(g, 6) for g in self.grad)})"
+
+
+def value(x):
+    """ The value of a Dual; anything else unchanged. """
+    return x.val if isinstance(x, Dual) else x
+
+def values(a):
+    """ The values of an array that may hold Duals, as a float array. """
+    a = np.asarray(a)
+    return np.vectorize(value, otypes=[float])(a) if a.dtype == object else a
+
+def as_float(x):
+    """ float(x) for numbers and NumPy scalars; a Dual is returned as is. """
+    return x if isinstance(x, Dual) else float(x)
+
+def has_dual(*xs):
+    return any(isinstance(x, Dual) for x in xs)
+
+def chain(f, partials, args):
+    """
+    f = F(args) with known partial derivatives dF/d(arg): a Dual carrying the
+    chain rule through the Dual args, or the plain value when none is a Dual.
+    """
+    grad = None
+    for d, x in zip(partials, args):
+        if isinstance(x, Dual):
+            g = [d * a for a in x.grad]
+            grad = g if grad is None else [a + b for a, b in zip(grad, g)]
+    return f if grad is None else Dual(f, grad)
+
+def exp(x):   return x.exp() if isinstance(x, Dual) else math.exp(x)
+def log(x):   return x.log() if isinstance(x, Dual) else math.log(x)
+def log10(x): return x.log10() if isinstance(x, Dual) else math.log10(x)
+def log1p(x): return x.log1p() if isinstance(x, Dual) else math.log1p(x)
+def sqrt(x):  return x.sqrt() if isinstance(x, Dual) else math.sqrt(x)
+def tanh(x):  return x.tanh() if isinstance(x, Dual) else math.tanh(x)
@@ -0,0 +1,69 @@
+from collections import namedtuple
+
+# ==============================================================================
+# SOLVE EVENTS
+# ==============================================================================
+# One event of a solve. kind / data:
+#   'solve_start'  mode ('sequential' | 'ensemble' | 'compiled'), size (models or rows)
+#   'zone_start'   -
+#   'failure'      failure (Failure)
+#   'zone_end'     elapsed_s (wall time; for iter_solve it includes the consumer's)
+#   'solve_end'    outlets [(model name or None, T_gas_out [K])], elapsed_s
+# solver is the assembly (or standalone zone) name, zone the zone name or None.
+SolveEvent = namedtuple('SolveEvent', 'kind solver zone data')
+
+# A march stopped early: zone, step index, kind ('pressure' | 'property' | 'choked'),
+# message, and for ensemble members the model name and member index (None otherwise)
+Failure = namedtuple('Failure', 'zone row kind message model member', defaults=(None, None))
+
+def console(event):
+    """ Listener printing the solve progress lines to stdout. """
+    kind, data = event.kind, event.data
+    if kind == 'solve_start':
+        mode = data.get('mode')
+        if mode == 'ensemble': print(f"--- Solving {event.solver} (Ensemble x{data['size']}) ---")
+        elif mode == 'compiled': print(f"--- Solving {event.solver} (compiled, {data['size']} rows) ---")
+        else: print(f"--- Solving {event.solver} ---")
+    elif kind == 'zone_start':
+        print(f"  > Marching Zone: {event.zone}...")
+    elif kind == 'failure':
+        f = data['failure']
+        print(f"  [FAILURE] {f.model + ': ' if f.model else ''}{f.message}")
+    elif kind == 'solve_end':
+        for model, T in data['outlets']:
+            print(f"--- Complete{f' ({model})' if model else ''}. T_gas_out: {T:.2f} K ---")
+
+
+class SolveEvents:
+    """
+    Listener registry of a solver. Listeners are callables taking a SolveEvent;
+    the default registry holds the console listener only. Solves run with
+    quiet=True skip the console listener; every other listener still receives
+    all events.
+    """
+    def __init__(self, *listeners):
+        self.listeners = list(listeners) if listeners else [console]
+
+    def subscribe(self, listener):
+        if listener not in self.listeners: self.listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener):
+        if listener in self.listeners: self.listeners.remove(listener)
+
+    def emitter(self, solver, quiet=False, extra=()):
+        """ Returns emit(kind, zone=None, **data), bound to the solver name; extra listeners are appended. """
+        listeners = [fn for fn in self.listeners if not (quiet and fn is console)] + list(extra)
+
+        def emit(kind, zone=None, **data):
+            if not listeners: return
+            event = SolveEvent(kind, solver, zone, data)
+            for fn in listeners: fn(event)
+        return emit
+
+
+def failure_collector(failures):
+    """ Listener appending every Failure to the list failures. """
+    def collect(event):
+        if event.kind == 'failure': failures.append(event.data['failure'])
+    return collect
@@ -0,0 +1,173 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from src.properties import DEFAULT_ENGINE
+from src.zones import PipeFlowZone, TubeBankZone
+from src import correlations as corr
+
+@dataclass
+class FeasibilityIssue:
+    """
+    One reason a design may fail.
+      severity: 'error'   -> the march is certain to fail (design rejected)
+                'warning' -> failure or out-of-range correlation use is possible
+    """
+    zone: str
+    code: str
+    severity: str
+    message: str
+    value: Optional[float] = None
+    limit: Optional[float] = None
+
+@dataclass
+class FeasibilityReport:
+    """ Result of the pre-march screen. dP_gas_min_Pa is a guaranteed lower bound. """
+    feasible: bool = True
+    issues: List[FeasibilityIssue] = field(default_factory=list)
+    dP_gas_min_Pa: float = 0.0
+    dP_gas_inlet_est_Pa: float = 0.0
+
+    @property
+    def errors(self):
+        return [i for i in self.issues if i.severity == 'error']
+
+    @property
+    def warnings(self):
+        return [i for i in self.issues if i.severity == 'warning']
+
+    def add(self, issue):
+        self.issues.append(issue)
+        if issue.severity == 'error':
+            self.feasible = False
+
+
+def _gas_bounds(hot_in, cold_in, engine):
+    """
+    Gas property envelope over the march. The gas temperature stays within
+    [T_cool_in, T_gas_in] and the pressure never exceeds P_in, so:
+      rho_max = rho(T_cool_in, P_in)   (densest possible gas)
+      mu_min  = mu(T_cool_in)          (gas viscosity rises with T)
+      mu_max  = mu(T_gas_in)
+    """
+    T_lo = min(cold_in.T, hot_in.T)
+    cold = engine.gas(hot_in.fluid_string, T_lo, hot_in.P, T_lo)
+    hot = engine.gas(hot_in.fluid_string, hot_in.T, hot_in.P, T_lo)
+    return {'rho_max': cold[0], 'mu_min': cold[1], 'rho_in': hot[0], 'mu_max': hot[1], 'mu_wall_in': hot[6]}
+
+
+def _pipe_dP(zone, rho, mu, mdot):
+    u_avg = mdot / (rho * zone.area)
+    Re_D = corr.calc_Re(rho, u_avg, zone.diameter, mu)
+    f = corr.calc_friction_SwameeJain(Re_D, zone.roughness / zone.diameter)
+    return f * (zone.length / zone.diameter) * 0.5 * rho * (u_avg**2)
+
+
+def _bank_dP(zone, geo, rho, mu, mu_wall, mdot):
+    return zone.pressure_model.calculate_dP(rho=rho, mu=mu, mu_wall=mu_wall, m_dot=mdot, **zone._dP_geometry(geo))
+
+
+def _check_correlation(zone, geo, bounds, mdot, report):
+    """ Grimison-family Re / geometry limits from the viscosity envelope (one issue per code and zone). """
+    model = zone.model
+    limits = getattr(model, 'LIMITS', None)
+    if limits is None or not hasattr(model, 'calculate_Re_max'):
+        return
+    severity = 'error' if getattr(model, 'strict_limits', False) else 'warning'
+    name = type(model).__name__
+    reported = {i.code for i in report.issues if i.zone == zone.name}
+    def add(issue):
+        if issue.code not in reported:
+            reported.add(issue.code)
+            report.add(issue)
+
+    a, b = geo['S_T'] / geo['D'], geo['S_L'] / geo['D']
+    if hasattr(model, '_check_geometry'):
+        try:
+            model._check_geometry(a, b)
+        except ValueError as e:
+            add(FeasibilityIssue(zone.name, 'GEOMETRY_OUT_OF_RANGE', severity, f"{name}: {e}"))
+
+    Re_lo, Re_hi = zone._Re_bounds(geo, model, mdot, bounds['mu_min'], bounds['mu_max'])
+    Re_min, Re_max = limits['Re_min'], limits['Re_max']
+    if Re_hi < Re_min:
+        add(FeasibilityIssue(zone.name, 'RE_BELOW_RANGE', severity,
+            f"{name}: Re <= {Re_hi:.0f} everywhere, below valid minimum {Re_min}.", Re_hi, Re_min))
+    elif Re_lo > Re_max:
+        add(FeasibilityIssue(zone.name, 'RE_ABOVE_RANGE', severity,
+            f"{name}: Re >= {Re_lo:.0f} everywhere, above valid maximum {Re_max}.", Re_lo, Re_max))
+    elif Re_lo < Re_min or Re_hi > Re_max:
+        add(FeasibilityIssue(zone.name, 'RE_PARTIALLY_OUT_OF_RANGE', 'warning',
+            f"{name}: Re may span [{Re_lo:.0f}, {Re_hi:.0f}], outside [{Re_min}, {Re_max}].",
+            Re_lo if Re_lo < Re_min else Re_hi, Re_min if Re_lo < Re_min else Re_max))
+
+
+def _row_groups(zone, geo):
+    """ (row geometry, row count) pairs: one group for a uniform bank, one per row when graded. """
+    n = zone.n_steps(geo)
+    if zone.row_geometry(geo, 0) is geo: return [(geo, n)]
+    return [(zone.row_geometry(geo, i), 1) for i in range(n)]
+
+
+def prescreen(hx, engine=None):
+    """
+    Conservative feasibility screen from inlet conditions and geometry alone
+    (two gas property flashes, no march).
+
+    - Gas pressure: sums a guaranteed lower bound of every row's dP (densest gas,
+      lowest viscosity, smallest wall-viscosity ratio). If the bound exhausts
+      the inlet pressure the design is rejected.
+    - Correlation validity: Grimison-family Re and geometry limits.
+    A design marked infeasible can never march successfully; a feasible one may
+    still fail, see report.warnings.
+    """
+    engine = engine if engine else DEFAULT_ENGINE
+    hot_in, cold_in = hx.hot_stream.inlet, hx.cold_stream.inlet
+    report = FeasibilityReport()
+
+    if hot_in.P <= 0:
+        report.add(FeasibilityIssue(hx.name, 'INLET_PRESSURE', 'error',
+                   f"Gas inlet pressure non-positive ({hot_in.P:.2f} Pa).", hot_in.P, 0.0))
+        return report
+
+    bounds = _gas_bounds(hot_in, cold_in, engine)
+    mdot = hot_in.m_dot
+    P_in = hot_in.P
+    visc_floor = bounds['mu_min'] / bounds['mu_max']
+    dP_min = dP_est = 0.0
+    exhausted = False
+
+    for zone in hx.zones:
+        if isinstance(zone, PipeFlowZone):
+            dP_min += _pipe_dP(zone, bounds['rho_max'], bounds['mu_min'], mdot)
+            dP_est += _pipe_dP(zone, bounds['rho_in'], bounds['mu_max'], mdot)
+        elif isinstance(zone, TubeBankZone):
+            if not zone.tube_centers: zone.build_geometry()
+            if zone.S_T <= zone.tube_dia:
+                report.add(FeasibilityIssue(zone.name, 'GEOMETRY_BLOCKED', 'error',
+                           f"S_T ({zone.S_T:.4f} m) <= tube diameter ({zone.tube_dia:.4f} m): no gas flow area.",
+                           zone.S_T, zone.tube_dia))
+                continue
+            exponent = getattr(zone.pressure_model, 'viscosity_exponent', None)
+            for geo, n_rows in _row_groups(zone, zone.compile_geometry()):
+                _check_correlation(zone, geo, bounds, mdot, report)
+                if exponent is not None:
+                    row_min = _bank_dP(zone, geo, bounds['rho_max'], bounds['mu_min'], bounds['mu_min'], mdot)
+                    dP_min += n_rows * row_min * visc_floor**exponent
+                row_est = _bank_dP(zone, geo, bounds['rho_in'], bounds['mu_max'], bounds['mu_wall_in'], mdot)
+                dP_est += n_rows * row_est
+        else:
+            continue
+
+        if dP_min >= P_in and not exhausted:
+            exhausted = True
+            report.add(FeasibilityIssue(zone.name, 'PRESSURE_EXHAUSTED', 'error',
+                       f"Gas pressure exhausted by {zone.name}: dP >= {dP_min:.1f} Pa vs inlet {P_in:.1f} Pa.",
+                       dP_min, P_in))
+
+    report.dP_gas_min_Pa = dP_min
+    report.dP_gas_inlet_est_Pa = dP_est
+    if report.feasible and dP_est >= P_in:
+        report.add(FeasibilityIssue(hx.name, 'PRESSURE_MARGIN', 'warning',
+                   f"Inlet-state dP estimate {dP_est:.1f} Pa exceeds inlet pressure {P_in:.1f} Pa.",
+                   dP_est, P_in))
+    return report
@@ -23,13 +23,14 @@ class FluidState:
         density, Specific Heat, Viscosity, etc. are calculated on demand.
         Fluid can be a mixture or single species.
     '''
-    def __init__(self, name,T, P, m_dot, fluid, x=0.0):        
+    def __init__(self, name,T, P, m_dot, fluid, x=0.0, w_vap=0.0):        
         self.name      = name           # [StreamType] Type of Fluid (gas or coolant)
         self.T         = float(T)       # [K] Fluid Temperature
         self.P         = float(P)       # [Pa] Fluid Pressure
         self.m_dot     = float(m_dot)   # [kg/s] Fluid Mass Flowrate
         self.fluid_obj = fluid          # [Fluid or Dict] Input String for CoolProp
         self.x         = float(x)       # [m] Position along Heat Exchanger
+        self.w_vap     = float(w_vap)   # [-] Condensable water-vapour mass fraction (condensing-exhaust mode)
         
         self.fluid_string = self._parse_fluid(fluid)    # Convert input fluid to CoolProp format
 
@@ -99,7 +100,8 @@ class FluidState:
             P=self.P,
             m_dot=self.m_dot,
             fluid=self.fluid_obj, # Pass the original object (Dict/Enum/Str)
-            x=self.x
+            x=self.x,
+            w_vap=self.w_vap
         )
 
     def __repr__(self):
@@ -0,0 +1,210 @@
+import math
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from src.fluids import FluidState
+
+# Inverse variables: name -> (stream, inlet attribute)
+VARIABLES = {
+    'coolant_flow': ('cold', 'm_dot'),
+    'gas_flow':     ('hot', 'm_dot'),
+    'coolant_T':    ('cold', 'T'),
+    'gas_T':        ('hot', 'T'),
+    'coolant_P':    ('cold', 'P'),
+    'gas_P':        ('hot', 'P'),
+}
+# Targets: 'T_out' = gas outlet temperature [K], 'dP' = gas pressure drop [Pa]
+TARGETS = ('T_out', 'dP')
+
+@dataclass
+class OperatingPointResult:
+    """
+    Result of an inverse operating-point solve. x is the best iterate; meets_target
+    is True when its metric is at or below the target (T_out <= target, dP <= limit).
+    bracket is the final sign-change interval of the root, or None if none was found.
+    iterations holds (x, metric) of every forward solve, in order.
+    """
+    variable: str
+    target: str
+    value: float
+    x: Optional[float] = None
+    metric: Optional[float] = None
+    converged: bool = False
+    meets_target: bool = False
+    bracket: Optional[Tuple[float, float]] = None
+    iterations: List[Tuple[float, float]] = field(default_factory=list)
+    n_solves: int = 0
+    elapsed_s: float = 0.0
+    message: str = ''
+
+
+class _Forward:
+    """
+    Memoised forward solve of the compiled assembly as a function of one inlet
+    variable; returns metric - target (+inf when the march fails, which on the
+    T_out / dP targets means the gas side is overloaded).
+    """
+    def __init__(self, hx, variable, target, value):
+        self.hx, self.target, self.value = hx, target, value
+        side, self.attr = VARIABLES[variable]
+        self.stream = hx.hot_stream if side == 'hot' else hx.cold_stream
+        self.compiled = hx.compile()        # geometry compiled once for all iterations
+        self.cache, self.iterations = {}, []
+
+    def inlet(self, x):
+        """ The original inlet state with the variable set to x. """
+        s = self.stream.inlet
+        values = {'T': s.T, 'P': s.P, 'm_dot': s.m_dot, self.attr: x}
+        return FluidState(s.name, values['T'], values['P'], values['m_dot'], s.fluid_obj, x=s.x, w_vap=s.w_vap)
+
+    def __call__(self, x):
+        if x in self.cache: return self.cache[x]
+        saved, self.stream.inlet = self.stream.inlet, self.inlet(x)
+        try:
+            hot_out, _ = self.compiled.solve(retention='summary', quiet=True)
+        finally:
+            self.stream.inlet = saved
+        if self.hx.failures:
+            metric = math.inf
+        else:
+            metric = hot_out.T if self.target == 'T_out' else self.hx.hot_stream.inlet.P - hot_out.P
+        self.iterations.append((x, metric))
+        self.cache[x] = metric - self.value
+        return self.cache[x]
+
+
+def _bracket(f, x0, f0, lo, hi, factor, max_solves):
+    """
+    Geometric bracket search from x0 within [lo, hi]: one trial step up by factor
+    gives the direction in which |f| falls, then steps continue that way until f
+    changes sign. Returns (a, b, fa, fb) or None.
+    """
+    up = min(x0 * factor, hi)
+    f_up = f(up)
+    if _opposite(f0, f_up): return (x0, up, f0, f_up)
+    rising = abs(f_up) < abs(f0) if math.isfinite(f_up) else False
+    x, fx = (up, f_up) if rising else (x0, f0)
+    while len(f.iterations) < max_solves:
+        x_new = min(x * factor, hi) if rising else max(x / factor, lo)
+        if x_new == x: return None
+        f_new = f(x_new)
+        if _opposite(fx, f_new): return (x, x_new, fx, f_new)
+        x, fx = x_new, f_new
+    return None
+
+def _opposite(fa, fb):
+    return (fa <= 0) != (fb <= 0)
+
+
+def _brent(f, a, b, fa, fb, ftol, xtol, max_solves):
+    """
+    Brent's method (inverse quadratic / secant steps guarded by bisection) on a
+    sign-change bracket. Non-finite function values force bisection.
+    Returns (b, fb, c, fc): best iterate and the opposite end of the final bracket.
+    """
+    eps = 2.2e-16
+    c, fc = b, fb
+    d = e = b - a
+    while True:
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol1 = 2.0 * eps * abs(b) + 0.5 * xtol
+        xm = 0.5 * (c - b)
+        if abs(xm) <= tol1 or abs(fb) <= ftol or len(f.iterations) >= max_solves:
+            return b, fb, c, fc
+        if abs(e) >= tol1 and abs(fa) > abs(fb) and math.isfinite(fa) and math.isfinite(fc):
+            s = fb / fa
+            if a == c:
+                p, q = 2.0 * xm * s, 1.0 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2.0 * xm * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0: q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * xm * q - abs(tol1 * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = xm
+        else:
+            d = e = xm
+        a, fa = b, fb
+        b += d if abs(d) > tol1 else math.copysign(tol1, xm)
+        fb = f(b)
+
+
+def solve_operating_point(hx, variable, target='T_out', value=None, x0=None, bounds=None, tol=None,
+                          xtol=1e-4, factor=2.0, max_solves=20, retention=None):
+    """
+    Finds the inlet value of one variable at which the assembly meets a target:
+    the gas outlet temperature (target='T_out', value defaults to hx.target_T_out)
+    or the gas pressure drop (target='dP', value = limit [Pa]). For a monotone
+    response that is, e.g., the minimum coolant flow or the maximum gas flow that
+    just meets the target.
+
+    variable: one of VARIABLES ('coolant_flow', 'gas_flow', 'coolant_T', 'gas_T',
+              'coolant_P', 'gas_P'). x0 is the start (default: current inlet value),
+              bounds the admissible (lo, hi) range (default (0, inf)).
+    tol:      metric tolerance (default 0.05 K, or 1e-3 of the dP limit);
+    xtol:     bracket width tolerance, relative to x0.
+
+    The march is compiled once (HeatExchanger.compile) and every forward solve is
+    memoised; the bracket starts at x0 and steps by factor, Brent's method then
+    closes it. Marches that fail count as not meeting the target. Each forward
+    solve marches the whole assembly: both streams enter at the first row, so
+    every variable changes every row downstream of it.
+    Afterwards the stream inlet is set to the result and the assembly solved
+    there with the given retention, so hx.hot_out, the zone results and
+    summary() all describe that operating point.
+    """
+    if variable not in VARIABLES:
+        raise ValueError(f"Unknown inverse variable '{variable}'. Must be one of {tuple(VARIABLES)}.")
+    if target not in TARGETS:
+        raise ValueError(f"Unknown target '{target}'. Must be one of {TARGETS}.")
+    if value is None:
+        if target != 'T_out' or hx.target_T_out is None:
+            raise ValueError("No target value: pass value= or call set_target_outlet_temp() first.")
+        value = hx.target_T_out
+    value = float(value)
+    if tol is None: tol = 0.05 if target == 'T_out' else 1e-3 * value
+
+    t_start = time.perf_counter()
+    f = _Forward(hx, variable, target, value)
+    if x0 is None: x0 = getattr(f.stream.inlet, f.attr)
+    lo, hi = bounds if bounds is not None else (0.0, math.inf)
+    x0 = min(max(float(x0), lo), hi)
+    if x0 <= 0: raise ValueError(f"Inverse start value must be positive. Received {x0}.")
+    result = OperatingPointResult(variable, target, value)
+
+    f0 = f(x0)
+    found = _bracket(f, x0, f0, lo, hi, factor, max_solves) if abs(f0) > tol else (x0, x0, f0, f0)
+    if found is None:
+        x_best, f_best = min(f.cache.items(), key=lambda kv: abs(kv[1]))
+        result.x, result.metric = x_best, f_best + value
+        result.message = f"No sign change of {target} - {value:g} found within the bounds."
+    else:
+        a, b, fa, fb = found
+        if a == b:
+            x_best, f_best, result.bracket = a, fa, None
+        else:
+            x_best, f_best, c, fc = _brent(f, a, b, fa, fb, tol, xtol * abs(x0), max_solves)
+            result.bracket = (min(x_best, c), max(x_best, c))
+        result.x, result.metric = x_best, f_best + value
+        closed = result.bracket is not None and result.bracket[1] - result.bracket[0] <= xtol * abs(x0)
+        if abs(f_best) > tol and closed and not math.isfinite(fc):
+            result.message = f"The march fails beyond {variable} = {x_best:g} before {target} reaches {value:g}."
+        else:
+            result.converged = abs(f_best) <= tol or closed
+            result.message = 'converged' if result.converged else f"Stopped after {max_solves} forward solves."
+    result.meets_target = f_best <= 0
+    result.iterations, result.n_solves = list(f.iterations), len(f.iterations)
+
+    f.stream.inlet = f.inlet(result.x)
+    hx.solve(retention, quiet=True)
+    result.elapsed_s = time.perf_counter() - t_start
+    return result
@@ -1,6 +1,58 @@
 from abc import ABC, abstractmethod
+from collections import Counter
+import numpy as np
 
 class HeatTransferModel(ABC):
+    """
+    Validation levels (correlation range / geometry checks):
+      - 'strict': every calculate_Nu call validates its inputs (default)
+      - 'zone':   zones call validate_zone() once with the predicted Re bounds and
+                  pass validate=False per row, so the row path is arithmetic only
+      - 'off':    no checks
+    Per-row conditions that used to be logged every row are counted with _note()
+    and collected by the zone with pop_notes() at the end of its march.
+    """
+    VALIDATION_LEVELS = ('strict', 'zone', 'off')
+    validation = 'strict'
+
+    def set_validation(self, level):
+        if level not in self.VALIDATION_LEVELS:
+            raise ValueError(f"Unknown validation level '{level}'. Must be one of {self.VALIDATION_LEVELS}.")
+        self.validation = level
+        return self
+
+    def validate_zone(self, Re_min, Re_max, **params):
+        """ Once-per-zone check over the Re range [Re_min, Re_max] a zone can reach. """
+        pass
+
+    def _note(self, message):
+        """ Counts a per-row condition instead of logging it on every call. """
+        self.__dict__.setdefault('_notes', Counter())[message] += 1
+
+    def pop_notes(self):
+        """ Returns and clears the condition counts collected since the last call. """
+        return self.__dict__.pop('_notes', Counter())
+
     @abstractmethod
     def calculate_Nu(self, *args, **kwargs):
         pass
+
+    def calculate_Nu_array(self, Re, Pr, **kwargs):
+        """
+        Array API: Nu for NumPy arrays of Re and Pr. Per-state kwargs (T, rho, mu,
+        Pr_wall, ...) may be arrays of the same shape; geometry kwargs stay scalar.
+        Regime selection and formulas match calculate_Nu element by element; values
+        are bit-identical when NumPy's SIMD math kernels are disabled
+        (NPY_DISABLE_CPU_FEATURES), otherwise within a few ulp.
+
+        This default loops the scalar path; models override it with a masked,
+        vectorized evaluation.
+        """
+        Re, Pr = np.broadcast_arrays(np.asarray(Re, dtype=float), np.asarray(Pr, dtype=float))
+        per_state = {k: np.broadcast_to(v, Re.shape) for k, v in kwargs.items() if np.ndim(v)}
+        Nu = np.empty(Re.shape)
+        for idx in np.ndindex(Re.shape):
+            params = dict(kwargs)
+            params.update({k: v[idx].item() for k, v in per_state.items()})
+            Nu[idx] = self.calculate_Nu(Re[idx].item(), Pr[idx].item(), **params)
+        return Nu
@@ -1,5 +1,8 @@
-import math
+import bisect
 import logging
+import numpy as np
+
+from src import dual
 
 try: from .base import HeatTransferModel
 except ImportError: from  base import HeatTransferModel    # Fallback when running as a script 
@@ -14,8 +17,9 @@ class GrimisonModel(HeatTransferModel):
     Grimison (1937) Correlation.
     
     Methods:
-      - 'nearest': Table lookup (Robust)
-      - 'hammock': Polynomial fits from Hammock Dissertation (Best for Validation)
+      - 'nearest':  Table lookup (Robust)
+      - 'bilinear': Table interpolated on a regular (a, b) grid (Smooth, for sweeps)
+      - 'hammock':  Polynomial fits from Hammock Dissertation (Best for Validation)
     """
     LIMITS = {'Re_min': 500, 'Re_max': 40_000,
               'a_min': 1.25,  'a_max':  3.60,       # a = S_T/d_out
@@ -54,13 +58,19 @@ class GrimisonModel(HeatTransferModel):
         (3.00, 3.00): (0.428, 0.574),
     }
 
+    # calculate_Nu raises ValueError outside LIMITS (used by the feasibility pre-screen)
+    strict_limits = True
+
     _ROW_CORRECTIONS = {1: 0.68, 2: 0.75, 3: 0.83, 4: 0.89, 5: 0.92,
                         6: 0.95, 7: 0.97, 8: 0.98, 9: 0.99}
 
-    def __init__(self, method="hammock"):
+    def __init__(self, method="hammock", validation="strict"):
         ''' method: 'hammock' will use the Hammock Polynomial Curves
-                    'nearest' will use table lookup from the provided _COEFFICIENTS '''
+                    'nearest' will use table lookup from the provided _COEFFICIENTS
+                    'bilinear' will interpolate _COEFFICIENTS on a regular (a, b) grid
+            validation: 'strict', 'zone' or 'off' (see HeatTransferModel) '''
         self.method = method
+        self.set_validation(validation)
         msg = f'Grimison (1937): Using {method} for coefficient calculation.'
         logger.info(msg)
 
@@ -108,8 +118,7 @@ class GrimisonModel(HeatTransferModel):
             logger.critical(msg)
             raise ValueError(msg)
         elif n_int > 9:
-            msg = "Grimison (1937) Geometry: Greater than 9 columns. Assuming C2=1.0"
-            logger.info(msg)
+            self._note("Grimison (1937) Geometry: Greater than 9 columns. Assuming C2=1.0")
             return 1.0
         else:
             return self._ROW_CORRECTIONS[n_int]
@@ -146,41 +155,140 @@ class GrimisonModel(HeatTransferModel):
         target_a = S_T / D
         target_b = S_L / D
         best_key = min(self._COEFFICIENTS.keys(), 
-                       key=lambda k: math.sqrt((k[0]-target_a)**2 + (k[1]-target_b)**2))
+                       key=lambda k: dual.sqrt((k[0]-target_a)**2 + (k[1]-target_b)**2))
         return self._COEFFICIENTS[best_key]
 
+    @classmethod
+    def _coefficient_grid(cls):
+        """
+        _COEFFICIENTS compiled once into a regular grid over the tabulated a and b values.
+        The table is sparse, so each missing cell is filled by linear interpolation along a
+        within its b row (clamped to the row's end values outside its tabulated a range).
+        Returns (a_axis, b_axis, C1_grid, m_grid) with grids indexed [i_a, i_b].
+        """
+        grid = cls.__dict__.get('_GRID')
+        if grid is None:
+            a_axis = np.array(sorted({k[0] for k in cls._COEFFICIENTS}))
+            b_axis = np.array(sorted({k[1] for k in cls._COEFFICIENTS}))
+            C1_grid = np.empty((len(a_axis), len(b_axis)))
+            m_grid = np.empty((len(a_axis), len(b_axis)))
+            for j, b in enumerate(b_axis):
+                row = sorted((a, C, m) for (a, bb), (C, m) in cls._COEFFICIENTS.items() if bb == b)
+                a_row = [r[0] for r in row]
+                C1_grid[:, j] = np.interp(a_axis, a_row, [r[1] for r in row])
+                m_grid[:, j] = np.interp(a_axis, a_row, [r[2] for r in row])
+            grid = (a_axis, b_axis, C1_grid, m_grid)
+            cls._GRID = grid
+            cls._GRID_LISTS = (a_axis.tolist(), b_axis.tolist(), C1_grid.tolist(), m_grid.tolist())
+        return grid
+
+    def _get_coeffs_bilinear(self, S_T, S_L, D):
+        """ Bilinear interpolation of (C1, m) on the compiled grid; a and b clamped to the table. """
+        a_axis, b_axis, C1_grid, m_grid = self._coefficient_grid()
+        a, b = S_T / D, S_L / D
+        if np.ndim(a) == 0 and np.ndim(b) == 0:
+            # Scalar path: plain floats, no array overhead
+            a_axis, b_axis, C1_grid, m_grid = self._GRID_LISTS
+            a = min(max(a, a_axis[0]), a_axis[-1])
+            b = min(max(b, b_axis[0]), b_axis[-1])
+            i = min(max(bisect.bisect_right(a_axis, a) - 1, 0), len(a_axis) - 2)
+            j = min(max(bisect.bisect_right(b_axis, b) - 1, 0), len(b_axis) - 2)
+        else:
+            a = np.clip(np.asarray(a, dtype=float), a_axis[0], a_axis[-1])
+            b = np.clip(np.asarray(b, dtype=float), b_axis[0], b_axis[-1])
+            i = np.clip(np.searchsorted(a_axis, a, side='right') - 1, 0, len(a_axis) - 2)
+            j = np.clip(np.searchsorted(b_axis, b, side='right') - 1, 0, len(b_axis) - 2)
+        ta = (a - a_axis[i]) / (a_axis[i + 1] - a_axis[i])
+        tb = (b - b_axis[j]) / (b_axis[j + 1] - b_axis[j])
+
+        def lerp2(G):
+            if isinstance(G, list):
+                return ((1 - ta) * (1 - tb) * G[i][j] + ta * (1 - tb) * G[i + 1][j]
+                        + (1 - ta) * tb * G[i][j + 1] + ta * tb * G[i + 1][j + 1])
+            return ((1 - ta) * (1 - tb) * G[i, j] + ta * (1 - tb) * G[i + 1, j]
+                    + (1 - ta) * tb * G[i, j + 1] + ta * tb * G[i + 1, j + 1])
+
+        return lerp2(C1_grid), lerp2(m_grid)
+
     # ---------- CALCULATION METHODS ------------------------------------------------------------------------
     def calculate_Re_max(self, rho, m_dot, A_front, S_T, S_L, D, mu):
-        S_D = math.sqrt(S_L**2 + (S_T / 2.0)**2)
+        S_D = dual.sqrt(S_L**2 + (S_T / 2.0)**2)
         if S_D < (S_T + D) / 2.0:
             u_front = m_dot / (rho * A_front)
             u_max = u_front * (S_T / (2.0 * (S_D - D)))
         else:
             u_front = m_dot / (rho * A_front)
             u_max = u_front * (S_T / (S_T - D))
+        if np.ndim(mu):     # arrays of states through one geometry
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(mu > 0, (rho * u_max * D) / mu, 0.0)
         return (rho * u_max * D) / mu if mu > 0 else 0.0
 
-    def calculate_Nu(self, Re, Pr, **kwargs):
+    def _unpack_geometry(self, kwargs, N_rows_default=20):
         try:
             S_T, S_L, D = kwargs['S_T'], kwargs['S_L'], kwargs['D']
-            N_rows = kwargs.get('N_rows', 20)
+            N_rows = kwargs.get('N_rows', N_rows_default)
         except KeyError as e:
             raise ValueError(f"GrimisonModel requires parameter {e}")
+        return S_T, S_L, D, N_rows
 
-        # 1. Validate
-        self._check_geometry(S_T/D, S_L/D)
-        self._check_reynolds(Re)
-
-        # 2. Coefficients
+    def _geometry_factors(self, S_T, S_L, D, N_rows):
+        """ Returns (C1, m, C2) for the bank geometry. """
         if self.method == "hammock":
             C1, m = self._get_coeffs_hammock(S_T, S_L, D)
+        elif self.method == "bilinear":
+            C1, m = self._get_coeffs_bilinear(S_T, S_L, D)
         else:
             C1, m = self._get_coeffs_nearest(S_T, S_L, D)
-            
-        # 3. Correction
         C2 = self._get_c2_factor(N_rows)
+        return C1, m, C2
+
+    def validate_zone(self, Re_min, Re_max, **params):
+        """
+        Once-per-zone validation: geometry, and the Re bounds the zone can reach.
+        Raises if the whole range is invalid; a range that only partly leaves the
+        limits is counted as a note (rows are not checked individually).
+        """
+        if not self.strict_limits: return
+        S_T, S_L, D, _ = self._unpack_geometry(params)
+        self._check_geometry(S_T/D, S_L/D)
+        if Re_max < self.LIMITS['Re_min']:
+            self._check_reynolds(Re_max)
+        elif Re_min > self.LIMITS['Re_max']:
+            self._check_reynolds(Re_min)
+        elif Re_min < self.LIMITS['Re_min'] or Re_max > self.LIMITS['Re_max']:
+            self._note(f"Grimison (1937) predicted Re range [{Re_min:.0f}, {Re_max:.0f}] "
+                       f"extends outside [{self.LIMITS['Re_min']}, {self.LIMITS['Re_max']}]")
+
+    def calculate_Nu(self, Re, Pr, **kwargs):
+        S_T, S_L, D, N_rows = self._unpack_geometry(kwargs)
+
+        # 1. Validate (zones that validated once pass validate=False)
+        if kwargs.get('validate', self.validation == 'strict'):
+            self._check_geometry(S_T/D, S_L/D)
+            self._check_reynolds(Re)
+
+        # 2. Coefficients + Row Correction
+        C1, m, C2 = self._geometry_factors(S_T, S_L, D, N_rows)
         
         return C2 * C1 * (Re**m) * (Pr**(1.0/3.0))
+
+    def calculate_Nu_array(self, Re, Pr, **kwargs):
+        """ Array form of calculate_Nu: Re, Pr are arrays, geometry stays scalar. """
+        S_T, S_L, D, N_rows = self._unpack_geometry(kwargs)
+        Re, Pr = np.asarray(Re, dtype=float), np.asarray(Pr, dtype=float)
+
+        # 1. Validate (geometry once, Re over the whole array)
+        if kwargs.get('validate', self.validation == 'strict'):
+            self._check_geometry(S_T/D, S_L/D)
+            bad = (Re < self.LIMITS['Re_min']) | (Re > self.LIMITS['Re_max'])
+            if np.any(bad):
+                self._check_reynolds(float(Re[bad].flat[0]))    # raises with the scalar message
+
+        # 2. Coefficients + Row Correction
+        C1, m, C2 = self._geometry_factors(S_T, S_L, D, N_rows)
+
+        return C2 * C1 * (Re**m) * (Pr**(1.0/3.0))
     
     
     
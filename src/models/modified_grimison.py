@@ -1,5 +1,6 @@
-import math
 import logging
+import numpy as np
+from src import dual
 # Safe import for script/module usage
 try:
     from .grimison import GrimisonModel
@@ -15,6 +16,8 @@ class ModifiedGrimisonModel(GrimisonModel):
     Reference: Eq 16 & 17 in 'Cross-Flow Staggered-Tube Heat Exchanger Analysis'
     Nu = 1.13 * Xi_H * C1 * C2 * Re^m * Pr^(1/3)
     """
+    # Uses the Grimison coefficients without enforcing LIMITS
+    strict_limits = False
 
     def _calculate_xi_hammock(self, Re, Pr, N_L=1):
         """
@@ -27,7 +30,7 @@ class ModifiedGrimisonModel(GrimisonModel):
         if Re <= 0: return 1.0
         
         # Term 1: Sqrt(N_L)
-        term_rows = math.sqrt(N_L)
+        term_rows = dual.sqrt(N_L)
         
         # Term 2: Re / 2000
         term_re = Re / 2000.0
@@ -40,7 +43,7 @@ class ModifiedGrimisonModel(GrimisonModel):
         arg = term_rows * term_re * term_pr
         
         # Xi_H = [ tanh( arg ) ] ^ (1/3)
-        xi = math.tanh(arg)**(1.0/3.0)
+        xi = dual.tanh(arg)**(1.0/3.0)
         
         return xi
 
@@ -72,4 +75,20 @@ class ModifiedGrimisonModel(GrimisonModel):
         # Nu = 1.13 * Xi_H * C1 * C2 * Re^m * Pr^(1/3)
         Nu = 1.13 * xi_h * C1 * C2 * (Re**m) * (Pr**(1.0/3.0))
         
-        return Nu
\ No newline at end of file
+        return Nu
+
+    def calculate_Nu_array(self, Re, Pr, **kwargs):
+        """ Array form of calculate_Nu: Re, Pr are arrays, geometry stays scalar. """
+        S_T, S_L, D = kwargs['S_T'], kwargs['S_L'], kwargs['D']
+        N_rows = kwargs.get('N_rows', 1)
+        Re, Pr = np.asarray(Re, dtype=float), np.asarray(Pr, dtype=float)
+
+        C1, m = self._get_coeffs_hammock(S_T, S_L, D)
+        C2 = self._get_c2_factor(N_rows)
+
+        # Xi_H (Eq 17) with N_L = 1; Re <= 0 gives Xi_H = 1 as in the scalar path
+        arg = (Re / 2000.0) * ((Pr / 0.71)**(1.0/3.0))
+        with np.errstate(invalid='ignore'):
+            xi_h = np.where(Re <= 0, 1.0, np.tanh(arg)**(1.0/3.0))
+
+        return 1.13 * xi_h * C1 * C2 * (Re**m) * (Pr**(1.0/3.0))
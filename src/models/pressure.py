@@ -1,10 +1,55 @@
 import math
+import numpy as np
+
+from src import correlations as corr
+from src import dual
 
 class PressureDropModel:
-    """Abstract Base Class for Pressure Drop Correlations."""
+    """
+    Abstract Base Class for Pressure Drop Correlations.
+
+    Two entry points sharing one geometry description
+    (S_T, S_L, D, L_flow, A_front):
+      - calculate_dP(**kwargs): one state per call (rho, mu, mu_wall, m_dot + geometry)
+      - calculate_dP_array(rho, mu, m_dot, mu_wall=None, **geometry): NumPy arrays
+        of states through the same geometry, e.g. every member of an ensemble row.
+    Geometry-only factors are compiled once per geometry and cached.
+    """
+    GEOMETRY_KEYS = ('S_T', 'S_L', 'D', 'L_flow', 'A_front')
+    _CACHE_SIZE = 64
+
     def calculate_dP(self, **kwargs):
         raise NotImplementedError
 
+    def calculate_dP_array(self, rho, mu, m_dot, mu_wall=None, **geometry):
+        """ Default: loops calculate_dP. Models override with a vectorized version. """
+        rho, mu, m_dot = np.broadcast_arrays(np.asarray(rho, dtype=float), np.asarray(mu, dtype=float),
+                                             np.asarray(m_dot, dtype=float))
+        mu_w = mu if mu_wall is None else np.broadcast_to(np.asarray(mu_wall, dtype=float), rho.shape)
+        dP = np.empty(rho.shape)
+        for idx in np.ndindex(rho.shape):
+            dP[idx] = self.calculate_dP(rho=rho[idx].item(), mu=mu[idx].item(), mu_wall=mu_w[idx].item(),
+                                        m_dot=m_dot[idx].item(), **geometry)
+        return dP
+
+    def geometry_factors(self, **geometry):
+        """ Cached geometry-only factors (see _compile_geometry); seeded (Dual) geometry is not cached. """
+        try:
+            values = [geometry[k] for k in self.GEOMETRY_KEYS]
+        except KeyError as e:
+            raise ValueError(f"{type(self).__name__} missing parameter: {e}")
+        if dual.has_dual(*values): return self._compile_geometry(*values)
+        key = tuple(float(v) for v in values)
+        cache = self.__dict__.setdefault('_factor_cache', {})
+        factors = cache.get(key)
+        if factors is None:
+            if len(cache) >= self._CACHE_SIZE: cache.clear()
+            factors = cache[key] = self._compile_geometry(*key)
+        return factors
+
+    def _compile_geometry(self, S_T, S_L, D, L_flow, A_front):
+        return {}
+
 class GunterShawModel(PressureDropModel):
     """
     Gunter-Shaw (1945) Pressure Drop Model.
@@ -13,6 +58,9 @@ class GunterShawModel(PressureDropModel):
     
     Reference: Hammock Paper, Equations 35-38.
     """
+    # Exponent of the (mu_w/mu) property-variation term (Eq 36)
+    viscosity_exponent = 0.14
+
     def __init__(self, use_correction=True):
         # Boucher & Lapple correction factor of 1.75 
         self.correction = 1.75 if use_correction else 1.0
@@ -38,24 +86,13 @@ class GunterShawModel(PressureDropModel):
             # Default to bulk viscosity if wall not provided
             mu_w = kwargs.get('mu_wall', mu) 
             m_dot = kwargs['m_dot']
-            S_T = kwargs['S_T']
-            S_L = kwargs['S_L']
-            D = kwargs['D']
-            L_flow = kwargs['L_flow']
-            A_front = kwargs['A_front']
         except KeyError as e:
             raise ValueError(f"GunterShawModel missing parameter: {e}")
-
-        # 1. Volumetric Hydraulic Diameter (Dv) - Eq 38 [cite: 610]
-        # Dv = (4/pi) * (ST * SL / D) - D
-        D_v = (4.0 / math.pi) * (S_T * S_L / D) - D
+        g = self.geometry_factors(**kwargs)
+        D_v = g['D_v']
         
         # 2. Mass Flux (G) calculation
-        # Hammock implies G based on minimum flow area (standard for these correlations).
-        # Calculate sigma (flow restriction ratio)
-        sigma = (S_T - D) / S_T
-        A_min = A_front * sigma
-        G = m_dot / A_min
+        G = m_dot / g['A_min']
         
         # 3. Volumetric Reynolds Number (Re_v)
         # Note: Gunter-Shaw friction factor uses this Re, not the standard Re_D.
@@ -63,26 +100,126 @@ class GunterShawModel(PressureDropModel):
         Re_v = (G * D_v) / mu
         
         # 4. Friction Factor (f/2) - Eq 37 [cite: 605]
-        # Transition occurs at Re = 200 [cite: 604, 606]
-        if Re_v <= 200:
-            f_2 = 90.0 / Re_v
-        else:
-            f_2 = 0.96 * (Re_v**-0.145)
+        f_2 = self.friction_factor(Re_v)
             
         # 5. Calculate Pressure Drop (Eq 36) 
         # dP = (f/2) * (G^2 * L / (Dv * rho)) * (mu_w/mu)^0.14 * (Dv/ST)^0.4 * (SL/ST)^0.6
         # Note: Eq 36 has a (1/g) term which is 1.0 in SI units.
         
         # Term 1: Dynamic / Geometric
-        term_dyn = (G**2 * L_flow) / (D_v * rho)
+        term_dyn = (G**2 * g['L_flow']) / (D_v * rho)
         
         # Term 2: Viscosity Ratio (Property variation)
-        term_visc = (mu_w / mu)**0.14
-        
-        # Term 3: Geometry Ratios
-        term_geom = ((D_v / S_T)**0.4) * ((S_L / S_T)**0.6)
+        term_visc = (mu_w / mu)**self.viscosity_exponent
         
-        dP_raw = f_2 * term_dyn * term_visc * term_geom
+        dP_raw = f_2 * term_dyn * term_visc * g['term_geom']
         
         # 6. Apply Boucher-Lapple Correction 
-        return dP_raw * self.correction
\ No newline at end of file
+        return dP_raw * self.correction
+
+    def calculate_dP_array(self, rho, mu, m_dot, mu_wall=None, **geometry):
+        """ Vectorized calculate_dP over arrays of rho, mu, mu_wall, m_dot. """
+        g = self.geometry_factors(**geometry)
+        rho, mu, m_dot = np.asarray(rho, dtype=float), np.asarray(mu, dtype=float), np.asarray(m_dot, dtype=float)
+        mu_w = mu if mu_wall is None else np.asarray(mu_wall, dtype=float)
+        D_v = g['D_v']
+
+        G = m_dot / g['A_min']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Re_v = (G * D_v) / mu
+            f_2 = self.friction_factor(Re_v)
+            term_dyn = (G**2 * g['L_flow']) / (D_v * rho)
+            term_visc = (mu_w / mu)**self.viscosity_exponent
+            dP = f_2 * term_dyn * term_visc * g['term_geom'] * self.correction
+        return np.where(mu <= 0, 0.0, dP)
+
+    @staticmethod
+    def friction_factor(Re_v):
+        """
+        f/2 of Eq 37; transition at Re_v = 200 [cite: 604, 606].
+        Accepts scalars or arrays.
+        """
+        if np.ndim(Re_v):
+            with np.errstate(divide='ignore'):
+                return np.where(Re_v <= 200, 90.0 / Re_v, 0.96 * (Re_v**-0.145))
+        if Re_v <= 200:
+            return 90.0 / Re_v
+        return 0.96 * (Re_v**-0.145)
+
+    def _compile_geometry(self, S_T, S_L, D, L_flow, A_front):
+        # 1. Volumetric Hydraulic Diameter (Dv) - Eq 38 [cite: 610]
+        # Dv = (4/pi) * (ST * SL / D) - D
+        D_v = (4.0 / math.pi) * (S_T * S_L / D) - D
+
+        # Hammock implies G based on minimum flow area (standard for these correlations).
+        # Calculate sigma (flow restriction ratio)
+        sigma = (S_T - D) / S_T
+
+        # Term 3: Geometry Ratios
+        term_geom = ((D_v / S_T)**0.4) * ((S_L / S_T)**0.6)
+        return {'D_v': D_v, 'A_min': A_front * sigma, 'L_flow': L_flow, 'term_geom': term_geom}
+
+
+class HEDHEulerModel(PressureDropModel):
+    """
+    HEDH / Zukauskas Euler-number model for staggered banks.
+    dP = Eu * N_rows * (rho * u_max^2 / 2), with Eu = correlations.calc_Eu_HEDH(Re_max, S_T/D)
+    and N_rows = L_flow / S_L rows in the flow path.
+
+    u_max is taken at the minimum gap (transverse or diagonal), as in
+    GrimisonModel.calculate_Re_max.
+    """
+    def __init__(self, use_correction=True):
+        # Experimental correction 3.2326 * Re^-0.2084 of calc_Eu_HEDH
+        self.use_correction = use_correction
+
+    def calculate_dP(self, **kwargs):
+        """
+        Required kwargs:
+          - rho, mu, m_dot
+          - S_T, S_L, D, L_flow, A_front
+        mu_wall is accepted and ignored (no property-variation term).
+        """
+        try:
+            rho, mu, m_dot = kwargs['rho'], kwargs['mu'], kwargs['m_dot']
+        except KeyError as e:
+            raise ValueError(f"HEDHEulerModel missing parameter: {e}")
+        g = self.geometry_factors(**kwargs)
+        if mu <= 0: return 0.0
+
+        u_max = m_dot / (rho * g['A_min'])
+        Re_t = corr.calc_Re(rho, u_max, g['D'], mu)
+        Eu = corr.calc_Eu_HEDH(Re_t, g['R_p'], correction_factor=self.use_correction)
+        return corr.calc_dP_gas_column(Eu, rho, u_max, g['N_rows'])
+
+    def calculate_dP_array(self, rho, mu, m_dot, mu_wall=None, **geometry):
+        """ Vectorized calculate_dP over arrays of rho, mu, m_dot. """
+        g = self.geometry_factors(**geometry)
+        rho, mu, m_dot = np.asarray(rho, dtype=float), np.asarray(mu, dtype=float), np.asarray(m_dot, dtype=float)
+
+        u_max = m_dot / (rho * g['A_min'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Re_t = (rho * u_max * g['D']) / mu
+            Eu = self.euler_number(Re_t, g['R_p'])
+            dP = Eu * g['N_rows'] * (0.5 * rho * (u_max**2))
+        return np.where(mu <= 0, 0.0, dP)
+
+    def euler_number(self, Re_t, R_p):
+        """ Array form of correlations.calc_Eu_HEDH. """
+        Re = np.maximum(Re_t, 7.0)
+        pitch = 1.0 + 0.5 / (R_p - 1.0)
+        f = np.select([Re < 100, Re < 1000],
+                      [(3.72 / (Re**0.77)) * pitch, (1.18 / (Re**0.42)) * pitch],
+                      (0.32 / (Re**0.16)) * pitch)
+        Eu = f / 2.0
+        if self.use_correction:
+            Eu = Eu * (3.2326 * (Re ** -0.2084))
+        return Eu
+
+    def _compile_geometry(self, S_T, S_L, D, L_flow, A_front):
+        S_D = dual.sqrt(S_L**2 + (S_T / 2.0)**2)
+        if S_D < (S_T + D) / 2.0:
+            A_min = A_front * (2.0 * (S_D - D)) / S_T
+        else:
+            A_min = A_front * (S_T - D) / S_T
+        return {'A_min': A_min, 'D': D, 'R_p': S_T / D, 'N_rows': L_flow / S_L}
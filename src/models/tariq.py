@@ -1,4 +1,6 @@
 import math
+import numpy as np
+from src import dual
 # Import base class safely
 try:
     from .base import HeatTransferModel
@@ -16,7 +18,6 @@ class TariqModel(HeatTransferModel):
       
     Reference: Eq 10 in Tariq (2010?) Dissertation/Paper.
     """
-
     def calculate_Nu(self, Re, Pr, **kwargs):
         """
         Calculates Nu based on Tariq correlation with Knudsen correction.
@@ -53,19 +54,19 @@ class TariqModel(HeatTransferModel):
         m_molecule = M / N_A
         
         # Mean free path / Characteristic Length
-        gas_term = math.sqrt((math.pi * m_molecule) / (2.0 * k_B * T))
+        gas_term = dual.sqrt((math.pi * m_molecule) / (2.0 * k_B * T))
         Kn = (mu / (rho * D)) * gas_term
 
         # 4. Coefficients based on Porosity
         # c1 affects the Reynolds scaling strength
-        c1 = 3.12 - 0.16 * math.exp(3.0 * eps)
+        c1 = 3.12 - 0.16 * dual.exp(3.0 * eps)
         # c2 affects the Rarefaction penalty strength
-        c2 = 3.45 - 3.0 * math.exp(-3.45 * eps)
+        c2 = 3.45 - 3.0 * dual.exp(-3.45 * eps)
 
         # 5. Calculation
         # Protect against log(<=0)
         Re_safe = max(Re, 1.01)
-        ln_Re = math.log(Re_safe)
+        ln_Re = dual.log(Re_safe)
 
         # Tariq Eq 10 Breakdown:
         # Nu = [ (0.48 - 0.2*eps) * (ln Re)^c1 * Pr / (eps/(1-eps)) ] 
@@ -86,4 +87,31 @@ class TariqModel(HeatTransferModel):
     
     
     
-    
\ No newline at end of file
+    
+
+    def calculate_Nu_array(self, Re, Pr, **kwargs):
+        """ Array form of calculate_Nu: Re, Pr, T, rho, mu (and eps_por) may be arrays. """
+        required = ['eps_por', 'T', 'rho', 'mu', 'M_gas', 'D']
+        try:
+            eps, T, rho, mu, M, D = (kwargs[k] for k in required)
+        except KeyError as e:
+            raise ValueError(f"TariqModel requires parameter {e}")
+        Re, Pr = np.asarray(Re, dtype=float), np.asarray(Pr, dtype=float)
+
+        k_B = 1.380649e-23
+        N_A = 6.02214076e23
+
+        # Knudsen Number
+        m_molecule = M / N_A
+        gas_term = np.sqrt((math.pi * m_molecule) / (2.0 * k_B * np.asarray(T, dtype=float)))
+        Kn = (mu / (rho * D)) * gas_term
+
+        # Porosity coefficients
+        c1 = 3.12 - 0.16 * np.exp(3.0 * np.asarray(eps, dtype=float))
+        c2 = 3.45 - 3.0 * np.exp(-3.45 * np.asarray(eps, dtype=float))
+
+        # Eq 10
+        ln_Re = np.log(np.maximum(Re, 1.01))
+        numerator = (0.48 - 0.2 * eps) * ln_Re**c1 * Pr / (eps / (1.0 - eps))
+        denominator = 1.0 + 0.1 * (ln_Re**c2) * Kn
+        return numerator / denominator
@@ -1,5 +1,6 @@
 import math
 import logging
+import numpy as np
 try:
     from .base import HeatTransferModel
 except ImportError:
@@ -13,6 +14,13 @@ class ZhukauskasModel(HeatTransferModel):
     Reference: Eq 18 in 'Cross-Flow Staggered-Tube Heat Exchanger Analysis' 
     """
     
+    # Row Correction C2 (Tables 3 & 4), valid below / above Re = 1000
+    _C2_LOW_RE  = {1:0.83, 2:0.88, 3:0.91, 4:0.94, 5:0.95, 7:0.97, 10:0.98, 13:0.99, 16:1.0}
+    _C2_HIGH_RE = {1:0.64, 2:0.76, 3:0.84, 4:0.89, 5:0.92, 7:0.95, 10:0.97, 13:0.98, 16:0.99}
+
+    # Table 5 exponent n for Re < 2e5
+    _N_PR = 0.36
+    
     def _get_c1_m(self, Re, ST, SL):
         """
         Retrieves C1 and m from Table 5.
@@ -29,18 +37,20 @@ class ZhukauskasModel(HeatTransferModel):
             
         # 1000 < Re < 2e5
         elif Re < 2e5:
-            ratio = ST / SL
-            if ratio < 2.0:
-                # C1 = 0.35 * (ST/SL)^0.2
-                c1 = 0.35 * (ratio**0.2)
-                return c1, 0.60
-            else:
-                return 0.40, 0.60
+            return self._c1_mixed(ST, SL), 0.60
                 
         # 2e5 < Re < 2e6
         else:
             return 0.022, 0.84
 
+    def _c1_mixed(self, ST, SL):
+        """ C1 in the mixed regime (1000 < Re < 2e5). """
+        ratio = ST / SL
+        if ratio < 2.0:
+            # C1 = 0.35 * (ST/SL)^0.2
+            return 0.35 * (ratio**0.2)
+        return 0.40
+
     def _get_c2(self, N_rows, Re):
         """
         Calculates Row Correction Factor C2 (Eq 19)[cite: 443].
@@ -49,16 +59,9 @@ class ZhukauskasModel(HeatTransferModel):
         if N_rows >= 20: return 1.0
         
         # Eq 19 [cite: 443]
-        if Re > 1000:
-            # C2 = 1 - e^(-N_L^(1/2)) ?? The PDF text is fuzzy here.
-            # Usually Zhukauskas C2 is a simple lookup. 
-            # Let's use the Table 4 values directly for accuracy [cite: 440]
-            # (Valid for Re >= 1000)
-            table = {1:0.64, 2:0.76, 3:0.84, 4:0.89, 5:0.92, 7:0.95, 10:0.97, 13:0.98, 16:0.99}
-            
-        else:
-            # Table 3 (Re < 1000) [cite: 436]
-            table = {1:0.83, 2:0.88, 3:0.91, 4:0.94, 5:0.95, 7:0.97, 10:0.98, 13:0.99, 16:1.0}
+        # Usually Zhukauskas C2 is a simple lookup; Table 4 applies for Re > 1000 [cite: 440],
+        # Table 3 below [cite: 436].
+        table = self._C2_HIGH_RE if Re > 1000 else self._C2_LOW_RE
             
         # Discrete Lookup (Nearest)
         return table.get(int(N_rows), 1.0) # Default to 1.0 if not in sparse table
@@ -84,10 +87,34 @@ class ZhukauskasModel(HeatTransferModel):
         # Table 5 says n=0.36 for Re < 2e5 
         # Text says n=0.4 for heating, 0.3 for cooling? 
         # Actually Eq 18 just lists 'n' in Table 5.
-        n = 0.36
+        n = self._N_PR
         
         # 3. Calculate
         # Nu = C1 * C2 * Re^m * Pr^n * (Pr / Pr_s)^0.25
         Nu = C1 * C2 * (Re**m) * (Pr**n) * ((Pr / Pr_s)**0.25)
         
-        return Nu
\ No newline at end of file
+        return Nu
+
+    def calculate_Nu_array(self, Re, Pr, **kwargs):
+        """ Array form of calculate_Nu: regimes selected by mask over the Re array. """
+        try:
+            S_T, S_L = kwargs['S_T'], kwargs['S_L']
+            N_rows = kwargs.get('N_rows', 20)
+            Pr_s = kwargs.get('Pr_wall', Pr)
+        except KeyError as e:
+            raise ValueError(f"ZhukauskasModel requires {e}")
+        Re, Pr = np.asarray(Re, dtype=float), np.asarray(Pr, dtype=float)
+
+        # 1. Coefficients (Table 5 regimes)
+        regimes = [Re < 100, Re < 1000, Re < 2e5]
+        C1 = np.select(regimes, [0.90, 0.51, self._c1_mixed(S_T, S_L)], 0.022)
+        m = np.select(regimes, [0.40, 0.50, 0.60], 0.84)
+        if N_rows >= 20:
+            C2 = 1.0
+        else:
+            C2 = np.where(Re > 1000, self._C2_HIGH_RE.get(int(N_rows), 1.0),
+                                     self._C2_LOW_RE.get(int(N_rows), 1.0))
+
+        # 2. Calculate
+        n = self._N_PR
+        return C1 * C2 * (Re**m) * (Pr**n) * ((Pr / Pr_s)**0.25)
@@ -0,0 +1,249 @@
+import math
+import time
+import numpy as np
+
+from src.fluids import FluidState
+from src.inverse import VARIABLES
+from src.response import ResponseTable
+
+# Map inputs (names as in src.inverse.VARIABLES) and outputs
+MAP_VARIABLES = ('gas_flow', 'gas_T', 'gas_P', 'coolant_flow', 'coolant_T')
+# 'T_out' gas outlet T [K], 'Q_kW' duty [kW], 'dP_Pa' gas pressure drop [Pa], 'T_cool_out' coolant outlet T [K]
+OUTPUTS = ('T_out', 'Q_kW', 'dP_Pa', 'T_cool_out')
+
+# ==============================================================================
+# PERFORMANCE MAP
+# ==============================================================================
+class PerformanceMap:
+    """
+    Off-design performance of one built exchanger, tabulated on a grid of inlet
+    conditions and queried by multilinear interpolation (src.response.ResponseTable,
+    log-spaced axes).
+
+    variables: names of the gridded inlet variables (a subset of MAP_VARIABLES)
+    axes:      one strictly increasing node array per variable
+    values:    output name -> array of shape tuple(len(a) for a in axes);
+               NaN where the march failed
+    fixed:     inlet variables held constant, name -> value
+
+    Queries name every gridded variable; fixed variables may be omitted. Lookups
+    outside the axes, or in a cell with a failed node, return NaN.
+    """
+    def __init__(self, variables, axes, values, fixed=None, name=None):
+        self.variables = tuple(variables)
+        self.axes = [np.asarray(a, dtype=float) for a in axes]
+        self.values = {k: np.asarray(v, dtype=float) for k, v in values.items()}
+        self.fixed = dict(fixed or {})
+        self.name = name
+        self._tables = {}
+
+    @property
+    def shape(self):
+        return tuple(len(a) for a in self.axes)
+
+    @property
+    def failed(self):
+        """ Boolean grid of the failed operating points. """
+        return ~np.isfinite(self.values['T_out'])
+
+    def table(self, output):
+        """ The ResponseTable of one output (built on first use). """
+        if output not in self.values:
+            raise ValueError(f"Unknown output '{output}'. Must be one of {tuple(self.values)}.")
+        if output not in self._tables:
+            self._tables[output] = ResponseTable(self.axes, self.values[output])
+        return self._tables[output]
+
+    def query(self, output=None, **point):
+        """
+        Interpolated output(s) at an operating point, e.g.
+        query('T_out', gas_flow=0.011, coolant_flow=0.8).
+        Scalar coordinates give floats, arrays (broadcast together) give arrays.
+        Returns one output, or a dict of all outputs when output is None.
+        """
+        coords = self._coords(point)
+        scalar = all(np.ndim(c) == 0 for c in coords)
+        outputs = OUTPUTS if output is None else (output,)
+        result = {}
+        for name in outputs:
+            table = self.table(name)
+            if scalar:
+                v = table(*[float(c) for c in coords])
+                result[name] = math.nan if v is None else v
+            else:
+                result[name] = table.evaluate(*coords)
+        return result if output is None else result[output]
+
+    __call__ = query
+
+    def _coords(self, point):
+        unknown = set(point) - set(self.variables) - set(self.fixed)
+        if unknown:
+            raise ValueError(f"Unknown map variables {sorted(unknown)}. Map variables: {self.variables}.")
+        missing = [v for v in self.variables if v not in point]
+        if missing:
+            raise ValueError(f"Missing map variables {missing}.")
+        return [point[v] for v in self.variables]
+
+    # --- File I/O ---
+    def save(self, path):
+        """ Writes the map to a .npz file. """
+        np.savez_compressed(
+            path,
+            variables=np.array(self.variables),
+            fixed_names=np.array(list(self.fixed), dtype=str),
+            fixed_values=np.array(list(self.fixed.values()), dtype=float),
+            name=np.array(self.name or ''),
+            **{f"axis_{v}": a for v, a in zip(self.variables, self.axes)},
+            **{f"out_{k}": v for k, v in self.values.items()},
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            variables = [str(v) for v in data['variables']]
+            axes = [data[f"axis_{v}"] for v in variables]
+            values = {k[4:]: data[k] for k in data.files if k.startswith('out_')}
+            fixed = dict(zip([str(n) for n in data['fixed_names']], data['fixed_values'].tolist()))
+            name = str(data['name']) or None
+        return cls(variables, axes, values, fixed, name)
+
+
+# ==============================================================================
+# GENERATION
+# ==============================================================================
+def _inlet(state, values):
+    """ A copy of an inlet state with T / P / m_dot replaced from values. """
+    v = {'T': state.T, 'P': state.P, 'm_dot': state.m_dot, **values}
+    return FluidState(state.name, v['T'], v['P'], v['m_dot'], state.fluid_obj, x=state.x, w_vap=state.w_vap)
+
+def _save_solution(hx):
+    """ The solve outputs of the assembly (outlets, failures, profiles, zone results). """
+    zones = [(z, z.results, z.history, getattr(z, 'validation_notes', None)) for z in hx.zones]
+    return (hx.hot_out, hx.cold_out, list(hx.failures), hx.hot_stream.profile, hx.cold_stream.profile, zones)
+
+def _restore_solution(hx, saved):
+    hx.hot_out, hx.cold_out, failures, hx.hot_stream.profile, hx.cold_stream.profile, zones = saved
+    hx.failures = failures
+    for z, results, history, notes in zones:
+        z.results, z.history = results, history
+        if notes is not None: z.validation_notes = notes
+
+def _solve_batch(hx, points):
+    """
+    Solves a batch of operating points ({variable: value} each) on one compiled
+    assembly. Returns an array (len(points), len(OUTPUTS)), NaN for failed marches
+    and for points outside the property range. The inlets and the solve outputs
+    of the assembly are restored afterwards.
+    """
+    compiled = hx.compile()
+    hot0, cold0 = hx.hot_stream.inlet, hx.cold_stream.inlet
+    saved = _save_solution(hx)
+    out = np.full((len(points), len(OUTPUTS)), np.nan)
+    try:
+        for k, point in enumerate(points):
+            sides = {'hot': {}, 'cold': {}}
+            for var, value in point.items():
+                side, attr = VARIABLES[var]
+                sides[side][attr] = value
+            hx.hot_stream.inlet, hx.cold_stream.inlet = _inlet(hot0, sides['hot']), _inlet(cold0, sides['cold'])
+            try:
+                hot_out, cold_out = compiled.solve(retention='summary', quiet=True)
+            except (ValueError, RuntimeError, ArithmeticError):
+                continue                # state outside the property / correlation range
+            if hx.failures: continue
+            Q_kW = sum(z.results.get('Q_total_kW', 0.0) for z in hx.zones)
+            out[k] = (hot_out.T, Q_kW, hx.hot_stream.inlet.P - hot_out.P, cold_out.T)
+    finally:
+        hx.hot_stream.inlet, hx.cold_stream.inlet = hot0, cold0
+        _restore_solution(hx, saved)
+    return out
+
+
+def evaluate_operating_points(hx, points, batch_size=32, processes=None):
+    """
+    Solves the assembly at a sample of operating points.
+
+    points:     {variable: 1-D array}, all of one length (variables from
+                MAP_VARIABLES; missing ones keep the stream inlet value)
+    batch_size: points per batch; a batch is one compile plus one compiled
+                solve per point
+    processes:  worker processes for the batches (None or 1: in this process).
+                Each worker gets a pickled copy of the assembly.
+
+    Returns {output: array} for OUTPUTS, NaN where the march failed. The stream
+    inlets and the last solve of the assembly (hx.hot_out, hx.failures, zone
+    results, profiles) are left as they were.
+    """
+    unknown = set(points) - set(MAP_VARIABLES)
+    if unknown:
+        raise ValueError(f"Unknown map variables {sorted(unknown)}. Must be among {MAP_VARIABLES}.")
+    names = list(points)
+    columns = [np.asarray(points[v], dtype=float).ravel() for v in names]
+    n = len(columns[0]) if columns else 0
+    if any(len(c) != n for c in columns):
+        raise ValueError("All point arrays must have the same length.")
+    rows = [dict(zip(names, map(float, vals))) for vals in zip(*columns)]
+    batches = [rows[i:i + batch_size] for i in range(0, n, batch_size)]
+
+    if processes and processes > 1 and len(batches) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            parts = list(pool.map(_solve_batch, [hx] * len(batches), batches))
+    else:
+        parts = [_solve_batch(hx, b) for b in batches]
+
+    table = np.concatenate(parts) if parts else np.empty((0, len(OUTPUTS)))
+    return {name: table[:, j] for j, name in enumerate(OUTPUTS)}
+
+
+def build_performance_map(hx, axes, batch_size=32, processes=None, quiet=True):
+    """
+    Tabulates the off-design performance of a built exchanger (fixed geometry)
+    over a grid of inlet conditions.
+
+    axes: {variable: node values} for variables in MAP_VARIABLES ('gas_flow',
+          'gas_T', 'gas_P', 'coolant_flow', 'coolant_T'). Nodes must be > 0; the
+          lookup interpolates on log axes, so log-spaced nodes suit flow and
+          pressure. A variable with one node is held fixed; variables not
+          given keep the stream inlet value.
+
+    Every grid point is solved with evaluate_operating_points (batched compiled
+    solves, optionally over worker processes). Returns a PerformanceMap.
+    Silent unless quiet=False.
+    """
+    t_start = time.perf_counter()
+    unknown = set(axes) - set(MAP_VARIABLES)
+    if unknown:
+        raise ValueError(f"Unknown map variables {sorted(unknown)}. Must be among {MAP_VARIABLES}.")
+    fixed, variables, nodes = {}, [], []
+    for var in MAP_VARIABLES:
+        if var not in axes: continue
+        a = np.unique(np.asarray(axes[var], dtype=float))
+        if a.size == 0 or a[0] <= 0:
+            raise ValueError(f"Axis '{var}' needs positive node values.")
+        if a.size == 1:
+            fixed[var] = float(a[0])
+        else:
+            variables.append(var)
+            nodes.append(a)
+    for var in MAP_VARIABLES:
+        if var not in axes:
+            side, attr = VARIABLES[var]
+            fixed[var] = getattr((hx.hot_stream if side == 'hot' else hx.cold_stream).inlet, attr)
+    if not variables:
+        raise ValueError("At least one map variable needs two or more nodes.")
+
+    grid = [g.ravel() for g in np.meshgrid(*nodes, indexing='ij')]
+    points = dict(zip(variables, grid))
+    points.update({var: np.full(grid[0].size, v) for var, v in fixed.items()})
+    shape = tuple(len(a) for a in nodes)
+    if not quiet:
+        print(f"--- Performance map {hx.name}: {grid[0].size} points over {variables} ---")
+    outputs = evaluate_operating_points(hx, points, batch_size, processes)
+    pmap = PerformanceMap(variables, nodes, {k: v.reshape(shape) for k, v in outputs.items()}, fixed, hx.name)
+    if not quiet:
+        print(f"--- Complete: {int(pmap.failed.sum())} failed points, "
+              f"{time.perf_counter() - t_start:.2f} s ---")
+    return pmap
@@ -0,0 +1,206 @@
+import json
+import time
+import numpy as np
+
+# ==============================================================================
+# SOLVE PROFILER
+# ==============================================================================
+class SolveProfiler:
+    """
+    Opt-in instrumentation of one HeatExchanger solve (HeatExchanger.solve(profile=True)).
+
+    While active, the profiler wraps the instance methods it times: the property
+    engines (gas / gas_wall / coolant flashes, saturation-table lookups), the
+    heat-transfer and pressure models, and the zone step and surface physics.
+    The wrappers are instance attributes, removed on exit, so an unprofiled
+    solve runs the plain methods and pays nothing. Zone wall times come from
+    the solve events (src.events).
+
+    report() returns:
+      'wall_s'      solve wall time
+      'zones'       per zone: wall_s, rows, row_s (total / mean / max of the steps),
+                    surface_s
+      'calls'       per timed call: calls, states (array entries; 1 per scalar call),
+                    time_s (inclusive: 'surface' contains the model calls)
+      'properties'  per engine and fluid/backend: flash calls and states, coolant
+                    reuse hit rate, saturation-table hit rate (finite lookups)
+      'rows'        [(zone, row, seconds)] per step (rows=True)
+
+    to_json() writes the report, to_speedscope() an evented speedscope trace of
+    the nested calls (https://www.speedscope.app).
+    """
+    _ENGINE_METHODS = ('gas', 'gas_wall', 'coolant', 'saturation_temperature', 'saturation_pressure', 'latent_heat')
+    _TABLE_METHODS = ('saturation_temperature', 'saturation_pressure', 'latent_heat')
+    _MODEL_METHODS = ('calculate_Nu', 'calculate_Nu_array', 'calculate_Re_max')
+    _PRESSURE_METHODS = ('calculate_dP', 'calculate_dP_array')
+
+    def __init__(self, hx, rows=True):
+        self.hx = hx
+        self.rows = rows
+        self.frames, self._frame_ids = [], {}
+        self.trace = []             # speedscope events: (type 'O' / 'C', frame, t)
+        self.calls = {}             # label -> [calls, states, time_s]
+        self.flashes = {}           # (engine, method, fluid, backend) -> [calls, states]
+        self.table = {}             # (engine, method, fluid) -> [lookups, hits]
+        self.zone_times, self.row_times = {}, []
+        self._patches = []
+        self._engine_stats0 = {}
+        self.t0 = self.t1 = None
+
+    # --- Activation ---
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        patched = set()
+        for zone in self.hx.zones:
+            self._patch(zone, '_step', f"{zone.name}: row", row_zone=zone.name)
+            self._patch(zone, 'surface', f"{zone.name}: surface")
+            engine = zone.property_engine
+            if id(engine) not in patched:
+                patched.add(id(engine))
+                self._engine_stats0[id(engine)] = dict(engine.stats)
+                for name in self._ENGINE_METHODS:
+                    self._patch(engine, name, f"PropertyEngine.{name}", engine=engine)
+            for obj, names in ((zone.model, self._MODEL_METHODS),
+                               (getattr(zone, 'pressure_model', None), self._PRESSURE_METHODS)):
+                if obj is None or id(obj) in patched: continue
+                patched.add(id(obj))
+                for name in names:
+                    if hasattr(obj, name): self._patch(obj, name, f"{type(obj).__name__}.{name}")
+        self.hx.events.subscribe(self._listen)
+        return self
+
+    def __exit__(self, *exc):
+        self.hx.events.unsubscribe(self._listen)
+        for obj, name, saved in reversed(self._patches):
+            if saved is None: delattr(obj, name)
+            else: setattr(obj, name, saved)
+        self._patches = []
+        self.t1 = time.perf_counter()
+        return False
+
+    def _frame(self, name):
+        fid = self._frame_ids.get(name)
+        if fid is None:
+            fid = self._frame_ids[name] = len(self.frames)
+            self.frames.append(name)
+        return fid
+
+    def _patch(self, obj, name, label, engine=None, row_zone=None):
+        method = getattr(obj, name)
+        self._patches.append((obj, name, obj.__dict__.get(name)))
+        trace, calls, clock, t0 = self.trace, self.calls, time.perf_counter, self.t0
+        table = name in self._TABLE_METHODS
+
+        def timed(*args, **kwargs):
+            key = label
+            if engine is not None:
+                fluid = args[0] if args else kwargs.get('fluid')
+                fluid = getattr(fluid, 'value', fluid)      # Fluid enum -> CoolProp name
+                backend = 'table' if table else ('GuptaAir' if fluid == 'GuptaAir' else 'CoolProp')
+                key = f"{label} [{fluid}/{backend}]"
+            fid = self._frame(key)
+            t = clock()
+            trace.append(('O', fid, t - t0))
+            try:
+                out = method(*args, **kwargs)
+            finally:
+                t_end = clock()
+                trace.append(('C', fid, t_end - t0))
+                n = int(np.size(args[1])) if engine is not None and len(args) > 1 else 1
+                c = calls.setdefault(key, [0, 0, 0.0])
+                c[0] += 1; c[1] += n; c[2] += t_end - t
+                if row_zone is not None and self.rows: self.row_times.append((row_zone, args[2], t_end - t))
+            if engine is not None: self._count_property(engine, name, fluid, backend, n, out, table)
+            return out
+
+        setattr(obj, name, timed)
+
+    def _count_property(self, engine, name, fluid, backend, n, out, table):
+        if table:
+            hits = int(np.count_nonzero(np.isfinite(np.asarray(out, dtype=float)))) if out is not None else 0
+            t = self.table.setdefault((id(engine), name, fluid), [0, 0])
+            t[0] += n; t[1] += hits
+        else:
+            f = self.flashes.setdefault((id(engine), name, fluid, backend), [0, 0])
+            f[0] += 1; f[1] += n
+
+    def _listen(self, event):
+        t = time.perf_counter()
+        if event.kind in ('solve_start', 'solve_end'):
+            fid = self._frame(f"solve: {event.solver}")
+            self.trace.append(('O' if event.kind == 'solve_start' else 'C', fid, t - self.t0))
+        elif event.kind == 'zone_start':
+            self.trace.append(('O', self._frame(f"zone: {event.zone}"), t - self.t0))
+        elif event.kind == 'zone_end':
+            self.trace.append(('C', self._frame(f"zone: {event.zone}"), t - self.t0))
+            self.zone_times[event.zone] = self.zone_times.get(event.zone, 0.0) + event.data['elapsed_s']
+
+    # --- Reports ---
+    def report(self):
+        zones = []
+        for zone in self.hx.zones:
+            steps = [dt for z, _, dt in self.row_times if z == zone.name]
+            step_c = self.calls.get(f"{zone.name}: row", [0, 0, 0.0])
+            zones.append({
+                'zone': zone.name, 'wall_s': self.zone_times.get(zone.name, 0.0), 'rows': step_c[0],
+                'row_s': {'total': step_c[2], 'mean': step_c[2] / step_c[0] if step_c[0] else 0.0,
+                          'max': max(steps) if steps else None},
+                'surface_s': self.calls.get(f"{zone.name}: surface", [0, 0, 0.0])[2],
+            })
+
+        properties, seen = [], set()
+        for zone in self.hx.zones:
+            engine = zone.property_engine
+            if id(engine) in seen: continue
+            seen.add(id(engine))
+            s0 = self._engine_stats0.get(id(engine), {})
+            evals = engine.stats['coolant_evals'] - s0.get('coolant_evals', 0)
+            reuses = engine.stats['coolant_reuses'] - s0.get('coolant_reuses', 0)
+            properties.append({
+                'zones': [z.name for z in self.hx.zones if z.property_engine is engine],
+                'flashes': [{'method': m, 'fluid': f, 'backend': b, 'calls': c, 'states': n}
+                            for (e, m, f, b), (c, n) in self.flashes.items() if e == id(engine)],
+                'coolant_evals': evals, 'coolant_reuses': reuses,
+                'coolant_hit_rate': reuses / (evals + reuses) if evals + reuses else None,
+                'saturation_table': [{'method': m, 'fluid': f, 'lookups': n, 'hit_rate': h / n if n else None}
+                                     for (e, m, f), (n, h) in self.table.items() if e == id(engine)],
+            })
+
+        report = {
+            'solver': self.hx.name,
+            'wall_s': (self.t1 or time.perf_counter()) - self.t0,
+            'zones': zones,
+            'calls': {k: {'calls': c, 'states': n, 'time_s': t}
+                      for k, (c, n, t) in sorted(self.calls.items(), key=lambda kv: -kv[1][2])},
+            'properties': properties,
+        }
+        if self.rows: report['rows'] = [[z, int(i), dt] for z, i, dt in self.row_times]
+        return report
+
+    def to_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2, default=_jsonable)
+        return path
+
+    def to_speedscope(self, path):
+        end = (self.t1 or time.perf_counter()) - self.t0
+        doc = {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': [{'name': name} for name in self.frames]},
+            'profiles': [{
+                'type': 'evented', 'name': self.hx.name, 'unit': 'seconds',
+                'startValue': 0.0, 'endValue': end,
+                'events': [{'type': kind, 'frame': fid, 'at': at} for kind, fid, at in self.trace],
+            }],
+            'name': f"{self.hx.name} solve",
+            'exporter': 'src.profiling',
+        }
+        with open(path, 'w') as f:
+            json.dump(doc, f)
+        return path
+
+
+def _jsonable(v):
+    if isinstance(v, np.generic): return v.item()
+    if isinstance(v, np.ndarray): return v.tolist()
+    return str(v)
@@ -0,0 +1,285 @@
+import bisect
+import numpy as np
+import CoolProp
+import CoolProp.CoolProp as cp
+from src import dual
+from src.gupta import GuptaAir
+
+class PropertyEngine:
+    """
+    Single entry point for the per-row property flashes used by the zones.
+
+    Every method accepts scalars or equal-length NumPy arrays. With arrays, each
+    CoolProp state is flashed ONCE on a cached low-level AbstractState and all
+    properties are read from that flash (values identical to PropsSI), which is
+    what the ensemble march relies on. Failed array elements come back as NaN;
+    scalar failures raise ValueError as before.
+
+    Coolant reuse policy (scalar path only):
+      coolant_dT_tol [K], coolant_dP_tol [Pa] -- when set, the last evaluated
+      coolant properties are reused until Tc or Pc drifts beyond the tolerance
+      from the state they were evaluated at. None disables reuse (default).
+      Counts are kept in self.stats ('coolant_evals', 'coolant_reuses').
+
+    Saturation temperature, saturation pressure and latent heat come from a
+    per-fluid saturation table built once per process (see saturation_temperature),
+    not from a saturation flash per row.
+
+    Scalar CoolProp states may carry src.dual Duals (sensitivity march): density
+    and cp get the analytic state derivatives, viscosity, conductivity and Prandtl
+    (no analytic derivatives in CoolProp) central differences of the flash.
+    """
+    # Column order in GuptaAir._DATA
+    _GUPTA_COLS = {'D': 1, 'C': 2, 'V': 3, 'L': 4, 'Prandtl': 5}
+    # Saturation tables per fluid (T_sat, p_sat, h_fg nodes), or None without a saturation curve
+    SAT_NODES = 257
+    _SAT_TABLES = {}
+    # Low-level CoolProp states for the array path, per fluid string (None: PropsSI fallback)
+    _STATES = {}
+    _STATE_OUTPUTS = {'D': 'rhomass', 'V': 'viscosity', 'C': 'cpmass', 'L': 'conductivity', 'Prandtl': 'Prandtl'}
+    # Analytic (T, P) derivatives of the Dual path; the other keys are differenced
+    _STATE_PARAMS = {'D': CoolProp.iDmass, 'C': CoolProp.iCpmass}
+    # Relative step of the central differences on the Dual path
+    DUAL_REL_STEP = 1e-6
+
+    def __init__(self, coolant_dT_tol=None, coolant_dP_tol=None):
+        self.coolant_dT_tol = coolant_dT_tol
+        self.coolant_dP_tol = coolant_dP_tol
+        self._coolant_ref = None    # (fluid, Tc, Pc, props) of the last fresh evaluation
+        self.stats = {'coolant_evals': 0, 'coolant_reuses': 0}
+
+    @property
+    def reuses_coolant(self):
+        return self.coolant_dT_tol is not None or self.coolant_dP_tol is not None
+
+    def reset_stats(self):
+        self.stats = {'coolant_evals': 0, 'coolant_reuses': 0}
+
+    def gas(self, fluid, Tg, Pg, Tc):
+        """ Returns (rho, mu, cp, k, Pr, M, mu_wall) at (Tg, Pg); mu_wall at (Tc, Pg). """
+        if fluid == "GuptaAir":
+            if np.ndim(Tg):
+                return self._gupta_array(Tg, Tc)
+            return (GuptaAir.PropsSI('D', 'T', Tg, 'P', Pg, fluid),
+                    GuptaAir.PropsSI('V', 'T', Tg, 'P', Pg, fluid),
+                    GuptaAir.PropsSI('C', 'T', Tg, 'P', Pg, fluid),
+                    GuptaAir.PropsSI('L', 'T', Tg, 'P', Pg, fluid),
+                    GuptaAir.PropsSI('Prandtl', 'T', Tg, 'P', Pg, fluid),
+                    GuptaAir.PropsSI('M', 'T', Tg, 'P', Pg, fluid),
+                    GuptaAir.PropsSI('V', 'T', Tc, 'P', Pg, fluid))
+        if np.ndim(Tg):
+            return self._flash_array(fluid, Tg, Pg, ('D', 'V', 'C', 'L', 'Prandtl')) \
+                + (cp.PropsSI('M', fluid),) + self._flash_array(fluid, Tc, Pg, ('V',))
+        if dual.has_dual(Tg, Pg, Tc):
+            return self._flash_dual(fluid, Tg, Pg, ('D', 'V', 'C', 'L', 'Prandtl')) \
+                + (cp.PropsSI('M', fluid),) + self._flash_dual(fluid, Tc, Pg, ('V',))
+        return (cp.PropsSI('D', 'T', Tg, 'P', Pg, fluid),
+                cp.PropsSI('V', 'T', Tg, 'P', Pg, fluid),
+                cp.PropsSI('C', 'T', Tg, 'P', Pg, fluid),
+                cp.PropsSI('L', 'T', Tg, 'P', Pg, fluid),
+                cp.PropsSI('Prandtl', 'T', Tg, 'P', Pg, fluid),
+                cp.PropsSI('M', fluid),
+                cp.PropsSI('V', 'T', Tc, 'P', Pg, fluid))
+
+    def gas_wall(self, fluid, T_wall, Pg):
+        """ Returns (mu, Pr) of the gas at the wall, (T_wall, Pg). """
+        if fluid == "GuptaAir":
+            if np.ndim(T_wall):
+                g = self._gupta_array(T_wall, T_wall)
+                return g[1], g[4]
+            return (GuptaAir.PropsSI('V', 'T', T_wall, 'P', Pg, fluid),
+                    GuptaAir.PropsSI('Prandtl', 'T', T_wall, 'P', Pg, fluid))
+        if np.ndim(T_wall):
+            return self._flash_array(fluid, T_wall, Pg, ('V', 'Prandtl'))
+        if dual.has_dual(T_wall, Pg):
+            return self._flash_dual(fluid, T_wall, Pg, ('V', 'Prandtl'))
+        return (cp.PropsSI('V', 'T', T_wall, 'P', Pg, fluid),
+                cp.PropsSI('Prandtl', 'T', T_wall, 'P', Pg, fluid))
+
+    def coolant(self, fluid, Tc, Pc):
+        """ Returns (rho, mu, cp, k, Pr) at (Tc, Pc). """
+        if self.reuses_coolant and not np.ndim(Tc):
+            ref = self._coolant_ref
+            if (ref is not None and ref[0] == fluid
+                    and abs(Tc - ref[1]) <= (self.coolant_dT_tol or 0.0)
+                    and abs(Pc - ref[2]) <= (self.coolant_dP_tol or 0.0)):
+                self.stats['coolant_reuses'] += 1
+                return ref[3]
+            props = self._coolant_flash(fluid, Tc, Pc)
+            self._coolant_ref = (fluid, Tc, Pc, props)
+            self.stats['coolant_evals'] += 1
+            return props
+        self.stats['coolant_evals'] += 1
+        if np.ndim(Tc):
+            return self._flash_array(fluid, Tc, Pc, ('D', 'V', 'C', 'L', 'Prandtl'))
+        return self._coolant_flash(fluid, Tc, Pc)
+
+    def _coolant_flash(self, fluid, Tc, Pc):
+        if dual.has_dual(Tc, Pc):
+            return self._flash_dual(fluid, Tc, Pc, ('D', 'V', 'C', 'L', 'Prandtl'))
+        return (cp.PropsSI('D', 'T', Tc, 'P', Pc, fluid),
+                cp.PropsSI('V', 'T', Tc, 'P', Pc, fluid),
+                cp.PropsSI('C', 'T', Tc, 'P', Pc, fluid),
+                cp.PropsSI('L', 'T', Tc, 'P', Pc, fluid),
+                cp.PropsSI('Prandtl', 'T', Tc, 'P', Pc, fluid))
+
+    @classmethod
+    def _state(cls, fluid):
+        """ Cached AbstractState of a (default or HEOS backend) fluid string, else None. """
+        if fluid not in cls._STATES:
+            state = None
+            try:
+                backend, names = cp.extract_backend(fluid)
+                if backend in ('?', 'HEOS'):
+                    names, fractions = cp.extract_fractions(names)
+                    state = cp.AbstractState('HEOS', '&'.join(names))
+                    if fractions: state.set_mole_fractions(fractions)
+            except ValueError:
+                state = None
+            cls._STATES[fluid] = state
+        return cls._STATES[fluid]
+
+    def _flash_array(self, fluid, T, P, keys):
+        """
+        Properties keys ('D', 'V', 'C', 'L', 'Prandtl') at every (T, P) of the arrays:
+        one PT flash per state, NaN where it fails. Returns one array per key.
+        """
+        T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float))
+        state = self._state(fluid)
+        if state is None:
+            return tuple(np.asarray(cp.PropsSI(k, 'T', T, 'P', P, fluid), dtype=float) for k in keys)
+        getters = [self._STATE_OUTPUTS[k] for k in keys]
+        out = np.full((len(keys),) + T.shape, np.nan)
+        for idx in np.ndindex(T.shape):
+            try:
+                state.update(CoolProp.PT_INPUTS, P[idx], T[idx])
+                out[(slice(None),) + idx] = [getattr(state, g)() for g in getters]
+            except ValueError:
+                pass
+        return tuple(out)
+
+    def _flash_dual(self, fluid, T, P, keys):
+        """
+        Properties keys at a scalar (T, P) where either may be a Dual. Values come
+        from one flash (as PropsSI); d/dT|P and d/dP|T are analytic for 'D' and 'C'
+        and central differences for the rest. Raises ValueError like PropsSI.
+        """
+        T0, P0 = dual.value(T), dual.value(P)
+        hT, hP = T0 * self.DUAL_REL_STEP, P0 * self.DUAL_REL_STEP
+        state = self._state(fluid)
+        if state is None:
+            def flash(t, p):
+                return [cp.PropsSI(k, 'T', t, 'P', p, fluid) for k in keys]
+            exact = {}
+        else:
+            getters = [self._STATE_OUTPUTS[k] for k in keys]
+            def flash(t, p):
+                state.update(CoolProp.PT_INPUTS, p, t)
+                return [getattr(state, g)() for g in getters]
+            flash(T0, P0)
+            exact = {k: (state.first_partial_deriv(self._STATE_PARAMS[k], CoolProp.iT, CoolProp.iP),
+                         state.first_partial_deriv(self._STATE_PARAMS[k], CoolProp.iP, CoolProp.iT))
+                     for k in keys if k in self._STATE_PARAMS}
+        values = flash(T0, P0)
+        if len(exact) < len(keys):
+            dT = [(a - b) / (2.0 * hT) for a, b in zip(flash(T0 + hT, P0), flash(T0 - hT, P0))]
+            dP = [(a - b) / (2.0 * hP) for a, b in zip(flash(T0, P0 + hP), flash(T0, P0 - hP))]
+        else:
+            dT = dP = [0.0] * len(keys)
+        return tuple(dual.chain(v, exact.get(k, (t, p)), (T, P))
+                     for k, v, t, p in zip(keys, values, dT, dP))
+
+    def saturation_temperature(self, fluid, P):
+        """
+        Saturation temperature [K] at P [Pa], interpolated in (ln P, 1/T_sat), where
+        Clausius-Clapeyron makes the curve nearly linear (water: within 1e-5 relative,
+        7 mK at worst near the critical point). Returns None (NaN per element for
+        arrays) outside the triple-to-critical range or for fluids without a
+        saturation curve.
+        """
+        table = self._saturation_table(fluid)
+        if table is None: return self._missing(P)
+        inv_T = self._interp(table['lnP'], table['inv_T'], self._log(P))
+        return None if inv_T is None else 1.0 / inv_T
+
+    def saturation_pressure(self, fluid, T):
+        """ Saturation pressure [Pa] at T [K], from the same table (inverse lookup). """
+        table = self._saturation_table(fluid)
+        if table is None: return self._missing(T)
+        lnP = self._interp(table['inv_T_asc'], table['lnP_by_T'], self._inverse(T))
+        return None if lnP is None else np.exp(lnP) if np.ndim(T) else dual.exp(lnP)
+
+    def latent_heat(self, fluid, T):
+        """ Latent heat of vaporisation h_fg [J/kg] at T [K], tabulated against 1/T_sat. """
+        table = self._saturation_table(fluid)
+        if table is None: return self._missing(T)
+        return self._interp(table['inv_T_asc'], table['h_fg_by_T'], self._inverse(T))
+
+    @classmethod
+    def _saturation_table(cls, fluid):
+        if fluid not in cls._SAT_TABLES:
+            table = None
+            if fluid != "GuptaAir":
+                try:
+                    P_lo = cp.PropsSI('ptriple', fluid) * (1 + 1e-6)
+                    P_hi = cp.PropsSI('pcrit', fluid) * (1 - 1e-6)
+                    P = np.geomspace(P_lo, P_hi, cls.SAT_NODES)
+                    T = np.asarray(cp.PropsSI('T', 'P', P, 'Q', 0, fluid), dtype=float)
+                    h_fg = np.asarray(cp.PropsSI('H', 'P', P, 'Q', 1, fluid), dtype=float) \
+                        - np.asarray(cp.PropsSI('H', 'P', P, 'Q', 0, fluid), dtype=float)
+                    if np.all(np.isfinite(T)) and np.all(T > 0) and np.all(np.isfinite(h_fg)):
+                        table = {'lnP': np.log(P).tolist(), 'inv_T': (1.0 / T).tolist(),
+                                 # Same nodes by ascending 1/T (descending P) for lookups in T
+                                 'inv_T_asc': (1.0 / T[::-1]).tolist(), 'lnP_by_T': np.log(P[::-1]).tolist(),
+                                 'h_fg_by_T': h_fg[::-1].tolist()}
+                except ValueError:
+                    table = None
+            cls._SAT_TABLES[fluid] = table
+        return cls._SAT_TABLES[fluid]
+
+    @staticmethod
+    def _interp(xs, ys, x):
+        """ Linear interpolation on ascending nodes; None (NaN for arrays) off-table. """
+        if np.ndim(x):
+            inside = (x >= xs[0]) & (x <= xs[-1])
+            return np.where(inside, np.interp(x, xs, ys), np.nan)
+        if x is None or not xs[0] <= x <= xs[-1]: return None
+        i = min(bisect.bisect_right(xs, x) - 1, len(xs) - 2)
+        t = (x - xs[i]) / (xs[i + 1] - xs[i])
+        return ys[i] + t * (ys[i + 1] - ys[i])
+
+    @staticmethod
+    def _log(P):
+        if np.ndim(P):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.log(np.asarray(P, dtype=float))
+        return dual.log(P) if P > 0 else None
+
+    @staticmethod
+    def _inverse(T):
+        if np.ndim(T):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return 1.0 / np.asarray(T, dtype=float)
+        return 1.0 / T if T > 0 else None
+
+    @staticmethod
+    def _missing(x):
+        return np.full(np.shape(x), np.nan) if np.ndim(x) else None
+
+    def _gupta_array(self, Tg, Tc):
+        data = GuptaAir._DATA
+        T_tab = np.array([row[0] for row in data])
+        def col(key, T):
+            # Same clamp + linear formula as GuptaAir._interpolate
+            vals = np.array([row[self._GUPTA_COLS[key]] for row in data])
+            T = np.clip(T, T_tab[0], T_tab[-1])
+            j = np.clip(np.searchsorted(T_tab, T, side='left') - 1, 0, len(T_tab) - 2)
+            frac = (T - T_tab[j]) / (T_tab[j + 1] - T_tab[j])
+            return vals[j] + frac * (vals[j + 1] - vals[j])
+        M = np.full(np.shape(Tg), GuptaAir._get_col(data[0], 'M'))
+        return (col('D', Tg), col('V', Tg), col('C', Tg), col('L', Tg),
+                col('Prandtl', Tg), M, col('V', Tc))
+
+
+# Shared default engine (no reuse policy)
+DEFAULT_ENGINE = PropertyEngine()
@@ -0,0 +1,113 @@
+import math
+import numpy as np
+from src import dual
+from src.response import ResponseTable
+
+SIGMA = 5.670374419e-8      # Stefan-Boltzmann constant [W/m^2-K^4]
+R_UNIVERSAL = 8.314462618   # [J/mol-K]
+P_ATM = 101325.0            # [Pa]
+
+class GasRadiation:
+    """
+    Gas-to-wall radiation of an H2O/CO2-bearing gas, weighted-sum-of-gray-gases
+    model of Smith, Shen & Friedman (1982):
+
+      eps(T, pL) = sum_i a_i(T) * (1 - exp(-k_i * pL)),   a_i(T) = b1 + b2 T + b3 T^2 + b4 T^3
+      pL = (p_H2O + p_CO2) * L_beam  [atm-m]
+
+    The coefficient set follows the H2O/CO2 ratio: pure CO2 / pure H2O limits,
+    Pw/Pc = 1 (ratio up to 1.5) or Pw/Pc = 2 (above). The fits hold for
+    600-2400 K; temperatures outside are clamped into that range. The gas
+    absorptivity for wall emission uses the same sum at the wall temperature.
+
+    Emissivities come from a (T, pL) table per coefficient set, built once per
+    process (relative error <= TABLE_TOL); the exact sum is used off-table.
+    Net flux: q = sigma * (eps_wall + 1)/2 * (eps_g Tg^4 - alpha_g Tw^4) (Hottel).
+    """
+    # k_i [1/(atm-m)] and (b1, b2, b3, b4) per gray gas
+    _WSGG = {
+        'CO2': ((0.3966, (0.4334e-1, 2.620e-4, -1.560e-7, 2.565e-11)),
+                (15.64,  (-0.4814e-1, 2.822e-4, -1.794e-7, 3.274e-11)),
+                (394.3,  (0.5492e-1, 0.1087e-4, -0.3500e-7, 0.9123e-11))),
+        'H2O': ((0.4098, (5.977e-1, -5.119e-4, 3.042e-7, -5.564e-11)),
+                (6.325,  (0.5677e-1, 3.333e-4, -1.967e-7, 2.718e-11)),
+                (120.5,  (1.800e-1, -2.334e-4, 1.008e-7, -1.454e-11))),
+        'Pw/Pc=1': ((0.4303, (5.150e-1, -2.303e-4, 0.9779e-7, -1.494e-11)),
+                    (7.055,  (0.7749e-1, 3.399e-4, -2.297e-7, 3.770e-11)),
+                    (178.1,  (1.907e-1, -1.824e-4, 0.5608e-7, -0.5122e-11))),
+        'Pw/Pc=2': ((0.4201, (6.508e-1, -5.551e-4, 3.029e-7, -5.353e-11)),
+                    (6.516,  (-0.2504e-1, 6.112e-4, -3.882e-7, 6.528e-11)),
+                    (131.9,  (2.718e-1, -3.118e-4, 1.221e-7, -1.612e-11))),
+    }
+    T_RANGE = (600.0, 2400.0)
+    TABLE_T = (300.0, 3500.0)
+    TABLE_PL = (1e-5, 10.0)
+    TABLE_TOL = 1e-3
+    _TABLES = {}
+
+    def __init__(self, x_H2O=0.0, x_CO2=0.0, wall_emissivity=0.8):
+        self.x_H2O, self.x_CO2 = float(x_H2O), float(x_CO2)
+        self.wall_emissivity = float(wall_emissivity)
+        if self.x_H2O < 0 or self.x_CO2 < 0 or self.x_H2O + self.x_CO2 > 1.0:
+            raise ValueError(f"Invalid H2O/CO2 mole fractions ({x_H2O}, {x_CO2}).")
+        if not 0.0 < self.wall_emissivity <= 1.0:
+            raise ValueError(f"Wall emissivity must be in (0, 1]. Received {wall_emissivity}.")
+        if self.x_CO2 == 0.0: self.mixture = 'H2O'
+        elif self.x_H2O == 0.0: self.mixture = 'CO2'
+        else: self.mixture = 'Pw/Pc=1' if self.x_H2O / self.x_CO2 <= 1.5 else 'Pw/Pc=2'
+        self.x_rad = self.x_H2O + self.x_CO2
+        self.eps_eff = 0.5 * (self.wall_emissivity + 1.0)
+
+    @property
+    def active(self):
+        return self.x_rad > 0.0
+
+    def emissivity_exact(self, T, pL):
+        """ WSGG sum (scalars or arrays). """
+        T = np.clip(T, *self.T_RANGE) if np.ndim(T) else min(max(T, self.T_RANGE[0]), self.T_RANGE[1])
+        eps = 0.0
+        for k, (b1, b2, b3, b4) in self._WSGG[self.mixture]:
+            eps = eps + (b1 + T * (b2 + T * (b3 + T * b4))) * (1.0 - np.exp(-k * pL))
+        return eps
+
+    def _table(self):
+        table = self._TABLES.get(self.mixture)
+        if table is None:
+            table = ResponseTable.build(self.emissivity_exact, [self.TABLE_T, self.TABLE_PL], [33, 33],
+                                        breakpoints=self.T_RANGE, tol=self.TABLE_TOL, max_nodes=80000)
+            self._TABLES[self.mixture] = table
+        return table
+
+    def emissivity(self, T, pL):
+        """ Table lookup of the WSGG emissivity; exact sum off-table. Accepts scalars or arrays. """
+        table = self._table()
+        if np.ndim(T) or np.ndim(pL):
+            eps = table.evaluate(T, pL) if table is not None else np.full(np.broadcast(T, pL).shape, np.nan)
+            off = np.isnan(eps)
+            return np.where(off, self.emissivity_exact(T, pL), eps) if off.any() else eps
+        eps = table(T, pL) if table is not None else None
+        return eps if eps is not None else dual.as_float(self.emissivity_exact(T, pL))
+
+    @staticmethod
+    def beam_length(S_T, S_L, D):
+        """ Mean beam length of a tube bundle, L = 3.6 V/A per unit cell (gas volume over tube surface). """
+        return 3.6 * (S_T * S_L - 0.25 * math.pi * D**2) / (math.pi * D)
+
+    def h_rad(self, Tg, Tw, rho, M, L_beam):
+        """
+        Radiative gas-to-wall conductance per unit wall area [W/m^2-K]. The
+        partial pressure follows from the ideal-gas law (rho, M in kg/mol).
+        Accepts scalars or arrays.
+        """
+        if np.ndim(Tg) or np.ndim(Tw):
+            if not self.active: return np.zeros(np.broadcast(Tg, Tw).shape)
+            pL = self.x_rad * (rho * R_UNIVERSAL * Tg / M) / P_ATM * L_beam
+            q = SIGMA * self.eps_eff * (self.emissivity(Tg, pL) * Tg**4 - self.emissivity(Tw, pL) * Tw**4)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(np.abs(Tg - Tw) < 1e-9, 0.0, q / (Tg - Tw))
+        if not self.active or abs(Tg - Tw) < 1e-9: return 0.0
+        pL = self.x_rad * (rho * R_UNIVERSAL * Tg / M) / P_ATM * L_beam
+        eps_g = self.emissivity(Tg, pL)
+        alpha_g = self.emissivity(Tw, pL)
+        q = SIGMA * self.eps_eff * (eps_g * Tg**4 - alpha_g * Tw**4)
+        return q / (Tg - Tw)
@@ -0,0 +1,108 @@
+import bisect
+import itertools
+import numpy as np
+from src import dual
+
+# ==============================================================================
+# INTERPOLATION TABLE
+# ==============================================================================
+class ResponseTable:
+    """
+    Multilinear interpolation table over log-spaced axes, in log space.
+
+    axes:   list of 1-D node arrays (physical values, strictly increasing, > 0)
+    values: array of shape tuple(len(a) for a in axes)
+
+    Values are interpolated in log space when they are all positive (power laws
+    such as Nu ~ Re^m Pr^n are then reproduced exactly), linearly otherwise.
+    Lookups outside the axes return None so the caller can fall back to the exact
+    model. max_error is the largest relative error found at the build-time check.
+    """
+    def __init__(self, axes, values):
+        self.axes = [np.log(np.asarray(a, dtype=float)) for a in axes]
+        values = np.asarray(values, dtype=float)
+        self.log_values = bool(np.all(values > 0))
+        self.values = np.log(values) if self.log_values else values
+        self.max_error = None
+
+        # Scalar lookup data: plain lists, flat values, corner offsets
+        self._axes = [a.tolist() for a in self.axes]
+        self._flat = self.values.ravel().tolist()
+        self._strides = [int(np.prod([len(a) for a in self.axes[k + 1:]])) for k in range(len(self.axes))]
+        self._corners = [(sum(b * s for b, s in zip(bits, self._strides)), bits)
+                         for bits in itertools.product((0, 1), repeat=len(self.axes))]
+
+    def __call__(self, *coords):
+        """ Scalar lookup (floats or Duals); None when any coordinate is outside the table. """
+        base, frac = 0, []
+        for x, nodes, stride in zip(coords, self._axes, self._strides):
+            if not x > 0: return None
+            u = dual.log(x)
+            if u < nodes[0] or u > nodes[-1]: return None
+            i = min(bisect.bisect_right(nodes, u) - 1, len(nodes) - 2)
+            frac.append((u - nodes[i]) / (nodes[i + 1] - nodes[i]))
+            base += i * stride
+        flat = self._flat
+        v = 0.0
+        for offset, bits in self._corners:
+            w = 1.0
+            for b, t in zip(bits, frac):
+                w *= t if b else 1.0 - t
+            v += w * flat[base + offset]
+        return dual.exp(v) if self.log_values else v
+
+    def evaluate(self, *coords):
+        """ Array lookup; NaN outside the table. """
+        coords = np.broadcast_arrays(*[np.asarray(c, dtype=float) for c in coords])
+        shape = coords[0].shape
+        inside = np.ones(shape, dtype=bool)
+        idx, frac = [], []
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for x, nodes in zip(coords, self.axes):
+                u = np.log(x)
+                inside &= (u >= nodes[0]) & (u <= nodes[-1])
+                i = np.clip(np.searchsorted(nodes, u, side='right') - 1, 0, len(nodes) - 2)
+                idx.append(i)
+                frac.append((u - nodes[i]) / (nodes[i + 1] - nodes[i]))
+        v = np.zeros(shape)
+        for bits in itertools.product((0, 1), repeat=len(coords)):
+            w = np.ones(shape)
+            for b, t in zip(bits, frac):
+                w = w * (t if b else 1.0 - t)
+            v = v + w * self.values[tuple(i + b for i, b in zip(idx, bits))]
+        v = np.exp(v) if self.log_values else v
+        return np.where(inside, v, np.nan)
+
+    @classmethod
+    def build(cls, func, bounds, nodes, breakpoints=(), tol=1e-3, max_nodes=20000):
+        """
+        Tabulates func(*grids) -> values over bounds [(lo, hi), ...] (log-spaced axes,
+        starting with `nodes` per axis), refining all axes until the relative error at
+        every cell centre is within tol. Axis 0 gets a pair of nodes straddling each
+        breakpoint inside its range, so regime switches stay sharp (the sub-ppm cell
+        between the pair is excluded from the check).
+        Returns the table, or None if tol is not met within max_nodes or func is not finite.
+        """
+        nodes = list(nodes)
+        while True:
+            axes = [np.geomspace(lo, hi, n) for (lo, hi), n in zip(bounds, nodes)]
+            lo, hi = bounds[0]
+            inner = [bp for bp in breakpoints if lo < bp < hi]
+            if inner:
+                axes[0] = np.unique(np.concatenate(
+                    [axes[0], [bp * (1 - 1e-9) for bp in inner], [bp * (1 + 1e-9) for bp in inner]]))
+            values = func(*np.meshgrid(*axes, indexing='ij'))
+            if not np.all(np.isfinite(values)): return None
+            table = cls(axes, values)
+
+            # Check at cell centres against the exact response
+            centres = np.meshgrid(*[np.sqrt(a[:-1] * a[1:]) for a in axes], indexing='ij')
+            exact = func(*centres)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                err = np.abs(table.evaluate(*centres) - exact) / np.abs(exact)
+            err[(axes[0][1:] / axes[0][:-1]) < 1 + 1e-8] = 0.0
+            table.max_error = float(np.nanmax(err)) if err.size else 0.0
+            if table.max_error <= tol: return table
+
+            nodes = [2 * n - 1 for n in nodes]
+            if np.prod(nodes) > max_nodes: return None
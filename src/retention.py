@@ -0,0 +1,161 @@
+class Retention:
+    """
+    History retention policy for a solve.
+
+    Modes:
+      - 'full':       every row in FluidStream.profile and zone.history (default)
+      - 'every':      every k-th row of each zone, plus the zone outlet row
+      - 'boundaries': zone outlet rows only
+      - 'summary':    zone.results only; no profiles, no history
+      - 'none':       outlet states only; no results, profiles or history
+    """
+    MODES = ('full', 'every', 'boundaries', 'summary', 'none')
+
+    def __init__(self, mode='full', every=1):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown retention mode '{mode}'. Must be one of {self.MODES}.")
+        if int(every) < 1:
+            raise ValueError(f"Retention 'every' must be >= 1. Received {every}.")
+        self.mode = mode
+        self.every = int(every)
+
+    @classmethod
+    def coerce(cls, policy):
+        """ Accepts None, a mode string, an int k (every k-th row) or a Retention. """
+        if policy is None: return cls()
+        if isinstance(policy, cls): return policy
+        if isinstance(policy, bool): raise ValueError("Retention must be a mode string, int or Retention.")
+        if isinstance(policy, int): return cls('every', policy)
+        return cls(str(policy).lower())
+
+    @property
+    def keeps_results(self):
+        return self.mode != 'none'
+
+    @property
+    def keeps_rows(self):
+        return self.mode in ('full', 'every', 'boundaries')
+
+    def keep_row(self, i, n_rows):
+        """ True if row i (0-based) of an n_rows zone is stored. """
+        if self.mode == 'full': return True
+        if self.mode == 'every': return (i + 1) % self.every == 0 or i == n_rows - 1
+        if self.mode == 'boundaries': return i == n_rows - 1
+        return False
+
+    def __repr__(self):
+        return f"Retention('{self.mode}'" + (f", every={self.every})" if self.mode == 'every' else ")")
+
+
+class ZoneRecorder:
+    """
+    Accumulates per-row zone statistics under a Retention policy.
+    Running sums feed zone.results; history lists only hold the retained rows.
+
+    Rows passed with a coolant saturation temperature are screened for subcooled
+    boiling: a row is at risk when T_wall > T_sat + onb_margin (onset of nucleate
+    boiling). results() then reports the smallest margin and the count of rows at risk.
+    Zones in condensing-exhaust mode also report the condensate and latent duty;
+    zones that track the Mach number report its maximum, outlet value and choking.
+    """
+    _HISTORY_KEYS = ('Re_g', 'h_g', 'Q', 'dP_g', 'Re_c', 'T_wall', 'T_cool')
+
+    def __init__(self, retention, n_rows, onb_margin=0.0, condensation=False):
+        self.retention = retention
+        self.n_rows = n_rows
+        self.onb_margin = onb_margin
+        self.n = 0
+        self.sum_Q = self.sum_dP_g = self.sum_dP_c = 0
+        self.sum_h_g = self.sum_h_c = self.sum_Re_g = self.sum_Re_c = 0
+        self.history = {k: [] for k in self._HISTORY_KEYS} if retention.keeps_rows else {}
+        # Boiling screen: (margin, T_wall, T_sat) of the tightest row, rows at risk, first such row
+        self.boiling_min = None
+        self.boiling_rows = 0
+        self.boiling_first_row = None
+        # Condensing-exhaust totals (None when the zone has no condensation model)
+        self.condensation = {'m_cond': 0.0, 'Q_lat': 0.0, 'rows': 0, 'w_vap_out': None} if condensation else None
+        # Mach tracking (None until a step reports a Mach number)
+        self.mach = None
+
+    def keep_row(self, i):
+        return self.retention.keep_row(i, self.n_rows)
+
+    def add(self, keep, Q, h_g, h_c, Re_g, Re_c, dP_g, dP_c, T_wall, T_cool, T_sat=None):
+        self.n += 1
+        if T_sat is not None:
+            margin = T_sat + self.onb_margin - T_wall
+            if self.boiling_min is None or margin < self.boiling_min[0]:
+                self.boiling_min = (margin, T_wall, T_sat)
+            if margin < 0:
+                self.boiling_rows += 1
+                if self.boiling_first_row is None: self.boiling_first_row = self.n - 1
+        self.sum_Q += Q
+        self.sum_h_g += h_g; self.sum_h_c += h_c
+        self.sum_Re_g += Re_g; self.sum_Re_c += Re_c
+        self.sum_dP_g += dP_g; self.sum_dP_c += dP_c
+        if keep:
+            hist = self.history
+            hist['Re_g'].append(Re_g); hist['h_g'].append(h_g); hist['Q'].append(Q)
+            hist['dP_g'].append(dP_g); hist['Re_c'].append(Re_c)
+            hist['T_wall'].append(T_wall); hist['T_cool'].append(T_cool)
+
+    def add_step(self, keep, i, step, T_cool, w_vap):
+        """ Records one scalar driver step (src.zones.StepRecord) of row i. """
+        p = step.p
+        self.add(keep, step.Q, p.h_g, p.h_c, p.Re_g, p.Re_c, p.dP_g, p.dP_c, step.T_wall, T_cool, step.T_sat)
+        if self.condensation is not None: self.add_condensation(step.m_cond, step.Q_lat, w_vap)
+        if p.Ma: self.add_mach(p.Ma, i)
+
+    def add_condensation(self, m_cond, Q_lat, w_vap):
+        c = self.condensation
+        c['m_cond'] += m_cond
+        c['Q_lat'] += Q_lat
+        if m_cond > 0: c['rows'] += 1
+        c['w_vap_out'] = w_vap
+
+    def add_mach(self, Ma, row):
+        if self.mach is None: self.mach = {'max': Ma, 'out': Ma, 'choked_row': None}
+        m = self.mach
+        m['max'], m['out'] = max(m['max'], Ma), Ma
+        if Ma >= 1.0 and m['choked_row'] is None: m['choked_row'] = row
+
+    def results(self, Tg, Tc):
+        if not self.retention.keeps_results: return {}
+        n = self.n
+        results = {
+            'Q_total_kW': self.sum_Q / 1000.0,
+            'dP_gas_Pa': self.sum_dP_g,
+            'dP_cool_Pa': self.sum_dP_c,
+            'h_gas_avg': self.sum_h_g / n,
+            'h_cool_avg': self.sum_h_c / n,
+            'Re_gas_avg': self.sum_Re_g / n,
+            'Re_cool_avg': self.sum_Re_c / n,
+            'T_gas_out': Tg, 'T_cool_out': Tc
+        }
+        if self.boiling_min is not None:
+            margin, T_wall, T_sat = self.boiling_min
+            results.update({
+                'boiling_risk': self.boiling_rows > 0,
+                'boiling_rows': self.boiling_rows,
+                'boiling_first_row': self.boiling_first_row,
+                'boiling_margin_min_K': margin,
+                'T_wall_at_min_margin': T_wall,
+                'T_sat_at_min_margin': T_sat
+            })
+        if self.condensation is not None:
+            c = self.condensation
+            results.update({
+                'condensate_kg_s': c['m_cond'],
+                'Q_latent_kW': c['Q_lat'] / 1000.0,
+                'condensing_rows': c['rows'],
+                'w_vap_out': c['w_vap_out']
+            })
+        if self.mach is not None:
+            m = self.mach
+            results.update({
+                'Mach_max': m['max'],
+                'Mach_out': m['out'],
+                'choked': m['choked_row'] is not None,
+                'choked_row': m['choked_row']
+            })
+        return results
@@ -0,0 +1,195 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+from src import dual
+from src.dual import Dual
+from src.events import Failure
+from src.zones import GradedTubeBankZone, MarchState, PipeFlowZone
+
+# ==============================================================================
+# PARAMETERS
+# ==============================================================================
+# Builder-config names -> zone attribute names
+_GEOMETRY_ALIASES = {'tube_od': 'tube_dia'}
+
+# Graded zones march their per-row arrays; the scalar attributes only describe row 0
+_GRADED_ATTRS = {'tube_dia': 'tube_dias', 'S_T': 'S_Ts', 'S_L': 'S_Ls',
+                 'fin_pitch': 'fin_pitches', 'fin_thickness': 'fin_thicknesses'}
+
+_INLET_PARAMS = {
+    'T_gas_in':   ('hot', 'T'),   'P_gas_in':   ('hot', 'P'),   'm_dot_gas':  ('hot', 'm_dot'),
+    'T_cool_in':  ('cold', 'T'),  'P_cool_in':  ('cold', 'P'),  'm_dot_cool': ('cold', 'm_dot'),
+}
+
+OUTPUTS = ('T_gas_out', 'T_cool_out', 'P_gas_out', 'dP_gas', 'Q_total')
+
+
+@dataclass
+class SensitivityResult:
+    """
+    Outlet values and their forward sensitivities from one augmented march.
+      - values:   {output: value}
+      - jacobian: {output: {param_label: d(output)/d(param)}}
+    """
+    params: List[str]
+    values: Dict[str, float] = field(default_factory=dict)
+    jacobian: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def gradient(self, output):
+        """ Returns d(output)/d(params) as a list ordered like self.params. """
+        return [self.jacobian[output][p] for p in self.params]
+
+
+def _param_label(spec):
+    return spec if isinstance(spec, str) else f"{spec[0]}.{spec[1]}"
+
+
+def _zone_attr(zone, attr):
+    attr = _GEOMETRY_ALIASES.get(attr, attr)
+    if isinstance(zone, GradedTubeBankZone): attr = _GRADED_ATTRS.get(attr, attr)
+    return attr
+
+
+def _seed_params(hx, params):
+    """
+    Resolves the parameter specs into seeded Duals.
+    A spec is either an inlet name ('T_gas_in', 'm_dot_cool', ...), a geometry
+    attribute applied to every zone that has it ('S_T', 'tube_od', 'fin_pitch'),
+    or a (zone_name, attribute) tuple for a single zone. Per-row attributes of a
+    graded zone are seeded row by row (one object array of Duals).
+    Returns (hot_in, cold_in, zone_seeds) where zone_seeds[zone.name][attr] is the
+    seeded value of the attribute.
+    """
+    n = len(params)
+    inlet_seeds = {}
+    zone_seeds = {z.name: {} for z in hx.zones}
+
+    def add_seed(current, val, idx):
+        seed = Dual.seed(val, idx, n)
+        return seed if current is None else current + seed
+
+    def add_geometry(zone, attr, idx):
+        attr = _zone_attr(zone, attr)
+        if not hasattr(zone, attr):
+            return False
+        val, current = getattr(zone, attr), zone_seeds[zone.name].get(attr)
+        if np.ndim(val):
+            rows = current if current is not None else [None] * len(val)
+            zone_seeds[zone.name][attr] = np.array([add_seed(c, v, idx) for c, v in zip(rows, val)], dtype=object)
+        else:
+            zone_seeds[zone.name][attr] = add_seed(current, val, idx)
+        return True
+
+    for idx, spec in enumerate(params):
+        if isinstance(spec, str) and spec in _INLET_PARAMS:
+            inlet_seeds[_INLET_PARAMS[spec]] = idx
+            continue
+        if isinstance(spec, str):
+            hits = [add_geometry(z, spec, idx) for z in hx.zones if not isinstance(z, PipeFlowZone)]
+            if not any(hits):
+                raise ValueError(f"Sensitivity parameter '{spec}' not found on any zone.")
+        else:
+            zone_name, attr = spec
+            zone = next((z for z in hx.zones if z.name == zone_name), None)
+            if zone is None or not add_geometry(zone, attr, idx):
+                raise ValueError(f"Sensitivity parameter {spec} not found.")
+
+    def inlet(side, key, state):
+        val = getattr(state, key)
+        idx = inlet_seeds.get((side, key))
+        return Dual.seed(val, idx, n) if idx is not None else Dual(val, [0.0] * n)
+
+    hot, cold = hx.hot_stream.inlet, hx.cold_stream.inlet
+    hot_in = {k: inlet('hot', k, hot) for k in ('T', 'P', 'm_dot')}
+    cold_in = {k: inlet('cold', k, cold) for k in ('T', 'P', 'm_dot')}
+    return hot_in, cold_in, zone_seeds
+
+
+# ==============================================================================
+# AUGMENTED MARCH
+# ==============================================================================
+def _value_state(s):
+    """ Float copy of a Dual MarchState (zone hooks that take FluidStates). """
+    return MarchState(*(dual.value(getattr(s, k)) for k in ('Tg', 'Pg', 'Tc', 'Pc', 'mdot_g', 'mdot_c', 'w')),
+                      s.str_g, s.str_c)
+
+
+def _march_zone(zone, s, hot_in, cold_in):
+    """
+    Marches one zone on the Dual state s through the shared zone step
+    (BaseZone._step), updating s in place. Returns the zone duty.
+    """
+    model = zone.model
+    geo = zone.compile_geometry()
+    v = _value_state(s)
+    zone.prepare(geo, model, v.hot_state(hot_in, zone.origin_x), v.cold_state(cold_in, zone.origin_x))
+    Q_zone = 0.0
+    for i in range(zone.n_steps(geo)):
+        step = zone._step(zone.row_geometry(geo, i), model, i, s)
+        if isinstance(step, Failure):
+            raise ValueError(f"Sensitivity march failed in zone {zone.name}: {step.message}")
+        if step.p.Ma >= 1.0:
+            raise ValueError(f"Sensitivity march choked in zone {zone.name} at row {i}; no derivative at the sonic limit.")
+        Q_zone = Q_zone + step.Q
+    zone.finish(model, ' (sensitivity)')
+    return Q_zone
+
+
+def solve_sensitivities(hx, params=('tube_od', 'fin_pitch', 'S_T', 'S_L')):
+    """
+    Single augmented march returning outlet values and d(outputs)/d(params).
+
+    params: iterable of parameter specs. Inlet names ('T_gas_in', 'P_gas_in',
+    'm_dot_gas', 'T_cool_in', 'P_cool_in', 'm_dot_cool'), a geometry attribute
+    applied to every zone that has it ('tube_od', 'S_T', 'S_L', 'fin_pitch',
+    'fin_thickness', 'width', 'height'), or a (zone_name, attribute) tuple.
+
+    The seeded attributes are set on the zones as src.dual Duals for the duration
+    of the call, and every zone is marched by the same step as solve() (BaseZone._step),
+    so the derivatives cover all zone types and options. Integer counts (tubes per
+    column, fins per tube) are held fixed, so the derivatives are those of the smooth
+    branch the design currently sits on. Iterative sub-solves (wall fixed point,
+    condensation root, Fanno inverse) are differentiated implicitly at their
+    converged values; gas and coolant transport properties by central differences
+    of the flash (see PropertyEngine). Raises ValueError when the march fails or chokes.
+    """
+    params = list(params)
+    hot_in, cold_in, zone_seeds = _seed_params(hx, params)
+    hot, cold = hx.hot_stream.inlet, hx.cold_stream.inlet
+    s = MarchState(hot_in['T'], hot_in['P'], cold_in['T'], cold_in['P'], hot_in['m_dot'], cold_in['m_dot'],
+                   hot.w_vap, hot.fluid_string, cold.fluid_string)
+
+    saved = {z.name: {a: getattr(z, a) for a in zone_seeds[z.name]} for z in hx.zones}
+    # The coolant reuse cache holds float states of earlier solves
+    engines = {id(z.property_engine): z.property_engine for z in hx.zones}
+    caches = {k: (e._coolant_ref, dict(e.stats)) for k, e in engines.items()}
+    Q_total = 0.0
+    for zone in hx.zones:
+        if not zone.tube_centers: zone.build_geometry()
+    try:
+        for zone in hx.zones:
+            for attr, seed in zone_seeds[zone.name].items():
+                setattr(zone, attr, seed)
+        for e in engines.values(): e._coolant_ref = None
+        for zone in hx.zones:
+            Q_total = Q_total + _march_zone(zone, s, hot, cold)
+    finally:
+        for zone in hx.zones:
+            for attr, val in saved[zone.name].items():
+                setattr(zone, attr, val)
+        for k, e in engines.items():
+            e._coolant_ref, e.stats = caches[k]
+
+    outputs = {
+        'T_gas_out': s.Tg, 'T_cool_out': s.Tc, 'P_gas_out': s.Pg,
+        'dP_gas': hot_in['P'] - s.Pg, 'Q_total': Q_total,
+    }
+    labels = [_param_label(p) for p in params]
+    result = SensitivityResult(params=labels)
+    for name in OUTPUTS:
+        val = outputs[name]
+        grad = val.grad if isinstance(val, Dual) else [0.0] * len(labels)
+        result.values[name] = dual.value(val)
+        result.jacobian[name] = dict(zip(labels, grad))
+    return result
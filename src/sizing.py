@@ -0,0 +1,162 @@
+import copy
+import math
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from src.inverse import _brent
+
+@dataclass
+class SizingResult:
+    """
+    Result of a sizing solve. config is the sized HXBuilder config (a copy of the
+    input with width / height scaled and the depth zone's tubes_deep set);
+    T_out, Q_kW and dP_Pa are those of the verification solve of that config.
+    iterations holds (scale, rows, dP) of every trial frontal area.
+    """
+    config: Optional[list] = None
+    feasible: bool = False
+    scale: Optional[float] = None
+    frontal_area_m2: Optional[float] = None
+    tubes_deep: Optional[int] = None
+    depth_m: Optional[float] = None
+    T_out: Optional[float] = None
+    Q_kW: Optional[float] = None
+    dP_Pa: Optional[float] = None
+    iterations: List[Tuple[float, Optional[int], float]] = field(default_factory=list)
+    n_solves: int = 0
+    elapsed_s: float = 0.0
+    message: str = ''
+
+
+class _Trial:
+    """
+    Minimum depth and the resulting gas dP as a function of the frontal scale s.
+    One streaming march per s (HeatExchanger.iter_solve) with the depth zone at
+    max_rows: the first depth-zone row meeting the thermal target gives the
+    depth (self.rows[s]), its pressure the dP. Returns dP - dP_max, +inf when the
+    target is not met within max_rows or the march fails.
+    """
+    def __init__(self, builder, config, hot_in, cold_in, dP_max, T_out, Q, depth_zone, max_rows):
+        self.builder, self.config, self.hot_in, self.cold_in = builder, config, hot_in, cold_in
+        self.dP_max, self.T_out, self.Q = dP_max, T_out, Q
+        self.depth_zone, self.max_rows = depth_zone, max_rows
+        self.cache, self.rows, self.iterations, self.n_solves = {}, {}, [], 0
+
+    def sized(self, s, rows):
+        """ Config copy with the frontal dimensions scaled by s and the depth zone at rows. """
+        config = copy.deepcopy(self.config)
+        for cfg in config:
+            if 'width' not in cfg: continue
+            height = cfg.get('height', cfg['width'])
+            cfg['width'], cfg['height'] = cfg['width'] * s, height * s
+        config[self.depth_zone]['tubes_deep'] = int(rows)
+        return config
+
+    def build(self, config):
+        saved, self.builder.zones = self.builder.zones, []
+        try:
+            return self.builder.add_zones_from_config(config).build(self.hot_in, self.cold_in)
+        finally:
+            self.builder.zones = saved
+
+    def __call__(self, s):
+        if s in self.cache: return self.cache[s]
+        hx = self.build(self.sized(s, self.max_rows))
+        name = hx.zones[self.depth_zone].name
+        self.n_solves += 1
+        rows, dP, Q_sum = None, math.inf, 0.0
+        for r in hx.iter_solve('none'):
+            Q_sum += r.Q
+            if r.zone != name: continue
+            if (self.T_out is not None and r.Tg <= self.T_out) or (self.Q is not None and Q_sum >= self.Q):
+                rows, dP = r.row + 1, self.hot_in.P - r.Pg
+                break
+        if hx.failures and rows is None: dP = math.inf
+        self.iterations.append((s, rows, dP))
+        self.cache[s], self.rows[s] = dP - self.dP_max, rows
+        return self.cache[s]
+
+
+def size_exchanger(builder, config, hot_in, cold_in, dP_max, T_out=None, Q=None, depth_zone=-1,
+                   max_rows=200, scale_bounds=(0.1, 10.0), factor=1.5, xtol=1e-3, max_solves=30):
+    """
+    Sizes a fixed tube / fin family: the smallest frontal area, and the smallest
+    depth at that area, that meet a thermal target (gas outlet temperature T_out [K]
+    or duty Q [W]) within a gas pressure drop limit dP_max [Pa].
+
+    builder:    HXBuilder holding the models and options (its zones are left as they are)
+    config:     zone config list (HXBuilder.add_zones_from_config). Every zone with
+                a 'width' is scaled in width and height (aspect ratio kept); the
+                depth zone (index, default the last zone) is sized in tubes_deep.
+                The depth zone must be the last zone.
+
+    For a trial frontal scale s, one streaming march with max_rows rows in the
+    depth zone stops at the first row meeting the thermal target: the minimum
+    depth at s and its dP. dP falls with frontal area, so the smallest feasible s
+    is the root of dP(s) = dP_max: bracketed geometrically from s = 1 by factor
+    within scale_bounds and closed with Brent's method on the feasible side. The sized config is then
+    solved once as built; if the row-count corrections of the model move it off
+    target, rows are added one at a time.
+    Returns a SizingResult.
+    """
+    if (T_out is None) == (Q is None):
+        raise ValueError("Pass exactly one thermal target: T_out [K] or Q [W].")
+    n_zones = len(config)
+    depth_zone = depth_zone % n_zones
+    if depth_zone != n_zones - 1:
+        raise ValueError(f"The depth zone must be the last zone (index {n_zones - 1}). Received {depth_zone}.")
+    if 'tubes_deep' not in config[depth_zone] or config[depth_zone].get('type', 'bare') == 'graded':
+        raise ValueError("The depth zone must be a uniform tube bank with 'tubes_deep'.")
+
+    t_start = time.perf_counter()
+    trial = _Trial(builder, config, hot_in, cold_in, float(dP_max), T_out, Q, depth_zone, int(max_rows))
+    result = SizingResult()
+
+    # Bracket: grow the frontal area until dP fits, or shrink it until it does not
+    s0, f0 = 1.0, trial(1.0)
+    grow = f0 > 0
+    s, fs = s0, f0
+    bracket = None
+    while trial.n_solves < max_solves:
+        s_new = min(s * factor, scale_bounds[1]) if grow else max(s / factor, scale_bounds[0])
+        if s_new == s: break
+        f_new = trial(s_new)
+        if (f_new > 0) != (fs > 0):
+            bracket = (s, s_new, fs, f_new)
+            break
+        s, fs = s_new, f_new
+    if bracket is None:
+        result.message = "No frontal area in the searched range meets both targets." if grow else \
+            "Every frontal area searched meets both targets; the search range is too small."
+        result.iterations, result.n_solves = list(trial.iterations), trial.n_solves
+        result.elapsed_s = time.perf_counter() - t_start
+        return result
+
+    a, b, fa, fb = bracket
+    b, fb, c, fc = _brent(trial, a, b, fa, fb, 0.0, xtol * s0, max_solves)
+    s_fit = b if fb <= 0 else c
+    rows = trial.rows[s_fit]
+
+    # Verify the sized config as built
+    for _ in range(10):
+        sized = trial.sized(s_fit, rows)
+        hx = trial.build(sized)
+        hx.solve('summary', quiet=True)
+        trial.n_solves += 1
+        dP = hot_in.P - hx.hot_out.P
+        Q_kW = sum(z.results.get('Q_total_kW', 0.0) for z in hx.zones)
+        thermal = hx.hot_out.T <= T_out if T_out is not None else Q_kW * 1000.0 >= Q
+        if thermal or hx.failures: break
+        rows += 1
+
+    zone = hx.zones[depth_zone]
+    result.config, result.scale, result.tubes_deep = sized, s_fit, rows
+    result.frontal_area_m2 = zone.width * zone.height
+    result.depth_m = sum(z.S_L * z.n_cols for z in hx.zones if hasattr(z, 'n_cols') and hasattr(z, 'S_L'))
+    result.T_out, result.Q_kW, result.dP_Pa = hx.hot_out.T, Q_kW, dP
+    result.feasible = thermal and dP <= dP_max and not hx.failures
+    result.message = 'sized' if result.feasible else "The verification solve misses a target."
+    result.iterations, result.n_solves = list(trial.iterations), trial.n_solves
+    result.elapsed_s = time.perf_counter() - t_start
+    return result
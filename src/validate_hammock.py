@@ -134,7 +134,6 @@ def run_validation():
         # Force geometry overrides for exact match
         zone.S_T = S_T
         zone.S_L = S_L
-        zone.eps_por = 1.0 - ((np.pi/4.0)*(D_t**2)) / (S_T * S_L)
         
         hx.add_zone(zone)
         
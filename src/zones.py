@@ -1,76 +1,538 @@
 import math
+import logging
+from collections import namedtuple
 import traceback
-import CoolProp.CoolProp as cp
+import numpy as np
 from src import correlations as corr 
+from src import dual
 from src.fluids import FluidState 
 from src.models import TariqModel
 from src.models.pressure import GunterShawModel
-from src.gupta import GuptaAir 
+from src.properties import DEFAULT_ENGINE
+from src.retention import Retention, ZoneRecorder
+from src.events import Failure, SolveEvents
+from src.radiation import GasRadiation
+from src.compressible import R_UNIVERSAL, fanno_fld, fanno_mach, fanno_p_ratio, fanno_T_ratio, rayleigh_cool
+
+logger = logging.getLogger(__name__)
+
+# Surface physics of one marching step (fields are scalars, or arrays in batch mode)
+#   UA      overall gas-to-coolant conductance [W/K] (0 for adiabatic steps)
+#   R_wall  coolant-to-wall resistance [K/W], for T_wall = Tc + Q * R_wall
+#   dP_g, dP_c, h_g, h_c, Re_g, Re_c: step pressure drops and reported averages
+#   UA_g    gas-side convective conductance [W/K], drives condensation (0 = none)
+#   dT_g, Q_loss, Ma: steps without a coolant side -- gas static temperature drop [K],
+#           heat lost to the surroundings [W], outlet Mach number (0 = not tracked,
+#           1 = choked: the driver stops the zone)
+RowPhysics = namedtuple('RowPhysics', 'UA R_wall dP_g dP_c h_g h_c Re_g Re_c UA_g dT_g Q_loss Ma',
+                        defaults=(0.0, 0.0, 0.0, 0.0))
+
+# Outcome of one scalar marching step: physics, duty [W] (latent included), wall and
+# coolant saturation temperatures [K], condensate [kg/s] and latent duty [W]
+StepRecord = namedtuple('StepRecord', 'p Q T_wall T_sat m_cond Q_lat')
+
+# Streamed row state (iter_solve): zone name, step index, outlet x [m], gas T [K] / P [Pa],
+# coolant T [K], wall T [K] and duty [W] of the step
+RowRecord = namedtuple('RowRecord', 'zone row x Tg Pg Tc Tw Q')
+
+class MarchState:
+    """ Mutable stream state carried from step to step by the scalar driver. """
+    __slots__ = ('Tg', 'Pg', 'Tc', 'Pc', 'mdot_g', 'mdot_c', 'w', 'str_g', 'str_c')
+
+    def __init__(self, Tg, Pg, Tc, Pc, mdot_g, mdot_c, w=0.0, str_g=None, str_c=None):
+        self.Tg, self.Pg, self.Tc, self.Pc = Tg, Pg, Tc, Pc
+        self.mdot_g, self.mdot_c, self.w = mdot_g, mdot_c, w
+        self.str_g, self.str_c = str_g, str_c
+
+    @classmethod
+    def from_states(cls, hot, cold):
+        return cls(hot.T, hot.P, cold.T, cold.P, hot.m_dot, cold.m_dot, hot.w_vap, hot.fluid_string, cold.fluid_string)
+
+    def hot_state(self, hot_in, x):
+        return FluidState(hot_in.name, self.Tg, self.Pg, self.mdot_g, hot_in.fluid_obj, x=x, w_vap=self.w)
+
+    def cold_state(self, cold_in, x):
+        return FluidState(cold_in.name, self.Tc, self.Pc, self.mdot_c, cold_in.fluid_obj, x=x)
 
 class BaseZone:
+    """
+    Zone plugin contract. A zone type supplies the physics of one marching step;
+    the marching driver (solve / solve_ensemble) is shared by all zone types and
+    owns the property flashes, the NTU energy balance, the state update, failure
+    handling and history retention.
+
+      compile_geometry()        -> geo: row-invariant terms, evaluated once per march
+      n_steps(geo)              -> number of marching steps (tube rows, segments, ...)
+      row_geometry(geo, i)      -> geometry of step i (default: geo, uniform zones)
+      step_x(geo, i, hot_in)    -> x-coordinate at the outlet of step i
+      surface(geo, model, Tg, Tc, mdot_g, mdot_c, gas, cool, wall=None) -> RowPhysics (scalars)
+      surface_batch(geo, models, Tg, Tc, mdot_g, mdot_c, gas, cool, wall=None)
+                                -> RowPhysics with array fields, one entry per state.
+                                   The default loops surface(); zones override it to
+                                   evaluate a batch at once.
+      prepare(geo, model, hot_in, cold_in) / finish(model, label)
+                                -> optional once-per-march hooks
+
+    gas / cool are PropertyEngine.gas / .coolant tuples. Zones without a coolant
+    side set HAS_COOLANT = False: no coolant flash, no heat exchange, cool is None.
+    wall is (T_wall, mu_wall, Pr_wall) of the gas at the wall; None means the
+    default wall state (coolant temperature, bulk Pr).
+
+    wall_iterations > 0 makes the driver iterate the wall temperature and the gas
+    wall properties to consistency on every step (see _wall_iterate).
+
+    Coolant steps are screened for subcooled boiling against the tabulated
+    T_sat(Pc) of the coolant (PropertyEngine.saturation_temperature): a step is at
+    risk when T_wall > T_sat + onb_margin. T_wall is the mid-wall temperature, so
+    the screen errs on the safe side. Flags land in the zone results (ZoneRecorder).
+
+    condensation (src.condensation.Condensation) enables the condensing-exhaust
+    mode on coolant steps: the gas carries a vapour mass fraction (FluidState.w_vap)
+    that condenses on walls below the dew point. The latent load goes to the
+    coolant, the condensate leaves the gas stream.
+    """
+    HAS_COOLANT = True
+
     def __init__(self, name):
         self.name = name
         self.tube_centers = []
         self.n_tubes = 0
         self.origin_x = 0.0
+        self.model = None
+        self.property_engine = DEFAULT_ENGINE
+        # Wall-temperature fixed point: max surface evaluations per step (0 = off), tolerance [K]
+        self.wall_iterations = 0
+        self.wall_tol = 0.01
+        # Onset-of-nucleate-boiling wall superheat above T_sat(Pc) tolerated before a row is flagged [K]
+        self.onb_margin = 0.0
+        # Condensing-exhaust mode (src.condensation.Condensation; None = dry gas)
+        self.condensation = None
         self.results = {} 
         self.history = {}
 
     def build_geometry(self):
         raise NotImplementedError
 
-    def solve(self, hot_state_in, cold_state_in):
+    # --- Plugin stages ---
+    def compile_geometry(self):
         raise NotImplementedError
 
+    def n_steps(self, geo):
+        raise NotImplementedError
+
+    def row_geometry(self, geo, i):
+        return geo
+
+    def step_x(self, geo, i, hot_state_in):
+        return self.origin_x + (i + 1) * geo['dx']
+
+    def surface(self, geo, model, Tg, Tc, mdot_g, mdot_c, gas, cool, wall=None):
+        raise NotImplementedError
+
+    def surface_batch(self, geo, models, Tg, Tc, mdot_g, mdot_c, gas, cool, wall=None):
+        rows = [self.surface(geo, m, float(Tg[j]), float(Tc[j]), float(mdot_g[j]), float(mdot_c[j]),
+                             tuple(float(p[j]) for p in gas),
+                             tuple(float(p[j]) for p in cool) if cool is not None else None,
+                             tuple(float(w[j]) for w in wall) if wall is not None else None)
+                for j, m in enumerate(models)]
+        return RowPhysics(*(np.array(col, dtype=float) for col in zip(*rows)))
+
+    def prepare(self, geo, model, hot_state_in, cold_state_in):
+        pass
+
+    def finish(self, model, label=None):
+        pass
+
+    # --- Shared marching driver ---
+    @staticmethod
+    def _exchange(p, Tg, Tc, C_g, C_c):
+        """ NTU energy balance of one step (scalars or arrays). Returns (Q, T_wall). """
+        if np.ndim(Tg):
+            C_min = np.minimum(C_g, C_c)
+            eps = 1.0 - np.exp(-(p.UA / C_min))
+        else:
+            C_min = min(C_g, C_c)
+            eps = 1.0 - dual.exp(-(p.UA / C_min))
+        Q = eps * C_min * (Tg - Tc)
+        return Q, Tc + Q * p.R_wall
+
+    def _wall_iterate(self, geo, models, fluid, Tg, Tc, Pg, mdot_g, mdot_c, gas, cool, C_g, C_c, first):
+        """
+        Wall-temperature fixed point T_w = G(T_w) for one step; scalars (models is one
+        model) or arrays (one entry per state, models a list). G evaluates the surface
+        physics with the gas wall properties at T_w and returns the resulting wall
+        temperature. From the wall temperature of the plain pass, the first update is
+        a fixed-point step and later ones secant (Steffensen) steps, kept inside
+        [Tc, Tg] and stopped at wall_tol or after wall_iterations evaluations.
+        first = (RowPhysics, Q, T_wall) of the plain pass; returns the same for the
+        last evaluation.
+        """
+        batch = np.ndim(Tg) > 0
+        lo, hi = (np.minimum(Tc, Tg), np.maximum(Tc, Tg)) if batch else (min(Tc, Tg), max(Tc, Tg))
+        p, Q, y = first
+        x, x_prev, F_prev = y, None, None
+        for _ in range(self.wall_iterations):
+            try:
+                mu_w, Pr_w = self.property_engine.gas_wall(fluid, x, Pg)
+            except ValueError:
+                break
+            if batch and not (np.all(np.isfinite(mu_w)) and np.all(np.isfinite(Pr_w))): break
+            gas_w = gas[:6] + (mu_w,)
+            if batch:
+                p = self.surface_batch(geo, models, Tg, Tc, mdot_g, mdot_c, gas_w, cool, (x, mu_w, Pr_w))
+            else:
+                p = self.surface(geo, models, Tg, Tc, mdot_g, mdot_c, gas_w, cool, (x, mu_w, Pr_w))
+            Q, y = self._exchange(p, Tg, Tc, C_g, C_c)
+            F = y - x
+            if batch:
+                if np.all(np.abs(F) <= self.wall_tol): break
+                x_next = y
+                if F_prev is not None:
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        x_sec = x - F * (x - x_prev) / (F - F_prev)
+                    x_next = np.where(np.isfinite(x_sec), x_sec, y)
+                x_prev, F_prev = x, F
+                x = np.clip(x_next, lo, hi)
+            else:
+                if abs(F) <= self.wall_tol: break
+                x_next = y
+                if F_prev is not None and F != F_prev:
+                    x_sec = x - F * (x - x_prev) / (F - F_prev)
+                    if math.isfinite(dual.value(x_sec)): x_next = x_sec
+                x_prev, F_prev = x, F
+                x = min(max(x_next, lo), hi)
+        return p, Q, y
+
+    def _step(self, g, model, i, s):
+        """
+        One scalar marching step (row geometry g, step index i) on the MarchState s,
+        which is updated in place. Returns a StepRecord, or a Failure with s untouched.
+        """
+        props, coolant = self.property_engine, self.HAS_COOLANT
+        Tg, Pg, Tc, Pc, mdot_g, mdot_c, w = s.Tg, s.Pg, s.Tc, s.Pc, s.mdot_g, s.mdot_c, s.w
+        if Pg <= 0: return Failure(self.name, i, 'pressure', f"Gas Pressure Exhausted at Row {i} ({Pg:.2f} Pa)")
+        if coolant and Pc <= 0:
+            return Failure(self.name, i, 'pressure', f"Coolant Pressure Exhausted at Row {i} ({Pc:.2f} Pa)")
+
+        try:
+            gas = props.gas(s.str_g, Tg, Pg, Tc)
+            cool = props.coolant(s.str_c, Tc, Pc) if coolant else None
+        except ValueError as e:
+            return Failure(self.name, i, 'property', f"Property Error at Row {i}: {e}")
+
+        p = self.surface(g, model, Tg, Tc, mdot_g, mdot_c, gas, cool)
+        m_cond = Q_lat = 0.0
+        if coolant:
+            C_g, C_c = mdot_g * gas[2], mdot_c * cool[2]
+            Q, T_wall = self._exchange(p, Tg, Tc, C_g, C_c)
+            if self.wall_iterations:
+                p, Q, T_wall = self._wall_iterate(g, model, s.str_g, Tg, Tc, Pg, mdot_g, mdot_c, gas, cool, C_g, C_c,
+                                                  (p, Q, T_wall))
+            cond = self.condensation
+            if cond is not None and w > 0:
+                m_cond, Q_lat, T_wall = cond.step(props, w, mdot_g, Pg, gas[5], gas[2], p.UA_g, T_wall, p.R_wall)
+            T_sat = props.saturation_temperature(s.str_c, Pc)
+            s.Tg = Tg - Q / C_g
+            s.Tc = Tc + (Q + Q_lat) / C_c
+            if m_cond > 0:
+                s.w = (w * mdot_g - m_cond) / (mdot_g - m_cond)
+                s.mdot_g = mdot_g - m_cond
+            Q += Q_lat
+        else:
+            Q, T_wall, T_sat = p.Q_loss, Tc, None
+            s.Tg = Tg - p.dT_g
+        s.Pg = Pg - p.dP_g
+        return StepRecord(p, Q, T_wall, T_sat, m_cond, Q_lat)
+
+    def solve(self, hot_state_in, cold_state_in, retention=None, emit=None):
+        rows = self.iter_solve(hot_state_in, cold_state_in, retention, emit)
+        while True:
+            try:
+                next(rows)
+            except StopIteration as end:
+                return end.value
+
+    def iter_solve(self, hot_state_in, cold_state_in, retention=None, emit=None):
+        """
+        Generator form of solve(): yields a RowRecord per marched step as it is
+        computed and returns solve()'s (hot_out, cold_out, hot_profile, cold_profile)
+        as the StopIteration value. Results / history are stored when the march
+        completes; a generator closed early leaves them untouched.
+        emit: failure events go to this src.events emitter (default: console).
+        """
+        if emit is None: emit = SolveEvents().emitter(self.name)
+        if not self.tube_centers: self.build_geometry()
+        retention = Retention.coerce(retention)
+        props, model, coolant = self.property_engine, self.model, self.HAS_COOLANT
+        s = MarchState.from_states(hot_state_in, cold_state_in)
+        
+        hot_profile, cold_profile = [], []
+        geo = self.compile_geometry()
+        n_steps = self.n_steps(geo)
+        recorder = self._recorder(retention, n_steps)
+        evals0, reuses0 = props.stats['coolant_evals'], props.stats['coolant_reuses']
+        self.prepare(geo, model, hot_state_in, cold_state_in)
+
+        for i in range(n_steps):
+            x_loc = self.step_x(geo, i, hot_state_in)
+            step = self._step(self.row_geometry(geo, i), model, i, s)
+            if isinstance(step, Failure):
+                emit('failure', self.name, failure=step)
+                break
+
+            keep = recorder.keep_row(i)
+            if keep:
+                hot_profile.append(s.hot_state(hot_state_in, x_loc))
+                cold_profile.append(s.cold_state(cold_state_in, x_loc))
+            
+            # Store Stats (with Wall and Coolant Temps)
+            recorder.add_step(keep, i, step, s.Tc, s.w)
+            x_out = x_loc
+            yield RowRecord(self.name, i, x_loc, s.Tg, s.Pg, s.Tc, step.T_wall, step.Q)
+            if step.p.Ma >= 1.0:
+                emit('failure', self.name, failure=Failure(self.name, i, 'choked',
+                                                           f"Choked Flow at Row {i} (Ma = {step.p.Ma:.2f})"))
+                break
+
+        self.finish(model)
+        if recorder.n == 0: return hot_state_in, cold_state_in, [], []
+        self._store(recorder, s, props.stats['coolant_evals'] - evals0, props.stats['coolant_reuses'] - reuses0)
+        hot_out, cold_out = self._outlet_states(hot_state_in, cold_state_in, s, x_out, hot_profile, cold_profile)
+        return hot_out, cold_out, hot_profile, cold_profile
+
+    def _recorder(self, retention, n_steps):
+        return ZoneRecorder(retention, n_steps, self.onb_margin, self.HAS_COOLANT and self.condensation is not None)
+
+    def _store(self, recorder, s, coolant_evals, coolant_reuses):
+        """ Sets results / history from a finished scalar march. """
+        self.results = recorder.results(s.Tg, s.Tc)
+        if self.results and self.HAS_COOLANT and self.property_engine.reuses_coolant:
+            self.results['coolant_evals'] = coolant_evals
+            self.results['coolant_reuses'] = coolant_reuses
+        self.history = recorder.history
+
+    def _outlet_states(self, hot_state_in, cold_state_in, s, x_out, hot_profile, cold_profile):
+        """ Outlet states: the last retained row if it is the last marched row, else built fresh. """
+        if hot_profile and hot_profile[-1].x == x_out:
+            return hot_profile[-1], cold_profile[-1]
+        return s.hot_state(hot_state_in, x_out), s.cold_state(cold_state_in, x_out)
+
+    def solve_ensemble(self, hot_states_in, cold_states_in, models, retention=None, emit=None):
+        """
+        Advances one thermal state per heat-transfer model in lockstep.
+        Each step evaluates the properties of all active states in one batched call
+        per property, the surface physics through surface_batch and the energy
+        balance on arrays.
+
+        hot_states_in / cold_states_in: one FluidState per model (or a single state
+        shared by all). Returns a list of (hot_out, cold_out, hot_profile, cold_profile,
+        results, history), one per model, in model order. self.results / self.history
+        are left untouched. Failures carry the model name and member index.
+        """
+        if emit is None: emit = SolveEvents().emitter(self.name)
+
+        def fail(k, i, kind, msg):
+            emit('failure', self.name, failure=Failure(self.name, i, kind, msg, type(models[k]).__name__, k))
+
+        if not self.tube_centers: self.build_geometry()
+        retention = Retention.coerce(retention)
+        n = len(models)
+        if isinstance(hot_states_in, FluidState): hot_states_in = [hot_states_in] * n
+        if isinstance(cold_states_in, FluidState): cold_states_in = [cold_states_in] * n
+        hot0, cold0 = hot_states_in[0], cold_states_in[0]
+        str_g, str_c = hot0.fluid_string, cold0.fluid_string
+        props, coolant = self.property_engine, self.HAS_COOLANT
+
+        Tg = np.array([s.T for s in hot_states_in]); Pg = np.array([s.P for s in hot_states_in])
+        Tc = np.array([s.T for s in cold_states_in]); Pc = np.array([s.P for s in cold_states_in])
+        mdot_g = np.array([s.m_dot for s in hot_states_in], dtype=float)
+        mdot_c = np.array([s.m_dot for s in cold_states_in], dtype=float)
+        w = np.array([s.w_vap for s in hot_states_in], dtype=float)
+        cond = self.condensation if coolant else None
+
+        geo = self.compile_geometry()
+        n_steps = self.n_steps(geo)
+        recorders = [self._recorder(retention, n_steps) for _ in range(n)]
+        hot_profiles = [[] for _ in range(n)]; cold_profiles = [[] for _ in range(n)]
+        x_out = [None] * n
+        active = list(range(n))
+        for k, m in enumerate(models):
+            self.prepare(geo, m, hot_states_in[k], cold_states_in[k])
+
+        for i in range(n_steps):
+            x_loc = self.step_x(geo, i, hot0)
+            for k in list(active):
+                if Pg[k] <= 0 or (coolant and Pc[k] <= 0):
+                    fail(k, i, 'pressure', f"Pressure Exhausted at Row {i}")
+                    active.remove(k)
+            if not active: break
+
+            idx = np.array(active)
+            gas = props.gas(str_g, Tg[idx], Pg[idx], Tc[idx])
+            gas = tuple(np.broadcast_to(np.asarray(p, dtype=float), idx.shape) for p in gas)   # scalar molar mass
+            cool = tuple(np.asarray(p, dtype=float) for p in props.coolant(str_c, Tc[idx], Pc[idx])) if coolant else None
+            ok = np.all(np.isfinite(np.array(gas + (cool or ()))), axis=0)
+            if not ok.all():
+                for j in np.flatnonzero(~ok):
+                    fail(active[j], i, 'property', f"Property Error at Row {i}")
+                active = [k for j, k in enumerate(active) if ok[j]]
+                if not active: break
+                idx = np.array(active)
+                gas = tuple(p[ok] for p in gas)
+                cool = tuple(p[ok] for p in cool) if coolant else None
+
+            Tg_a, Tc_a = Tg[idx], Tc[idx]
+            g, members = self.row_geometry(geo, i), [models[k] for k in active]
+            p = self.surface_batch(g, members, Tg_a, Tc_a, mdot_g[idx], mdot_c[idx], gas, cool)
+            if coolant:
+                C_g, C_c = mdot_g[idx] * gas[2], mdot_c[idx] * cool[2]
+                Q, T_wall = self._exchange(p, Tg_a, Tc_a, C_g, C_c)
+                if self.wall_iterations:
+                    p, Q, T_wall = self._wall_iterate(g, members, str_g, Tg_a, Tc_a, Pg[idx], mdot_g[idx], mdot_c[idx],
+                                                      gas, cool, C_g, C_c, (p, Q, T_wall))
+                m_cond = Q_lat = np.zeros(len(idx))
+                if cond is not None and np.any(w[idx] > 0):
+                    m_cond, Q_lat, T_wall = cond.step(props, w[idx], mdot_g[idx], Pg[idx], gas[5], gas[2], p.UA_g,
+                                                      T_wall, p.R_wall)
+                T_sat = props.saturation_temperature(str_c, Pc[idx])
+                Tg[idx] = Tg_a - Q / C_g
+                Tc[idx] = Tc_a + (Q + Q_lat) / C_c
+                wet = m_cond > 0
+                if wet.any():
+                    w[idx] = np.where(wet, (w[idx] * mdot_g[idx] - m_cond) / (mdot_g[idx] - m_cond), w[idx])
+                    mdot_g[idx] = mdot_g[idx] - m_cond
+                Q = Q + Q_lat
+            else:
+                Q, T_wall, T_sat = p.Q_loss, Tc_a, np.full(len(idx), np.nan)
+                Tg[idx] = Tg_a - p.dT_g
+            Pg[idx] = Pg[idx] - p.dP_g
+
+            for j, k in enumerate(list(active)):
+                keep = recorders[k].keep_row(i)
+                if keep:
+                    hot_profiles[k].append(FluidState(hot0.name, float(Tg[k]), float(Pg[k]), float(mdot_g[k]), hot0.fluid_obj,
+                                                      x=x_loc, w_vap=float(w[k])))
+                    cold_profiles[k].append(FluidState(cold0.name, float(Tc[k]), float(Pc[k]), float(mdot_c[k]), cold0.fluid_obj, x=x_loc))
+                recorders[k].add(keep, float(Q[j]), float(p.h_g[j]), float(p.h_c[j]), float(p.Re_g[j]), float(p.Re_c[j]),
+                                 float(p.dP_g[j]), float(p.dP_c[j]), float(T_wall[j]), float(Tc[k]),
+                                 float(T_sat[j]) if np.isfinite(T_sat[j]) else None)
+                if cond is not None: recorders[k].add_condensation(float(m_cond[j]), float(Q_lat[j]), float(w[k]))
+                x_out[k] = x_loc
+                if p.Ma[j]:
+                    recorders[k].add_mach(float(p.Ma[j]), i)
+                    if p.Ma[j] >= 1.0:
+                        fail(k, i, 'choked', f"Choked Flow at Row {i} (Ma = {p.Ma[j]:.2f})")
+                        active.remove(k)
+
+        for m in models: self.finish(m, f" [{type(m).__name__}]")
+
+        members = []
+        for k in range(n):
+            rec = recorders[k]
+            if rec.n == 0:
+                members.append((hot_states_in[k], cold_states_in[k], [], [], {}, {}))
+                continue
+            s = MarchState(float(Tg[k]), float(Pg[k]), float(Tc[k]), float(Pc[k]), float(mdot_g[k]),
+                           cold_states_in[k].m_dot, float(w[k]))
+            hot_out, cold_out = self._outlet_states(hot_states_in[k], cold_states_in[k], s, x_out[k],
+                                                    hot_profiles[k], cold_profiles[k])
+            members.append((hot_out, cold_out, hot_profiles[k], cold_profiles[k],
+                            rec.results(float(Tg[k]), float(Tc[k])), rec.history))
+        return members
+
 # ==============================================================================
 # PIPE FLOW ZONE
 # ==============================================================================
 class PipeFlowZone(BaseZone):
-    def __init__(self, name, length, diameter, roughness=15e-6):
+    """
+    Straight pipe without a coolant side, Swamee-Jain friction.
+
+    Default: adiabatic and incompressible, one step (Darcy dP at the inlet density).
+    compressible=True marches `segments` steps of Fanno flow (src.compressible):
+    each segment advances the Mach number by f dx / D of friction length, with
+    static P and T from the Fanno ratios, so the density and velocity change
+    along the pipe. A segment is exact for its inlet properties; segments only
+    resolve the property drift (and the heat loss), so a handful suffice. U_loss > 0 [W/m^2-K, on the pipe wall] adds a heat loss to
+    T_ambient per segment (stagnation temperature relaxes exponentially, static
+    state on the Rayleigh line). Results report Mach_max / Mach_out; a segment
+    that would pass the sonic point chokes the pipe (choked=True, march stops).
+    """
+    HAS_COOLANT = False
+
+    def __init__(self, name, length, diameter, roughness=15e-6, property_engine=None,
+                 compressible=False, segments=10, U_loss=0.0, T_ambient=300.0):
         super().__init__(name)
         self.length = float(length)
         self.diameter = float(diameter)
         self.roughness = float(roughness)
-        self.area = (math.pi / 4.0) * self.diameter**2
         self.n_cols = 1 
         self.S_L = self.length 
         self.origin_x = 0.0
+        self.property_engine = property_engine if property_engine else DEFAULT_ENGINE
+        self.compressible = bool(compressible)
+        self.segments = int(segments)
+        self.U_loss = float(U_loss)
+        self.T_ambient = float(T_ambient)
+        if self.compressible and self.segments < 1:
+            raise ValueError(f"Zone {name}: segments must be >= 1. Received {segments}.")
+
+    @property
+    def area(self):
+        return (math.pi / 4.0) * self.diameter**2
 
     def build_geometry(self):
         self.tube_centers = [] 
 
-    def solve(self, hot_state_in, cold_state_in):
-        Tg, Pg = hot_state_in.T, hot_state_in.P
-        mdot_g = hot_state_in.m_dot
-        str_g = hot_state_in.fluid_string
-        
-        if Pg <= 0: raise ValueError(f"Zone {self.name}: Inlet pressure non-positive.")
+    def compile_geometry(self):
+        n = self.segments if self.compressible else 1
+        return {'dx': self.length / n, 'rel_roughness': self.roughness / self.diameter}
 
-        if str_g == "GuptaAir":
-            rho = GuptaAir.PropsSI('D', 'T', Tg, 'P', Pg, str_g)
-            mu  = GuptaAir.PropsSI('V', 'T', Tg, 'P', Pg, str_g)
-        else:
-            rho = cp.PropsSI('D', 'T', Tg, 'P', Pg, str_g)
-            mu  = cp.PropsSI('V', 'T', Tg, 'P', Pg, str_g)
-        
+    def n_steps(self, geo):
+        return self.segments if self.compressible else 1
+
+    def step_x(self, geo, i, hot_state_in):
+        return hot_state_in.x + (i + 1) * geo['dx']
+
+    def prepare(self, geo, model, hot_state_in, cold_state_in):
+        if hot_state_in.P <= 0: raise ValueError(f"Zone {self.name}: Inlet pressure non-positive.")
+
+    def surface(self, geo, model, Tg, Tc, mdot_g, mdot_c, gas, cool, wall=None):
+        if self.compressible:
+            return self._fanno_segment(geo, Tg, mdot_g, gas)
+        rho, mu = gas[0], gas[1]
         u_avg = mdot_g / (rho * self.area)
         Re_D = corr.calc_Re(rho, u_avg, self.diameter, mu)
-        f = corr.calc_friction_SwameeJain(Re_D, self.roughness/self.diameter)
+        f = corr.calc_friction_SwameeJain(Re_D, geo['rel_roughness'])
         dP = f * (self.length / self.diameter) * 0.5 * rho * (u_avg**2)
-        
-        hot_out = FluidState(hot_state_in.name, Tg, Pg - dP, mdot_g, hot_state_in.fluid_obj, x=hot_state_in.x + self.length)
-        cold_out = FluidState(cold_state_in.name, cold_state_in.T, cold_state_in.P, cold_state_in.m_dot, cold_state_in.fluid_obj, x=hot_state_in.x + self.length)
-        
-        self.results = {
-            'Q_total_kW': 0.0, 'dP_gas_Pa': dP, 'dP_cool_Pa': 0.0,
-            'h_gas_avg': 0.0, 'h_cool_avg': 0.0, 'Re_gas_avg': Re_D, 'Re_cool_avg': 0.0,
-            'T_gas_out': Tg, 'T_cool_out': cold_state_in.T
-        }
-        self.history = {
-            'Re_g': [Re_D], 'h_g': [0.0], 'Q': [0.0], 'dP_g': [dP], 
-            'T_wall': [cold_state_in.T], 'T_cool': [cold_state_in.T] # Dummy values for pipe
-        }
-        return hot_out, cold_out, [hot_out], [cold_out]
+        return RowPhysics(0.0, 0.0, dP, 0.0, 0.0, 0.0, Re_D, 0.0)
+
+    def _fanno_segment(self, geo, Tg, mdot_g, gas):
+        """ One Fanno segment (ideal gas, gamma from cp and M), then the optional heat loss. """
+        rho, mu, cp_g, M_g = gas[0], gas[1], gas[2], gas[5]
+        D, dx = self.diameter, geo['dx']
+        R = R_UNIVERSAL / M_g
+        gamma = cp_g / (cp_g - R)
+        G = mdot_g / self.area
+        P1 = rho * R * Tg
+        Ma1 = (G / rho) / dual.sqrt(gamma * R * Tg)
+        Re_D = corr.calc_Re(rho, G / rho, D, mu)
+        f = corr.calc_friction_SwameeJain(Re_D, geo['rel_roughness'])
+
+        if Ma1 >= 1.0:     # mass flow above the sonic limit at the segment inlet: choked, state held
+            return RowPhysics(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, Re_D, 0.0, 0.0, 0.0, 0.0, Ma1)
+        Ma2 = fanno_mach(fanno_fld(Ma1, gamma) - f * dx / D, gamma)
+        T2 = Tg * fanno_T_ratio(Ma2, gamma) / fanno_T_ratio(Ma1, gamma)
+        P2 = P1 * fanno_p_ratio(Ma2, gamma) / fanno_p_ratio(Ma1, gamma)
+
+        Q_loss = 0.0
+        if self.U_loss > 0 and Ma2 < 1.0:
+            T0 = T2 * (1.0 + 0.5 * (gamma - 1.0) * Ma2**2)
+            T0_out = self.T_ambient + (T0 - self.T_ambient) * dual.exp(-self.U_loss * math.pi * D * dx / (mdot_g * cp_g))
+            Q_loss = dual.as_float(mdot_g * cp_g * (T0 - T0_out))
+            T2, P2 = rayleigh_cool(T2, P2, G, R, cp_g, T0_out)
+            Ma2 = (G * R * T2 / P2) / dual.sqrt(gamma * R * T2)
+        return RowPhysics(0.0, 0.0, dual.as_float(P1 - P2), 0.0, 0.0, 0.0, Re_D, 0.0, 0.0, dual.as_float(Tg - T2), Q_loss,
+                          dual.as_float(Ma2))
 
 # ==============================================================================
 # TUBE BANK ZONE
@@ -79,7 +541,9 @@ class TubeBankZone(BaseZone):
     def __init__(self, name, height, tube_dia, R_p, n_cols, width=0.4064, 
                  origin_x=0.0, origin_y=0.0, stagger=True,
                  t_w=0.000889, k_wall=16.2, e_roughness=15e-6, 
-                 model=None, pressure_model=None): 
+                 model=None, pressure_model=None, property_engine=None, validation=None,
+                 wall_iterations=0, radiation=None, onb_margin=0.0,
+                 condensation=None): 
         super().__init__(name)
         self.height = float(height)
         self.width  = float(width) 
@@ -92,12 +556,31 @@ class TubeBankZone(BaseZone):
         
         self.model = model if model else TariqModel()
         self.pressure_model = pressure_model if pressure_model else GunterShawModel(use_correction=True)
+        self.property_engine = property_engine if property_engine else DEFAULT_ENGINE
+        # Correlation validation level; None defers to the model's own level
+        self.validation = validation
+        self.validation_notes = {}
+        # Wall-temperature / wall-property fixed point per row (0 = wall at coolant temperature)
+        self.wall_iterations = int(wall_iterations)
+        # Optional gas radiation (src.radiation.GasRadiation), in parallel with gas-side convection
+        self.radiation = radiation
+        # Subcooled-boiling screen: wall superheat above T_sat(Pc) before a row is flagged [K]
+        self.onb_margin = float(onb_margin)
+        # Condensing-exhaust mode (src.condensation.Condensation); the gas inlet state carries w_vap
+        self.condensation = condensation
         
         self.t_w, self.k_wall, self.e_roughness = t_w, k_wall, e_roughness
-        self.D_t_inner = self.tube_dia - 2.0 * self.t_w
         self.S_T = self.R_p * self.tube_dia
         self.S_L = self.R_p * self.tube_dia 
-        self.eps_por = 1.0 - ((math.pi/4.0)*(self.tube_dia**2)) / (self.S_T*self.S_L)
+
+    @property
+    def D_t_inner(self):
+        return self.tube_dia - 2.0 * self.t_w
+
+    @property
+    def eps_por(self):
+        """ Bank porosity, from the current tube diameter and pitches. """
+        return 1.0 - ((math.pi/4.0)*(self.tube_dia**2)) / (self.S_T*self.S_L)
 
     def _rows_in_column(self, offset):
         y_min = self.tube_dia / 2.0
@@ -125,321 +608,470 @@ class TubeBankZone(BaseZone):
         self.n_tubes = len(centers) * self.n_rows_avg
         return centers
 
-    def solve(self, hot_state_in, cold_state_in):
-        if not self.tube_centers: self.build_geometry()
-
-        Tg, Pg = hot_state_in.T, hot_state_in.P
-        Tc, Pc = cold_state_in.T, cold_state_in.P
-        mdot_g, mdot_c = hot_state_in.m_dot, cold_state_in.m_dot
-        str_g, str_c = hot_state_in.fluid_string, cold_state_in.fluid_string
-        
-        hot_profile, cold_profile = [], []
-        stats_Q, stats_h_g, stats_h_c = [], [], []
-        stats_Re_g, stats_Re_c, stats_dP_g, stats_dP_c = [], [], [], []
-        stats_Tw, stats_Tc = [], [] # New Arrays
-
+    def compile_geometry(self):
+        """ Row-invariant areas and resistances for the march. """
         L_tubes = self.width 
-        dx = self.S_L 
         A_front = self.height * L_tubes
         sigma_gap = (self.S_T - self.tube_dia) / self.S_T
-        A_min_flow = A_front * sigma_gap 
-        A_surf_tube = self.n_rows_avg * math.pi * self.tube_dia * L_tubes
-        A_surf_cool = self.n_rows_avg * math.pi * self.D_t_inner * L_tubes
-        A_c_cross = math.pi * (self.D_t_inner**2) / 4.0
-        
         n_total_tubes = self.n_rows_avg * self.n_cols
         if n_total_tubes == 0: n_total_tubes = 1
-        mdot_per_tube = mdot_c / n_total_tubes
+        return {
+            'L_tubes': L_tubes, 'dx': self.S_L, 'A_front': A_front,
+            'A_min_flow': A_front * sigma_gap,
+            'A_re': A_front,                      # Frontal area passed to calculate_Re_max
+            'A_surf_tube': self.n_rows_avg * math.pi * self.tube_dia * L_tubes,
+            'A_surf_cool': self.n_rows_avg * math.pi * self.D_t_inner * L_tubes,
+            'A_c_cross': math.pi * (self.D_t_inner**2) / 4.0,
+            'R_wall': dual.log(self.tube_dia/self.D_t_inner) / (2*math.pi*self.k_wall*L_tubes * self.n_rows_avg),
+            'n_total_tubes': n_total_tubes,
+            'D': self.tube_dia, 'D_in': self.D_t_inner, 'S_T': self.S_T, 'S_L': self.S_L,
+            'eps_por': self.eps_por, 'N_rows': self.n_cols,
+            # Radiation: mean beam length of the bundle, bare-tube envelope area of one row
+            'L_beam': GasRadiation.beam_length(self.S_T, self.S_L, self.tube_dia),
+            'A_rad': self.n_rows_avg * math.pi * self.tube_dia * L_tubes,
+        }
 
-        for i in range(self.n_cols):
-            x_loc = self.origin_x + (i + 1) * dx
-            
-            if Pg <= 0:
-                print(f"  [FAILURE] Gas Pressure Exhausted at Row {i} ({Pg:.2f} Pa)")
-                break
-            if Pc <= 0:
-                print(f"  [FAILURE] Coolant Pressure Exhausted at Row {i} ({Pc:.2f} Pa)")
-                break
+    def n_steps(self, geo):
+        return self.n_cols
 
-            try:
-                if str_g == "GuptaAir":
-                    rho_g = GuptaAir.PropsSI('D', 'T', Tg, 'P', Pg, str_g)
-                    mu_g  = GuptaAir.PropsSI('V', 'T', Tg, 'P', Pg, str_g)
-                    cp_g  = GuptaAir.PropsSI('C', 'T', Tg, 'P', Pg, str_g)
-                    k_g   = GuptaAir.PropsSI('L', 'T', Tg, 'P', Pg, str_g)
-                    pr_g  = GuptaAir.PropsSI('Prandtl', 'T', Tg, 'P', Pg, str_g)
-                    M_g   = GuptaAir.PropsSI('M', 'T', Tg, 'P', Pg, str_g)
-                    mu_w  = GuptaAir.PropsSI('V', 'T', Tc, 'P', Pg, str_g)
-                else:
-                    rho_g = cp.PropsSI('D', 'T', Tg, 'P', Pg, str_g)
-                    mu_g  = cp.PropsSI('V', 'T', Tg, 'P', Pg, str_g)
-                    cp_g  = cp.PropsSI('C', 'T', Tg, 'P', Pg, str_g)
-                    k_g   = cp.PropsSI('L', 'T', Tg, 'P', Pg, str_g)
-                    pr_g  = cp.PropsSI('Prandtl', 'T', Tg, 'P', Pg, str_g)
-                    M_g   = cp.PropsSI('M', str_g)
-                    mu_w  = cp.PropsSI('V', 'T', Tc, 'P', Pg, str_g)
-                
-                rho_c = cp.PropsSI('D', 'T', Tc, 'P', Pc, str_c)
-                mu_c  = cp.PropsSI('V', 'T', Tc, 'P', Pc, str_c)
-                cp_c  = cp.PropsSI('C', 'T', Tc, 'P', Pc, str_c)
-                k_c   = cp.PropsSI('L', 'T', Tc, 'P', Pc, str_c)
-                pr_c  = cp.PropsSI('Prandtl', 'T', Tc, 'P', Pc, str_c)
-            except ValueError as e:
-                print(f"  [FAILURE] Property Error at Row {i}: {e}")
-                break
+    def _validation_level(self, model):
+        return self.validation if self.validation else getattr(model, 'validation', 'strict')
 
-            # 2. Physics
-            if hasattr(self.model, 'calculate_Re_max'):
-                Re_t = self.model.calculate_Re_max(rho_g, mdot_g, A_front, self.S_T, self.S_L, self.tube_dia, mu_g)
-                u_max = (Re_t * mu_g) / (rho_g * self.tube_dia) if rho_g > 0 else 0.0
-            else:
-                u_max = mdot_g / (rho_g * A_min_flow)
-                Re_t = corr.calc_Re(rho_g, u_max, self.tube_dia, mu_g)
-            
-            model_params = {
-                'eps_por': self.eps_por, 'T': Tg, 'rho': rho_g, 'mu': mu_g, 'M_gas': M_g,
-                'D': self.tube_dia, 'S_T': self.S_T, 'S_L': self.S_L,
-                'N_rows': self.n_cols, 'Pr_wall': pr_g, 'T_wall': Tc, 'T_cool': Tc
-            }
-            Nu_t = self.model.calculate_Nu(Re_t, pr_g, **model_params)
-            h_t = Nu_t * k_g / self.tube_dia
-            
-            dP_params = {
-                'rho': rho_g, 'mu': mu_g, 'mu_wall': mu_w, 'm_dot': mdot_g,
-                'S_T': self.S_T, 'S_L': self.S_L, 'D': self.tube_dia,
-                'L_flow': self.S_L, 'A_front': A_front
-            }
-            dP_g_col = self.pressure_model.calculate_dP(**dP_params)
-            
-            u_c = mdot_per_tube / (rho_c * A_c_cross)
-            Re_h = corr.calc_Re(rho_c, u_c, self.D_t_inner, mu_c)
-            f_cool = corr.calc_friction_SwameeJain(Re_h, self.e_roughness/self.D_t_inner)
-            Nu_h   = corr.calc_Nu_Gnielinski(Re_h, pr_c, f_cool, self.D_t_inner, L_tubes)
-            h_c    = Nu_h * k_c / self.D_t_inner
-            dP_c_col = corr.calc_dP_coolant_tube(f_cool, rho_c, u_c, self.D_t_inner, L_tubes)
-
-            # 5. Energy Balance
-            R_gas  = 1.0 / (h_t * A_surf_tube)
-            R_cool = 1.0 / (h_c * A_surf_cool)
-            R_wall = math.log(self.tube_dia/self.D_t_inner) / (2*math.pi*self.k_wall*L_tubes * self.n_rows_avg)
-            UA_total = 1.0 / (R_gas + R_cool + R_wall)
-            
-            C_g, C_c = mdot_g * cp_g, mdot_c * cp_c
-            C_min = min(C_g, C_c)
-            
-            NTU = UA_total / C_min
-            eps = 1.0 - math.exp(-NTU)
-            Q = eps * C_min * (Tg - Tc)
-            
-            # --- CALCULATE T_WALL (Intermediate) ---
-            # Q = (Tg - Tw_out) / R_gas => Tw_out = Tg - Q*R_gas
-            T_wall_outer = Tg - Q * R_gas
-            # Or average wall temp: T_wall ~ Tc + Q * (R_cool + 0.5*R_wall)
-            T_wall_avg = Tc + Q * (R_cool + 0.5 * R_wall)
-            
-            Tg -= Q / C_g
-            Tc += Q / C_c
-            Pg -= dP_g_col
-            
-            hot_profile.append(FluidState(hot_state_in.name, Tg, Pg, mdot_g, hot_state_in.fluid_obj, x=x_loc))
-            cold_profile.append(FluidState(cold_state_in.name, Tc, Pc, mdot_c, cold_state_in.fluid_obj, x=x_loc))
-            
-            stats_Q.append(Q)
-            stats_h_g.append(h_t); stats_h_c.append(h_c); stats_Re_g.append(Re_t); stats_Re_c.append(Re_h)
-            stats_dP_g.append(dP_g_col); stats_dP_c.append(dP_c_col)
-            # Store Temps
-            stats_Tw.append(T_wall_avg)
-            stats_Tc.append(Tc)
-
-        if not stats_Q: return hot_state_in, cold_state_in, [], []
-        
-        self.results = {
-            'Q_total_kW': sum(stats_Q) / 1000.0,
-            'dP_gas_Pa': sum(stats_dP_g),
-            'dP_cool_Pa': sum(stats_dP_c),
-            'h_gas_avg': sum(stats_h_g) / len(stats_h_g),
-            'h_cool_avg': sum(stats_h_c) / len(stats_h_c),
-            'Re_gas_avg': sum(stats_Re_g) / len(stats_Re_g),
-            'Re_cool_avg': sum(stats_Re_c) / len(stats_Re_c),
-            'T_gas_out': Tg, 'T_cool_out': Tc
-        }
-        # Updated History with Wall and Coolant Temps
-        self.history = {
-            'Re_g': stats_Re_g, 'h_g': stats_h_g, 'Q': stats_Q, 
-            'dP_g': stats_dP_g, 'Re_c': stats_Re_c,
-            'T_wall': stats_Tw, 'T_cool': stats_Tc
+    def _Re_bounds(self, geo, model, mdot_g, mu_lo, mu_hi):
+        """ Re = rho*u_max*D/mu; density cancels, so Re spans [Re(mu_hi), Re(mu_lo)]. """
+        if hasattr(model, 'calculate_Re_max'):
+            Re = lambda mu: model.calculate_Re_max(1.0, mdot_g, geo['A_re'], geo['S_T'], geo['S_L'], geo['D'], mu)
+        else:
+            Re = lambda mu: corr.calc_Re(1.0, mdot_g / geo['A_min_flow'], geo['D'], mu)
+        return Re(mu_hi), Re(mu_lo)
+
+    def _validate_zone(self, geo, model, hot_state_in, cold_state_in):
+        """
+        Once-per-zone correlation check ('zone' validation). The gas stays between the
+        coolant inlet and gas inlet temperatures, so the viscosity at those two states
+        bounds Re over every row of the march.
+        """
+        T_lo = min(hot_state_in.T, cold_state_in.T)
+        gas = hot_state_in.fluid_string
+        mu_lo = self.property_engine.gas(gas, T_lo, hot_state_in.P, T_lo)[1]
+        mu_hi = self.property_engine.gas(gas, hot_state_in.T, hot_state_in.P, T_lo)[1]
+        Re_min, Re_max = self._Re_bounds(geo, model, hot_state_in.m_dot, mu_lo, mu_hi)
+        model.validate_zone(Re_min, Re_max, S_T=geo['S_T'], S_L=geo['S_L'], D=geo['D'], N_rows=geo['N_rows'])
+
+    def _collect_notes(self, model, label=None):
+        """ Aggregated per-row model conditions, reported once per zone. """
+        notes = dict(model.pop_notes()) if hasattr(model, 'pop_notes') else {}
+        for msg, count in notes.items():
+            logger.info(f"{self.name}{label or ''}: {msg} [{count} rows]")
+        return notes
+
+    def _model_params(self, geo, model, Tg, Tc, gas, wall=None):
+        """ calculate_Nu kwargs for one row. """
+        rho_g, mu_g, cp_g, k_g, pr_g, M_g, mu_w = gas
+        return {
+            'eps_por': geo['eps_por'], 'T': Tg, 'rho': rho_g, 'mu': mu_g, 'M_gas': M_g,
+            'D': geo['D'], 'S_T': geo['S_T'], 'S_L': geo['S_L'], 'N_rows': geo['N_rows'],
+            'Pr_wall': wall[2] if wall else pr_g, 'T_wall': wall[0] if wall else Tc, 'T_cool': Tc,
+            'validate': self._validation_level(model) == 'strict'
         }
-        return hot_profile[-1], cold_profile[-1], hot_profile, cold_profile
+
+    def _prepare_model(self, geo, model, hot_state_in, cold_state_in):
+        """ Once-per-zone setup for one model: drops stale notes, runs 'zone' validation. """
+        if hasattr(model, 'pop_notes'): model.pop_notes()    # drop notes from calls outside a march
+        if self._validation_level(model) == 'zone':
+            self._validate_zone(geo, model, hot_state_in, cold_state_in)
+
+    def _dP_geometry(self, geo):
+        """ Per-row geometry arguments of the pressure model. """
+        return {'S_T': geo['S_T'], 'S_L': geo['S_L'], 'D': geo['D'],
+                'L_flow': geo['S_L'], 'A_front': geo['A_front']}
+
+    @staticmethod
+    def _model_groups(models):
+        """ [(model, index array)] of the batch members sharing each model. """
+        groups = {}
+        for j, m in enumerate(models):
+            groups.setdefault(id(m), (m, []))[1].append(j)
+        return [(m, np.array(idx)) for m, idx in groups.values()]
+
+    def _reynolds(self, geo, model, rho_g, mdot_g, mu_g):
+        """ Tube Reynolds number of a row (scalars or arrays of states). """
+        if hasattr(model, 'calculate_Re_max'):
+            return model.calculate_Re_max(rho_g, mdot_g, geo['A_re'], geo['S_T'], geo['S_L'], geo['D'], mu_g)
+        u_max = mdot_g / (rho_g * geo['A_min_flow'])
+        return corr.calc_Re(rho_g, u_max, geo['D'], mu_g)
+
+    def _gas_side(self, geo, model, Tg, Tc, mdot_g, gas, wall=None):
+        """ Gas-side conductance for one row. Returns (UA_gas, h_report, Re_t, dP_g_col). """
+        rho_g, mu_g, cp_g, k_g, pr_g, M_g, mu_w = gas
+        Re_t = self._reynolds(geo, model, rho_g, mdot_g, mu_g)
+        
+        model_params = self._model_params(geo, model, Tg, Tc, gas, wall)
+        Nu_t = model.calculate_Nu(Re_t, pr_g, **model_params)
+        h_t = Nu_t * k_g / geo['D']
+        
+        dP_g_col = self.pressure_model.calculate_dP(rho=rho_g, mu=mu_g, mu_wall=mu_w, m_dot=mdot_g,
+                                                    **self._dP_geometry(geo))
+        UA_gas, h_gas = self._extended_surface(geo, h_t, mdot_g, gas)
+        return UA_gas, h_gas, Re_t, dP_g_col
+
+    def _gas_side_batch(self, geo, models, Tg, Tc, mdot_g, gas, wall=None):
+        """
+        _gas_side for arrays of states, one model per state: Re and Nu per group of
+        states sharing a model (calculate_Nu_array), dP for all states in one
+        calculate_dP_array call.
+        """
+        rho_g, mu_g, cp_g, k_g, pr_g, M_g, mu_w = gas
+        Re_t, Nu_t = np.empty(np.shape(Tg)), np.empty(np.shape(Tg))
+        for model, idx in self._model_groups(models):
+            sub = tuple(p[idx] for p in gas)
+            sub_wall = tuple(w[idx] for w in wall) if wall is not None else None
+            Re_t[idx] = self._reynolds(geo, model, sub[0], mdot_g[idx], sub[1])
+            model_params = self._model_params(geo, model, Tg[idx], Tc[idx], sub, sub_wall)
+            Nu_t[idx] = model.calculate_Nu_array(Re_t[idx], sub[4], **model_params)
+        h_t = Nu_t * k_g / geo['D']
+
+        dP_g_col = self.pressure_model.calculate_dP_array(rho_g, mu_g, mdot_g, mu_wall=mu_w, **self._dP_geometry(geo))
+        UA_gas, h_gas = self._extended_surface(geo, h_t, mdot_g, gas)
+        return UA_gas, h_gas, Re_t, dP_g_col
+
+    def _extended_surface(self, geo, h_t, mdot_g, gas):
+        """ Gas-side UA of the row and the h reported for it, from the tube h (scalars or arrays). """
+        return h_t * geo['A_surf_tube'], h_t
+
+    def prepare(self, geo, model, hot_state_in, cold_state_in):
+        self._prepare_model(geo, model, hot_state_in, cold_state_in)
+
+    def finish(self, model, label=None):
+        notes = self._collect_notes(model, label)
+        if label is None: self.validation_notes = notes
+
+    def surface(self, geo, model, Tg, Tc, mdot_g, mdot_c, gas, cool, wall=None):
+        """ Gas side, coolant side and wall in series for one row. """
+        gas_side = self._gas_side(geo, model, Tg, Tc, mdot_g, gas, wall)
+        return self._series(geo, gas_side, Tg, Tc, mdot_g, mdot_c, gas, cool, wall)
+
+    def surface_batch(self, geo, models, Tg, Tc, mdot_g, mdot_c, gas, cool, wall=None):
+        """ surface() on arrays of states: the gas side per model group, the rest on whole arrays. """
+        gas_side = self._gas_side_batch(geo, models, Tg, Tc, mdot_g, gas, wall)
+        p = self._series(geo, gas_side, Tg, Tc, mdot_g, mdot_c, gas, cool, wall)
+        return RowPhysics(*(np.broadcast_to(np.asarray(f, dtype=float), np.shape(Tg)) for f in p))
+
+    def _series(self, geo, gas_side, Tg, Tc, mdot_g, mdot_c, gas, cool, wall):
+        """ Coolant side, radiation and the series resistances of a row (scalars or arrays). """
+        UA_gas, h_gas, Re_t, dP_g_col = gas_side
+        UA_conv = UA_gas
+        rho_c, mu_c, cp_c, k_c, pr_c = cool
+        L_tubes, D_in = geo['L_tubes'], geo['D_in']
+
+        u_c = (mdot_c / geo['n_total_tubes']) / (rho_c * geo['A_c_cross'])
+        Re_h = corr.calc_Re(rho_c, u_c, D_in, mu_c)
+        f_cool = corr.calc_friction_SwameeJain(Re_h, self.e_roughness/D_in)
+        Nu_h   = corr.calc_Nu_Gnielinski(Re_h, pr_c, f_cool, D_in, L_tubes)
+        h_c    = Nu_h * k_c / D_in
+        dP_c_col = corr.calc_dP_coolant_tube(f_cool, rho_c, u_c, D_in, L_tubes)
+
+        R_cool = 1.0 / (h_c * geo['A_surf_cool'])
+        R_wall = geo['R_wall']
+        if self.radiation is not None:
+            if wall:
+                T_w = wall[0]
+            else:
+                # Plain pass: wall temperature of the convection-only exchange
+                conv = RowPhysics(1.0 / (1.0 / UA_conv + R_cool + R_wall), R_cool + 0.5 * R_wall, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+                T_w = self._exchange(conv, Tg, Tc, mdot_g * gas[2], mdot_c * cp_c)[1]
+            UA_gas = UA_gas + self.radiation.h_rad(Tg, T_w, gas[0], gas[5], geo['L_beam']) * geo['A_rad']
+        R_gas  = 1.0 / UA_gas
+        UA_total = 1.0 / (R_gas + R_cool + R_wall)
+        # Average wall temp: T_wall ~ Tc + Q * (R_cool + 0.5*R_wall)
+        return RowPhysics(UA_total, R_cool + 0.5 * R_wall, dP_g_col, dP_c_col, h_gas, h_c, Re_t, Re_h, UA_conv)
 
 # ==============================================================================
 # PLATE FIN ZONE
 # ==============================================================================
+def _plate_fin_h(geo, mdot_g, gas):
+    """
+    Plate-fin h: laminar flat plate while the channel develops, fully developed duct
+    otherwise. Scalars or arrays of states.
+    """
+    rho_g, mu_g, cp_g, k_g, pr_g, M_g, mu_w = gas
+    dx, D_h = geo['dx'], geo['D_h']
+    u_fin = mdot_g / (rho_g * geo['A_fin_channel'])
+    x_entry = corr.calc_entry_length_laminar(rho_g, u_fin, mu_g, pr_g, D_h)
+    
+    if np.ndim(x_entry):
+        Re_x = corr.calc_Re(rho_g, u_fin, 0.5*dx, mu_g)
+        h_developing = corr.calc_Nu_FlatPlate_Laminar(Re_x, pr_g) * k_g / (0.5*dx)
+        return np.where(0.5 * dx < x_entry, h_developing, corr.calc_Nu_Duct_Laminar() * k_g / D_h)
+    if 0.5 * dx < x_entry: 
+        Re_x = corr.calc_Re(rho_g, u_fin, 0.5*dx, mu_g)
+        Nu_fin = corr.calc_Nu_FlatPlate_Laminar(Re_x, pr_g)
+        return Nu_fin * k_g / (0.5*dx)
+    Nu_fin = corr.calc_Nu_Duct_Laminar()
+    return Nu_fin * k_g / D_h
+
 class PlateFinZone(TubeBankZone):
     def __init__(self, name, height, tube_dia, R_p, n_cols, fin_pitch, fin_thickness, 
                  width=0.4064, origin_x=0.0, origin_y=0.0, stagger=True,
                  t_w=0.000889, k_wall=16.2, e_roughness=15e-6, 
-                 model=None, pressure_model=None): 
+                 model=None, pressure_model=None, property_engine=None, validation=None,
+                 wall_iterations=0, radiation=None, onb_margin=0.0,
+                 condensation=None): 
         super().__init__(name, height, tube_dia, R_p, n_cols, width, 
-                         origin_x, origin_y, stagger, t_w, k_wall, e_roughness, model, pressure_model)
+                         origin_x, origin_y, stagger, t_w, k_wall, e_roughness, model, pressure_model,
+                         property_engine, validation, wall_iterations, radiation, onb_margin, condensation)
         self.fin_pitch = float(fin_pitch)
         self.fin_thickness = float(fin_thickness)
-        self.fin_gap = self.fin_pitch - self.fin_thickness
-        self.D_h = 2.0 * self.fin_gap
 
-    def solve(self, hot_state_in, cold_state_in):
-        if not self.tube_centers: self.build_geometry()
+    @property
+    def fin_gap(self):
+        return self.fin_pitch - self.fin_thickness
 
-        Tg, Pg = hot_state_in.T, hot_state_in.P
-        Tc, Pc = cold_state_in.T, cold_state_in.P
-        mdot_g, mdot_c = hot_state_in.m_dot, cold_state_in.m_dot
-        str_g, str_c = hot_state_in.fluid_string, cold_state_in.fluid_string
-        
-        hot_profile, cold_profile = [], []
-        stats_Q, stats_h_g, stats_h_c = [], [], []
-        stats_Re_g, stats_Re_c, stats_dP_g, stats_dP_c = [], [], [], []
-        stats_Tw, stats_Tc = [], []
+    @property
+    def D_h(self):
+        return 2.0 * self.fin_gap
 
-        L_tubes = self.width 
-        dx = self.S_L 
+    def compile_geometry(self):
+        geo = super().compile_geometry()
+        L_tubes, dx, A_front = geo['L_tubes'], geo['dx'], geo['A_front']
         N_fins = math.floor(L_tubes / self.fin_pitch)
-        A_front = self.height * L_tubes
         sigma_gap = (self.S_T - self.tube_dia) / self.S_T
         fin_blockage = 1.0 - (self.fin_thickness / self.fin_pitch)
-        A_min_flow = A_front * sigma_gap * fin_blockage
 
         len_exposed_tubes = L_tubes - (N_fins * self.fin_thickness)
-        A_tube_surf = self.n_rows_avg * math.pi * self.tube_dia * len_exposed_tubes
         A_fin_face = (self.height * dx) - (self.n_rows_avg * 0.25 * math.pi * self.tube_dia**2)
-        A_fin_surf = 2.0 * N_fins * A_fin_face
-        A_cool_surf = self.n_rows_avg * math.pi * self.D_t_inner * L_tubes
-        A_c_cross = math.pi * (self.D_t_inner**2) / 4.0
-        
-        n_total_tubes = self.n_rows_avg * self.n_cols
-        if n_total_tubes == 0: n_total_tubes = 1
-        mdot_per_tube = mdot_c / n_total_tubes
+        geo.update({
+            'A_min_flow': A_front * sigma_gap * fin_blockage,
+            'A_re': A_front * fin_blockage,
+            'A_fin_channel': A_front * fin_blockage,
+            'A_surf_tube': self.n_rows_avg * math.pi * self.tube_dia * len_exposed_tubes,
+            'A_fin_surf': 2.0 * N_fins * A_fin_face,
+            'D_h': self.D_h,
+        })
+        return geo
 
-        for i in range(self.n_cols):
-            x_loc = self.origin_x + (i + 1) * dx
-            
-            if Pg <= 0:
-                print(f"  [FAILURE] Gas Pressure Exhausted at Row {i} ({Pg:.2f} Pa)")
-                break
-            if Pc <= 0:
-                print(f"  [FAILURE] Coolant Pressure Exhausted at Row {i} ({Pc:.2f} Pa)")
-                break
+    def _extended_surface(self, geo, h_t, mdot_g, gas):
+        UA_gas_col = h_t * geo['A_surf_tube'] + _plate_fin_h(geo, mdot_g, gas) * geo['A_fin_surf']
+        h_effective = UA_gas_col / (geo['A_surf_tube'] + geo['A_fin_surf'])
+        return UA_gas_col, h_effective
 
-            try:
-                if str_g == "GuptaAir":
-                    rho_g = GuptaAir.PropsSI('D', 'T', Tg, 'P', Pg, str_g)
-                    mu_g  = GuptaAir.PropsSI('V', 'T', Tg, 'P', Pg, str_g)
-                    cp_g  = GuptaAir.PropsSI('C', 'T', Tg, 'P', Pg, str_g)
-                    k_g   = GuptaAir.PropsSI('L', 'T', Tg, 'P', Pg, str_g)
-                    pr_g  = GuptaAir.PropsSI('Prandtl', 'T', Tg, 'P', Pg, str_g)
-                    M_g   = GuptaAir.PropsSI('M', 'T', Tg, 'P', Pg, str_g)
-                    mu_w  = GuptaAir.PropsSI('V', 'T', Tc, 'P', Pg, str_g)
-                else:
-                    rho_g = cp.PropsSI('D', 'T', Tg, 'P', Pg, str_g)
-                    mu_g  = cp.PropsSI('V', 'T', Tg, 'P', Pg, str_g)
-                    cp_g  = cp.PropsSI('C', 'T', Tg, 'P', Pg, str_g)
-                    k_g   = cp.PropsSI('L', 'T', Tg, 'P', Pg, str_g)
-                    pr_g  = cp.PropsSI('Prandtl', 'T', Tg, 'P', Pg, str_g)
-                    M_g   = cp.PropsSI('M', str_g)
-                    mu_w  = cp.PropsSI('V', 'T', Tc, 'P', Pg, str_g)
-                
-                rho_c = cp.PropsSI('D', 'T', Tc, 'P', Pc, str_c)
-                mu_c  = cp.PropsSI('V', 'T', Tc, 'P', Pc, str_c)
-                cp_c  = cp.PropsSI('C', 'T', Tc, 'P', Pc, str_c)
-                k_c   = cp.PropsSI('L', 'T', Tc, 'P', Pc, str_c)
-                pr_c  = cp.PropsSI('Prandtl', 'T', Tc, 'P', Pc, str_c)
-            except ValueError as e:
-                print(f"  [FAILURE] Property Error at Row {i}: {e}")
-                break
+# ==============================================================================
+# ANNULAR FIN ZONE
+# ==============================================================================
+class AnnularFinZone(TubeBankZone):
+    """
+    Bank of individually finned tubes (annular fins of uniform thickness).
+    tube_dia is the fin root diameter. The tube-bank h applies to the exposed tube
+    and the fins; the fins are weighted by the exact Bessel-function efficiency,
+    looked up in a (mL, r2c/r1) table built once per process.
+    k_fin defaults to the tube wall conductivity.
+    """
+    # Efficiency table axes (start, stop, nodes); outside them the exact solution is used
+    _ETA_ML = (0.0, 8.0, 321)
+    _ETA_RATIO = (1.0, 5.0, 81)
+    _ETA_TABLE = None
 
-            if hasattr(self.model, 'calculate_Re_max'):
-                Re_t = self.model.calculate_Re_max(rho_g, mdot_g, A_front * fin_blockage, self.S_T, self.S_L, self.tube_dia, mu_g)
-            else:
-                u_max = mdot_g / (rho_g * A_min_flow)
-                Re_t = corr.calc_Re(rho_g, u_max, self.tube_dia, mu_g)
-            
-            model_params = {
-                'eps_por': self.eps_por, 'T': Tg, 'rho': rho_g, 'mu': mu_g, 'M_gas': M_g,
-                'D': self.tube_dia, 'S_T': self.S_T, 'S_L': self.S_L,
-                'N_rows': self.n_cols, 'Pr_wall': pr_g, 'T_wall': Tc, 'T_cool': Tc
-            }
-            Nu_t = self.model.calculate_Nu(Re_t, pr_g, **model_params)
-            h_tube = Nu_t * k_g / self.tube_dia
-            
-            # Fin Physics
-            A_fin_channel = A_front * fin_blockage
-            u_fin = mdot_g / (rho_g * A_fin_channel)
-            x_entry = corr.calc_entry_length_laminar(rho_g, u_fin, mu_g, pr_g, self.D_h)
-            
-            if 0.5 * dx < x_entry: 
-                Re_x = corr.calc_Re(rho_g, u_fin, 0.5*dx, mu_g)
-                Nu_fin = corr.calc_Nu_FlatPlate_Laminar(Re_x, pr_g)
-                h_fin = Nu_fin * k_g / (0.5*dx)
-            else:
-                Nu_fin = corr.calc_Nu_Duct_Laminar()
-                h_fin = Nu_fin * k_g / self.D_h
-                
-            UA_gas_col = (h_tube * A_tube_surf) + (h_fin * A_fin_surf)
-            h_effective = UA_gas_col / (A_tube_surf + A_fin_surf)
-
-            dP_params = {
-                'rho': rho_g, 'mu': mu_g, 'mu_wall': mu_w, 'm_dot': mdot_g,
-                'S_T': self.S_T, 'S_L': self.S_L, 'D': self.tube_dia,
-                'L_flow': self.S_L, 'A_front': A_front
-            }
-            dP_g_col = self.pressure_model.calculate_dP(**dP_params)
-
-            u_c = mdot_per_tube / (rho_c * A_c_cross)
-            Re_h = corr.calc_Re(rho_c, u_c, self.D_t_inner, mu_c)
-            f_cool = corr.calc_friction_SwameeJain(Re_h, self.e_roughness/self.D_t_inner)
-            Nu_h   = corr.calc_Nu_Gnielinski(Re_h, pr_c, f_cool, self.D_t_inner, L_tubes)
-            h_c    = Nu_h * k_c / self.D_t_inner
-            dP_c_col = corr.calc_dP_coolant_tube(f_cool, rho_c, u_c, self.D_t_inner, L_tubes)
-            
-            R_gas  = 1.0 / UA_gas_col
-            R_cool = 1.0 / (h_c * A_cool_surf)
-            R_wall = math.log(self.tube_dia/self.D_t_inner) / (2*math.pi*self.k_wall*L_tubes * self.n_rows_avg)
-            UA_total = 1.0 / (R_gas + R_cool + R_wall)
-            
-            C_g, C_c = mdot_g * cp_g, mdot_c * cp_c
-            C_min = min(C_g, C_c)
-            
-            NTU = UA_total / C_min
-            eps = 1.0 - math.exp(-NTU)
-            Q = eps * C_min * (Tg - Tc)
-            
-            T_wall_avg = Tc + Q * (R_cool + 0.5 * R_wall)
+    def __init__(self, name, height, tube_dia, R_p, n_cols, fin_od, fin_pitch, fin_thickness,
+                 width=0.4064, origin_x=0.0, origin_y=0.0, stagger=True,
+                 t_w=0.000889, k_wall=16.2, e_roughness=15e-6, k_fin=None,
+                 model=None, pressure_model=None, property_engine=None, validation=None,
+                 wall_iterations=0, radiation=None, onb_margin=0.0,
+                 condensation=None):
+        super().__init__(name, height, tube_dia, R_p, n_cols, width,
+                         origin_x, origin_y, stagger, t_w, k_wall, e_roughness, model, pressure_model,
+                         property_engine, validation, wall_iterations, radiation, onb_margin, condensation)
+        self.fin_od = float(fin_od)
+        self.fin_pitch = float(fin_pitch)
+        self.fin_thickness = float(fin_thickness)
+        self.k_fin = float(k_fin) if k_fin else float(k_wall)
+        if self.fin_od <= self.tube_dia:
+            raise ValueError(f"Zone {name}: fin diameter ({self.fin_od}) must exceed tube diameter ({self.tube_dia}).")
+        if self.fin_thickness >= self.fin_pitch:
+            raise ValueError(f"Zone {name}: fin thickness ({self.fin_thickness}) must be below fin pitch ({self.fin_pitch}).")
 
-            Tg -= Q / C_g
-            Tc += Q / C_c
-            Pg -= dP_g_col
-            
-            hot_profile.append(FluidState(hot_state_in.name, Tg, Pg, mdot_g, hot_state_in.fluid_obj, x=x_loc))
-            cold_profile.append(FluidState(cold_state_in.name, Tc, Pc, mdot_c, cold_state_in.fluid_obj, x=x_loc))
-            
-            stats_Q.append(Q)
-            stats_h_g.append(h_effective); stats_h_c.append(h_c); stats_Re_g.append(Re_t); stats_Re_c.append(Re_h)
-            stats_dP_g.append(dP_g_col); stats_dP_c.append(dP_c_col)
-            stats_Tw.append(T_wall_avg); stats_Tc.append(Tc)
-
-        if not stats_Q: return hot_state_in, cold_state_in, [], []
-
-        self.results = {
-            'Q_total_kW': sum(stats_Q) / 1000.0,
-            'dP_gas_Pa': sum(stats_dP_g),
-            'dP_cool_Pa': sum(stats_dP_c),
-            'h_gas_avg': sum(stats_h_g) / len(stats_h_g),
-            'h_cool_avg': sum(stats_h_c) / len(stats_h_c),
-            'Re_gas_avg': sum(stats_Re_g) / len(stats_Re_g),
-            'Re_cool_avg': sum(stats_Re_c) / len(stats_Re_c),
-            'T_gas_out': Tg, 'T_cool_out': Tc
-        }
-        self.history = {
-            'Re_g': stats_Re_g, 'h_g': stats_h_g, 'Q': stats_Q, 
-            'dP_g': stats_dP_g, 'Re_c': stats_Re_c,
-            'T_wall': stats_Tw, 'T_cool': stats_Tc
+    @classmethod
+    def _efficiency_table(cls):
+        """ eta(mL, r_ratio) on uniform axes, as nested lists for the scalar lookup. """
+        if cls._ETA_TABLE is None:
+            ml_axis = np.linspace(*cls._ETA_ML)
+            ratio_axis = np.linspace(*cls._ETA_RATIO)
+            cls._ETA_TABLE = [[corr.calc_eta_annular_fin(float(mL), float(r)) for r in ratio_axis]
+                              for mL in ml_axis]
+        return cls._ETA_TABLE
+
+    @classmethod
+    def fin_efficiency(cls, mL, r_ratio):
+        """ Bilinear table lookup of the annular fin efficiency (exact solution off-table); scalars or arrays. """
+        (m0, m1, nm), (r0, r1, nr) = cls._ETA_ML, cls._ETA_RATIO
+        u = (mL - m0) / (m1 - m0) * (nm - 1)
+        v = (r_ratio - r0) / (r1 - r0) * (nr - 1)
+        if np.ndim(u) or np.ndim(v):
+            return cls._fin_efficiency_array(mL, r_ratio, u, v)
+        if not (0.0 <= u <= nm - 1 and 0.0 <= v <= nr - 1):
+            return corr.calc_eta_annular_fin(mL, r_ratio)
+        table = cls._efficiency_table()
+        i, j = min(int(u), nm - 2), min(int(v), nr - 2)
+        tu, tv = u - i, v - j
+        lo, hi = table[i], table[i + 1]
+        return ((1.0 - tu) * ((1.0 - tv) * lo[j] + tv * lo[j + 1])
+                + tu * ((1.0 - tv) * hi[j] + tv * hi[j + 1]))
+
+    @classmethod
+    def _fin_efficiency_array(cls, mL, r_ratio, u, v):
+        nm, nr = cls._ETA_ML[2], cls._ETA_RATIO[2]
+        mL, r_ratio, u, v = np.broadcast_arrays(mL, r_ratio, u, v)
+        inside = (u >= 0.0) & (u <= nm - 1) & (v >= 0.0) & (v <= nr - 1)
+        table = np.asarray(cls._efficiency_table())
+        i = np.clip(u, 0, nm - 2).astype(int)
+        j = np.clip(v, 0, nr - 2).astype(int)
+        tu, tv = u - i, v - j
+        eta = ((1.0 - tu) * ((1.0 - tv) * table[i, j] + tv * table[i, j + 1])
+               + tu * ((1.0 - tv) * table[i + 1, j] + tv * table[i + 1, j + 1]))
+        for k in zip(*np.nonzero(~inside)):
+            eta[k] = corr.calc_eta_annular_fin(float(mL[k]), float(r_ratio[k]))
+        return eta
+
+    def compile_geometry(self):
+        if self.fin_od >= self.S_T:
+            raise ValueError(f"Zone {self.name}: fin diameter ({self.fin_od}) must be below S_T ({self.S_T}); fins overlap.")
+        geo = super().compile_geometry()
+        L_tubes, A_front = geo['L_tubes'], geo['A_front']
+        t, D = self.fin_thickness, self.tube_dia
+        N_fins = math.floor(L_tubes / self.fin_pitch)
+        r1, r2c = D / 2.0, (self.fin_od + t) / 2.0
+        sigma_gap = (self.S_T - D) / self.S_T
+        # Fraction of the inter-tube gap left open by the fins
+        fin_blockage = 1.0 - ((self.fin_od - D) * t) / ((self.S_T - D) * self.fin_pitch)
+        geo.update({
+            'A_min_flow': A_front * sigma_gap * fin_blockage,
+            'A_re': A_front * fin_blockage,
+            'A_surf_tube': self.n_rows_avg * math.pi * D * (L_tubes - N_fins * t),
+            'A_fin_surf': self.n_rows_avg * N_fins * 2.0 * math.pi * (r2c**2 - r1**2),
+            'L_fin': r2c - r1,
+            'r_ratio': r2c / r1,
+        })
+        return geo
+
+    def _extended_surface(self, geo, h_t, mdot_g, gas):
+        m_sq = 2.0 * h_t / (self.k_fin * self.fin_thickness)
+        m_fin = np.sqrt(m_sq) if np.ndim(m_sq) else dual.sqrt(m_sq)
+        eta_fin = self.fin_efficiency(m_fin * geo['L_fin'], geo['r_ratio'])
+
+        A_tube_surf, A_fin_surf = geo['A_surf_tube'], geo['A_fin_surf']
+        UA_gas_col = h_t * (A_tube_surf + eta_fin * A_fin_surf)
+        h_effective = UA_gas_col / (A_tube_surf + A_fin_surf)
+        return UA_gas_col, h_effective
+
+# ==============================================================================
+# GRADED TUBE BANK ZONE
+# ==============================================================================
+class GradedTubeBankZone(TubeBankZone):
+    """
+    Tube bank whose geometry changes row by row.
+
+    tube_dia, S_T, S_L, fin_pitch and fin_thickness take one value per row (or a
+    scalar for all rows); n_cols is the number of rows. A row with fin_pitch None
+    or 0 is bare, otherwise it carries plate fins as in PlateFinZone. Every row
+    geometry is precomputed with array operations in compile_geometry, and the
+    march then indexes them. All tubes form one coolant circuit in parallel.
+
+    The scalar tube_dia / S_T / S_L / R_p attributes describe the first row.
+    """
+    def __init__(self, name, height, tube_dia, S_T, S_L, n_cols=None, fin_pitch=None, fin_thickness=0.0,
+                 width=0.4064, origin_x=0.0, origin_y=0.0, stagger=True,
+                 t_w=0.000889, k_wall=16.2, e_roughness=15e-6,
+                 model=None, pressure_model=None, property_engine=None, validation=None,
+                 wall_iterations=0, radiation=None, onb_margin=0.0,
+                 condensation=None):
+        per_row = [tube_dia, S_T, S_L, fin_pitch, fin_thickness]
+        if n_cols is None:
+            n_cols = max(len(v) if np.ndim(v) else 1 for v in per_row)
+        fin_pitch = [0.0 if p is None else p for p in fin_pitch] if np.ndim(fin_pitch) else (fin_pitch or 0.0)
+        try:
+            D, ST, SL, pitch, thick = (np.broadcast_to(np.asarray(v, dtype=float), (int(n_cols),)).copy()
+                                       for v in (tube_dia, S_T, S_L, fin_pitch, fin_thickness))
+        except ValueError:
+            raise ValueError(f"Zone {name}: per-row geometry must have one value per row ({n_cols} rows).")
+        super().__init__(name, height, D[0], ST[0] / D[0], n_cols, width, origin_x, origin_y, stagger,
+                         t_w, k_wall, e_roughness, model, pressure_model, property_engine, validation,
+                         wall_iterations, radiation, onb_margin, condensation)
+        self.S_T, self.S_L = float(ST[0]), float(SL[0])
+        self.tube_dias, self.S_Ts, self.S_Ls = D, ST, SL
+        self.fin_pitches, self.fin_thicknesses = pitch, np.where(pitch > 0, thick, 0.0)
+        if np.any(ST <= D):
+            raise ValueError(f"Zone {name}: S_T must exceed the tube diameter in every row.")
+        if np.any((pitch > 0) & (thick >= pitch)):
+            raise ValueError(f"Zone {name}: fin thickness must be below fin pitch in every row.")
+
+    def _rows_per_column(self):
+        """ Average tubes per column for every row (staggered columns alternate offsets). """
+        D, ST = self.tube_dias, self.S_Ts
+        y_min, y_max = D / 2.0, self.height - D / 2.0
+        def count(first):
+            return np.where(first > y_max, 0.0, np.floor((y_max - first) / ST) + 1.0)
+        odd = y_min + (ST / 2.0 if self.stagger else 0.0)
+        return (count(y_min) + count(odd)) / 2.0
+
+    def build_geometry(self):
+        self.n_rows_per_col = self._rows_per_column()
+        self.n_rows_avg = float(np.mean(self.n_rows_per_col))
+        x = self.origin_x + np.concatenate(([0.0], np.cumsum(self.S_Ls[:-1])))
+        self.tube_centers = [(float(col_x), 0) for col_x in x]
+        self.n_tubes = float(np.sum(self.n_rows_per_col))
+        return self.tube_centers
+
+    def compile_geometry(self):
+        """ Per-row geometry, evaluated for all rows at once; geo['rows'][i] is row i. """
+        D, ST, SL = self.tube_dias, self.S_Ts, self.S_Ls
+        pitch, t = self.fin_pitches, self.fin_thicknesses
+        n_avg = self.n_rows_per_col
+        D_in = D - 2.0 * self.t_w
+        L_tubes = self.width
+        A_front = self.height * L_tubes
+        finned = pitch > 0
+        safe_pitch = np.where(finned, pitch, 1.0)
+
+        sigma_gap = (ST - D) / ST
+        N_fins = np.where(finned, np.floor(dual.values(L_tubes / safe_pitch)), 0.0)
+        fin_blockage = np.where(finned, 1.0 - t / safe_pitch, 1.0)
+        A_fin_face = (self.height * SL) - (n_avg * 0.25 * math.pi * D**2)
+        n_total_tubes = float(np.sum(n_avg)) or 1.0
+        columns = {
+            'dx': SL, 'A_min_flow': A_front * sigma_gap * fin_blockage,
+            'A_re': A_front * fin_blockage, 'A_fin_channel': A_front * fin_blockage,
+            'A_surf_tube': n_avg * math.pi * D * (L_tubes - N_fins * t),
+            'A_fin_surf': 2.0 * N_fins * A_fin_face,
+            'A_surf_cool': n_avg * math.pi * D_in * L_tubes,
+            'A_c_cross': math.pi * (D_in**2) / 4.0,
+            'R_wall': np.log(D / D_in) / (2 * math.pi * self.k_wall * L_tubes * n_avg),
+            'D': D, 'D_in': D_in, 'S_T': ST, 'S_L': SL, 'D_h': 2.0 * (pitch - t),
+            'eps_por': 1.0 - ((math.pi / 4.0) * D**2) / (ST * SL),
+            'L_beam': GasRadiation.beam_length(ST, SL, D),
+            'A_rad': n_avg * math.pi * D * L_tubes,
         }
-        return hot_profile[-1], cold_profile[-1], hot_profile, cold_profile
\ No newline at end of file
+        shared = {'L_tubes': L_tubes, 'A_front': A_front, 'n_total_tubes': n_total_tubes, 'N_rows': self.n_cols}
+        keys = list(columns)
+        rows = [dict(zip(keys, vals), **shared) for vals in zip(*(columns[k].tolist() for k in keys))]
+        x = (self.origin_x + np.cumsum(SL)).tolist()
+        return dict(shared, rows=rows, x=x)
+
+    def row_geometry(self, geo, i):
+        return geo['rows'][i]
+
+    def step_x(self, geo, i, hot_state_in):
+        return geo['x'][i]
+
+    def prepare(self, geo, model, hot_state_in, cold_state_in):
+        if hasattr(model, 'pop_notes'): model.pop_notes()
+        if self._validation_level(model) == 'zone':
+            seen = set()
+            for row in geo['rows']:
+                key = (row['D'], row['S_T'], row['S_L'])
+                if key not in seen:
+                    seen.add(key)
+                    self._validate_zone(row, model, hot_state_in, cold_state_in)
+
+    def _extended_surface(self, geo, h_t, mdot_g, gas):
+        if geo['A_fin_surf'] <= 0: return h_t * geo['A_surf_tube'], h_t
+        UA_gas_col = h_t * geo['A_surf_tube'] + _plate_fin_h(geo, mdot_g, gas) * geo['A_fin_surf']
+        return UA_gas_col, UA_gas_col / (geo['A_surf_tube'] + geo['A_fin_surf'])
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from src.models import GrimisonModel, ModifiedGrimisonModel, TariqModel, ZhukauskasModel
+
+# Air-like states over the laminar, transitional and turbulent regimes
+RE = np.geomspace(20.0, 2.0e5, 41)
+PR = np.linspace(0.68, 0.74, RE.size)
+T = np.linspace(320.0, 1100.0, RE.size)
+GEOMETRY = {'S_T': 0.0508, 'S_L': 0.044, 'D': 0.0254, 'N_rows': 6, 'eps_por': 0.71, 'M_gas': 0.02897}
+
+MODELS = [
+    GrimisonModel(method='hammock'),
+    GrimisonModel(method='bilinear'),
+    GrimisonModel(method='nearest'),
+    ModifiedGrimisonModel(),
+    ZhukauskasModel(),
+    TariqModel(),
+]
+
+
+def _states():
+    """ Per-state kwargs as TubeBankZone._model_params builds them. """
+    rho = 101325.0 * 0.02897 / (8.314462618 * T)
+    mu = 1.458e-6 * T**1.5 / (T + 110.4)
+    return {'T': T, 'rho': rho, 'mu': mu, 'Pr_wall': PR + 0.01, 'T_wall': T - 40.0, 'T_cool': T - 60.0}
+
+
+@pytest.mark.parametrize('model', MODELS, ids=lambda m: f"{type(m).__name__}-{getattr(m, 'method', '')}")
+def test_calculate_Nu_array_matches_scalar(model):
+    states = _states()
+    Nu_array = model.calculate_Nu_array(RE, PR, validate=False, **GEOMETRY, **states)
+    Nu_scalar = [model.calculate_Nu(RE[j], PR[j], validate=False, **GEOMETRY,
+                                    **{k: float(v[j]) for k, v in states.items()})
+                 for j in range(RE.size)]
+    np.testing.assert_allclose(Nu_array, Nu_scalar, rtol=1e-12, atol=0.0)
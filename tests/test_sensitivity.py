@@ -0,0 +1,93 @@
+import io
+import contextlib
+
+import numpy as np
+import pytest
+
+from src.builders import HXBuilder
+from src.condensation import Condensation
+from src.fluids import Fluid, FluidState, StreamType
+from src.models import GrimisonModel, ModifiedGrimisonModel, TariqModel, ZhukauskasModel
+from src.models.pressure import GunterShawModel
+from src.radiation import GasRadiation
+
+BARE = {'type': 'bare', 'name': 'bare', 'width': 0.5, 'tube_od': 0.0254, 'Rp': 2.0, 'tubes_deep': 4}
+# Fin pitches off the integer fin counts of the 0.5 m tubes, where floor() jumps
+FINNED = {'type': 'finned', 'name': 'finned', 'width': 0.5, 'tube_od': 0.0254, 'Rp': 2.0, 'tubes_deep': 3,
+          'fin_pitch': 0.0041, 'fin_thickness': 0.0005}
+ANNULAR = {'type': 'annular', 'name': 'annular', 'width': 0.5, 'tube_od': 0.0254, 'fin_od': 0.0381, 'Rp': 2.0,
+           'tubes_deep': 3, 'fin_pitch': 0.0041, 'fin_thickness': 0.0008, 'k_fin': 50.0}
+GRADED = {'type': 'graded', 'name': 'graded', 'width': 0.5, 'tube_od': [0.0254, 0.0254, 0.0191],
+          'S_T': [0.0508, 0.0508, 0.0382], 'S_L': 0.044, 'fin_pitch': [0, 0.0041, 0.0041], 'fin_thickness': 0.0005}
+PIPE = {'type': 'pipe', 'name': 'pipe', 'length': 2.0, 'diameter': 0.1, 'compressible': True, 'segments': 5,
+        'U_loss': 10.0, 'T_ambient': 300.0}
+
+MODELS = [GrimisonModel(), ModifiedGrimisonModel(), ZhukauskasModel(), TariqModel()]
+PARAMS = ['tube_od', 'S_T', 'S_L', 'T_gas_in', 'm_dot_cool']
+OUTPUTS = {'T_gas_out': ('hot', 'T'), 'T_cool_out': ('cold', 'T'), 'P_gas_out': ('hot', 'P')}
+GRADED_ATTRS = {'tube_dia': 'tube_dias', 'S_T': 'S_Ts', 'S_L': 'S_Ls', 'fin_pitch': 'fin_pitches'}
+INLETS = {'T_gas_in': ('hot', 'T'), 'm_dot_cool': ('cold', 'm_dot')}
+
+
+def _exchanger(zones, model=None, w_vap=0.0, T_gas=900.0, **options):
+    hot_in = FluidState(StreamType.GAS, T=T_gas, P=101325.0, m_dot=1.0, fluid=Fluid.N2, w_vap=w_vap)
+    cold_in = FluidState(StreamType.COOLANT, T=300.0, P=5e5, m_dot=3.0, fluid=Fluid.WATER)
+    b = HXBuilder("T", model or MODELS[0], pressure_model=GunterShawModel(), validation='off', **options)
+    return b.add_zones_from_config(zones).build(hot_in, cold_in)
+
+
+def _finite_difference(make, param, rel_step=1e-6):
+    """ Central difference of the solve() outlets w.r.t. one parameter. """
+    outlets = []
+    for sign in (1.0, -1.0):
+        hx = make()
+        if param in INLETS:
+            side, key = INLETS[param]
+            state = hx.hot_stream.inlet if side == 'hot' else hx.cold_stream.inlet
+            h = rel_step * getattr(state, key)
+            setattr(state, key, getattr(state, key) + sign * h)
+        else:
+            attr = 'tube_dia' if param == 'tube_od' else param
+            h = rel_step * 0.01
+            for zone in hx.zones:
+                name = GRADED_ATTRS.get(attr, attr) if hasattr(zone, 'tube_dias') else attr
+                if hasattr(zone, 'tube_dia') and hasattr(zone, name):
+                    zone.build_geometry()
+                    setattr(zone, name, getattr(zone, name) + sign * h)
+        with contextlib.redirect_stdout(io.StringIO()):
+            hx.solve()
+        outlets.append({k: getattr(hx.hot_out if side == 'hot' else hx.cold_out, key)
+                        for k, (side, key) in OUTPUTS.items()})
+    return {k: (outlets[0][k] - outlets[1][k]) / (2.0 * h) for k in OUTPUTS}
+
+
+def _check(make, params):
+    hx = make()
+    result = hx.solve_sensitivities(params)
+    with contextlib.redirect_stdout(io.StringIO()):
+        hx.solve()
+    assert result.values['T_gas_out'] == pytest.approx(hx.hot_out.T, rel=1e-12)
+    assert result.values['P_gas_out'] == pytest.approx(hx.hot_out.P, rel=1e-12)
+    for param in params:
+        fd = _finite_difference(make, param)
+        for out in OUTPUTS:
+            assert result.jacobian[out][param] == pytest.approx(fd[out], rel=1e-4, abs=1e-4 * abs(result.values[out])), \
+                f"d{out}/d{param}"
+
+
+@pytest.mark.parametrize('model', MODELS, ids=lambda m: type(m).__name__)
+def test_dual_matches_finite_difference(model):
+    _check(lambda: _exchanger([BARE, FINNED], model), PARAMS + ['fin_pitch'])
+
+
+@pytest.mark.parametrize('case', ['annular', 'graded', 'radiation', 'wall_iterations', 'condensation', 'fanno'])
+def test_dual_matches_finite_difference_options(case):
+    make = {
+        'annular': lambda: _exchanger([ANNULAR]),
+        'graded': lambda: _exchanger([GRADED]),
+        'radiation': lambda: _exchanger([BARE], radiation=GasRadiation(x_H2O=0.1, x_CO2=0.08)),
+        'wall_iterations': lambda: _exchanger([BARE], wall_iterations=6),
+        'condensation': lambda: _exchanger([BARE], w_vap=0.1, T_gas=450.0, condensation=Condensation(tol=1e-6)),
+        'fanno': lambda: _exchanger([PIPE, BARE]),
+    }[case]
+    _check(make, PARAMS)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.builders import HXBuilder
+from src.fluids import Fluid, FluidState, StreamType
+from src.models import GrimisonModel, ModifiedGrimisonModel, TariqModel, ZhukauskasModel
+from src.models.pressure import GunterShawModel
+from src.radiation import GasRadiation
+
+ZONES = [
+    {'type': 'bare', 'name': 'bare', 'width': 0.5, 'tube_od': 0.0254, 'Rp': 2.0, 'tubes_deep': 4},
+    {'type': 'finned', 'name': 'finned', 'width': 0.5, 'tube_od': 0.0254, 'Rp': 2.0, 'tubes_deep': 4,
+     'fin_pitch': 0.004, 'fin_thickness': 0.0005},
+    {'type': 'annular', 'name': 'annular', 'width': 0.5, 'tube_od': 0.0254, 'fin_od': 0.0381, 'Rp': 2.0,
+     'tubes_deep': 4, 'fin_pitch': 0.004, 'fin_thickness': 0.0008, 'k_fin': 50.0},
+    {'type': 'graded', 'name': 'graded', 'width': 0.5, 'tube_od': [0.0254, 0.0254, 0.0191, 0.0191],
+     'S_T': [0.0508, 0.0508, 0.0382, 0.0382], 'S_L': 0.044, 'tubes_deep': 4,
+     'fin_pitch': [0, 0, 0.004, 0.004], 'fin_thickness': 0.0005},
+]
+MODELS = [GrimisonModel(), ModifiedGrimisonModel(), ZhukauskasModel(), TariqModel()]
+
+
+def _zone(cfg, radiation):
+    hot_in = FluidState(StreamType.GAS, T=900.0, P=101325.0, m_dot=1.0, fluid=Fluid.N2)
+    cold_in = FluidState(StreamType.COOLANT, T=300.0, P=5e5, m_dot=3.0, fluid=Fluid.WATER)
+    b = HXBuilder("T", MODELS[0], pressure_model=GunterShawModel(), validation='off', radiation=radiation)
+    zone = b.add_zones_from_config([cfg]).build(hot_in, cold_in).zones[0]
+    zone.build_geometry()
+    return zone
+
+
+@pytest.mark.parametrize('radiation', [None, GasRadiation(x_H2O=0.1, x_CO2=0.08)], ids=['convection', 'radiation'])
+@pytest.mark.parametrize('cfg', ZONES, ids=[c['type'] for c in ZONES])
+def test_surface_batch_matches_surface(cfg, radiation):
+    zone = _zone(cfg, radiation)
+    props = zone.property_engine
+    geo = zone.row_geometry(zone.compile_geometry(), 2)
+    models = MODELS * 2
+    n = len(models)
+    Tg, Tc = np.linspace(500.0, 1200.0, n), np.linspace(300.0, 340.0, n)
+    Pg, Pc = np.full(n, 101325.0), np.full(n, 5e5)
+    mdot_g, mdot_c = np.linspace(0.5, 2.0, n), np.full(n, 3.0)
+    gas = tuple(np.broadcast_to(np.asarray(p, dtype=float), (n,)) for p in props.gas('Nitrogen', Tg, Pg, Tc))
+    cool = tuple(np.asarray(p, dtype=float) for p in props.coolant('Water', Tc, Pc))
+    T_w = Tc + 20.0
+    wall = (T_w,) + tuple(np.asarray(p, dtype=float) for p in props.gas_wall('Nitrogen', T_w, Pg))
+
+    for w in (None, wall):
+        gas_w = gas if w is None else gas[:6] + (w[1],)
+        batch = zone.surface_batch(geo, models, Tg, Tc, mdot_g, mdot_c, gas_w, cool, w)
+        for j, m in enumerate(models):
+            row = zone.surface(geo, m, Tg[j], Tc[j], mdot_g[j], mdot_c[j], tuple(float(p[j]) for p in gas_w),
+                               tuple(float(p[j]) for p in cool),
+                               tuple(float(p[j]) for p in w) if w is not None else None)
+            np.testing.assert_allclose([f[j] for f in batch], row, rtol=1e-12, atol=0.0)